@@ -0,0 +1,42 @@
+"""
+Compares List[Tuple[float, float]] with Array[Tuple[float, float]] (NumPy) for deserialize and binary round trips.
+
+    python benchmarks/benchmark_array.py
+"""
+import os
+import sys
+from timeit import repeat
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source'))
+
+from serializer import create_serializer, Array  # noqa: E402
+
+COORDINATES = [[i / 7, -i / 3] for i in range(100000)]
+
+
+def measure(function, number: int = 5) -> float:
+    return min(repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    print('{} coordinates'.format(len(COORDINATES)))
+    print('{:<28}{:>16}{:>16}{:>22}{:>24}'.format(
+        'typing', 'serialize, ms', 'deserialize, ms', 'serialize_binary, ms', 'deserialize_binary, ms'
+    ))
+    for typing in [List[Tuple[float, float]], Array[Tuple[float, float]]]:
+        serializer = create_serializer(typing)
+        instance = serializer.deserialize(COORDINATES)
+        data = serializer.serialize_binary(instance)
+
+        print('{:<28}{:>16.2f}{:>16.2f}{:>22.2f}{:>24.2f}'.format(
+            repr(typing).replace('typing.', ''),
+            measure(lambda: serializer.serialize(instance)) * 1000,
+            measure(lambda: serializer.deserialize(COORDINATES)) * 1000,
+            measure(lambda: serializer.serialize_binary(instance)) * 1000,
+            measure(lambda: serializer.deserialize_binary(data)) * 1000,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares serialize_binary/deserialize_binary with serialize_json/deserialize_json: output size and speed.
+
+    python benchmarks/benchmark_binary.py
+"""
+import os
+import sys
+from timeit import repeat
+from typing import List, Dict, Optional
+from enum import Enum
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source'))
+
+from serializer import create_serializer  # noqa: E402
+
+
+class UserRank(Enum):
+    user = 0
+    moderator = 1
+    admin = 2
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    email: str
+    rank: UserRank
+    friend_ids: List[int]
+    rating: float
+    settings: Dict[str, bool]
+    avatar_url: Optional[str] = None
+
+
+USERS = [
+    User(i, 'user{}'.format(i), 'user{}@example.com'.format(i), UserRank(i % 3), list(range(i % 20)), i / 7,
+         {'notifications': True, 'dark_theme': bool(i % 2)}, None if i % 2 else 'https://example.com/a.png')
+    for i in range(2000)
+]
+
+
+def measure(function, number: int = 10) -> float:
+    return min(repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    serializer = create_serializer(List[User])
+
+    json_data = serializer.serialize_json(USERS)
+    binary_data = serializer.serialize_binary(USERS)
+    assert serializer.deserialize_binary(binary_data) == USERS
+
+    print('{} users'.format(len(USERS)))
+    print('{:<20}{:>12}{:>16}{:>16}'.format('format', 'size, bytes', 'serialize, ms', 'deserialize, ms'))
+    for name, size, serialize, deserialize in [
+        ('json', len(json_data),
+         lambda: serializer.serialize_json(USERS), lambda: serializer.deserialize_json(json_data)),
+        ('binary', len(binary_data),
+         lambda: serializer.serialize_binary(USERS), lambda: serializer.deserialize_binary(binary_data)),
+    ]:
+        print('{:<20}{:>12}{:>16.2f}{:>16.2f}'.format(
+            name, size, measure(serialize) * 1000, measure(deserialize) * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main()
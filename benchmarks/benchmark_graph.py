@@ -0,0 +1,93 @@
+"""
+Payload size, memory held by deserialized data and timings of users referenced from several places (a dict by id,
+team member lists and friend lists) without and with graph mode.
+
+    python benchmarks/benchmark_graph.py
+"""
+import gc
+import os
+import sys
+import tracemalloc
+from timeit import repeat
+from typing import Dict, List
+from dataclasses import dataclass, field
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source'))
+
+from serializer import create_serializer  # noqa: E402
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    email: str
+    tags: List[str]
+    # Friends refer to each other, which graph mode alone can write.
+    friends: List['User'] = field(default_factory=list)
+
+
+@dataclass
+class Team:
+    name: str
+    members: List[User]
+
+
+@dataclass
+class Directory:
+    users: Dict[str, User]
+    teams: List[Team]
+
+
+def create_directory(friends: bool) -> Directory:
+    users = [User(i, 'user{}'.format(i), 'user{}@example.com'.format(i), ['a', 'b', 'c']) for i in range(5000)]
+    if friends:
+        # Cycles within groups of 10 users: instances are written depth first, as deep as Python recursion allows.
+        for i, user in enumerate(users):
+            group = i - i % 10
+            user.friends = [users[group + (i + 1) % 10], users[group + (i + 3) % 10]]
+    teams = [Team('team{}'.format(i), [users[(i * 13 + j) % len(users)] for j in range(50)]) for i in range(200)]
+    return Directory({str(user.id): user for user in users}, teams)
+
+
+def retained_memory(function) -> int:
+    """
+    Bytes still allocated by the result of function once it returned.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def measure(function, number: int = 3) -> float:
+    return min(repeat(function, number=number, repeat=3)) / number
+
+
+def main():
+    print('{:<24}{:>12}{:>16}{:>20}{:>22}'.format(
+        'mode', 'JSON, KB', 'retained, MB', 'serialize_json, ms', 'deserialize_json, ms'
+    ))
+    for name, directory, graph in [
+        ('plain', create_directory(False), False),
+        ('graph', create_directory(False), True),
+        ('graph, friend cycles', create_directory(True), True),
+    ]:
+        serializer = create_serializer(Directory, graph=graph)
+        data = serializer.serialize_json(directory)
+        print('{:<24}{:>12.1f}{:>16.1f}{:>20.2f}{:>22.2f}'.format(
+            name, len(data) / 1024,
+            retained_memory(lambda: serializer.deserialize_json(data)) / 1024 / 1024,
+            measure(lambda: serializer.serialize_json(directory)) * 1000,
+            measure(lambda: serializer.deserialize_json(data)) * 1000,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Memory held by deserialized users without interning, with Interned fields, and with the intern option.
+
+    python benchmarks/benchmark_interning.py
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from timeit import repeat
+from typing import Dict, List, NamedTuple, Union
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source'))
+
+from serializer import create_serializer, Interned  # noqa: E402
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, str]
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    country: str
+    attributes: List[UserAttribute]
+
+
+@dataclass
+class InternedUser:
+    id: int
+    login: str
+    country: Interned[str]
+    attributes: List[Interned[UserAttribute]]
+
+
+COUNTRIES = ['France', 'Germany', 'Japan', 'Brazil', 'Canada']
+
+USERS_JSON = json.dumps({
+    str(i): {
+        'id': i,
+        # Few distinct logins, as when users are loaded from several sources.
+        'login': 'user{}'.format(i % 1000),
+        'country': COUNTRIES[i % len(COUNTRIES)],
+        'attributes': [{'name': 'plan', 'value': ['free', 'pro'][i % 2]}, {'name': 'age', 'value': 20 + i % 50}],
+    }
+    for i in range(50000)
+})
+
+
+def retained_memory(function) -> int:
+    """
+    Bytes still allocated by the result of function once it returned.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def measure(function, number: int = 3) -> float:
+    return min(repeat(function, number=number, repeat=3)) / number
+
+
+def main():
+    data = json.loads(USERS_JSON)
+    print('{} users'.format(len(data)))
+    print('{:<28}{:>16}{:>18}'.format('serializer', 'retained, MB', 'deserialize, ms'))
+    for name, serializer in [
+        ('plain', create_serializer(Dict[str, User])),
+        ('Interned fields', create_serializer(Dict[str, InternedUser])),
+        ("intern='call'", create_serializer(Dict[str, User], intern='call')),
+        ("intern='sys'", create_serializer(Dict[str, User], intern='sys')),
+    ]:
+        # Parsed JSON is created inside the measured call, as when reading from a file.
+        memory = retained_memory(lambda: serializer.deserialize_json(USERS_JSON))
+        elapsed = measure(lambda: serializer.deserialize(data))
+        print('{:<28}{:>16.1f}{:>18.1f}'.format(name, memory / 2 ** 20, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Compares deserialize with deserialize_lazy when only a few fields of a large payload are read.
+
+    python benchmarks/benchmark_lazy.py
+"""
+import os
+import sys
+from timeit import repeat
+from typing import List, Dict, Optional, Tuple
+from enum import Enum
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source'))
+
+from serializer import create_serializer  # noqa: E402
+
+
+class UserRank(Enum):
+    user = 0
+    moderator = 1
+    admin = 2
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+@dataclass
+class UserStorage:
+    version: int
+    users: Dict[int, User]
+    user_location_coordinates: Dict[int, Tuple[float, float]]
+
+
+STORAGE = UserStorage(
+    version=3,
+    users={i: User(i, 'user{}'.format(i), UserRank(i % 3), list(range(i % 20))) for i in range(20000)},
+    user_location_coordinates={i: (i / 3, -i / 7) for i in range(20000)},
+)
+
+
+def measure(function, number: int = 5) -> float:
+    return min(repeat(function, number=number, repeat=3)) / number
+
+
+def main():
+    serializer = create_serializer(UserStorage)
+    serialized = serializer.serialize(STORAGE)
+
+    print('{} users'.format(len(STORAGE.users)))
+    print('{:<40}{:>16}{:>16}'.format('access', 'deserialize, ms', 'lazy, ms'))
+    for name, access in [
+        ('version', lambda storage: storage.version),
+        ('one user login', lambda storage: storage.users[42].login),
+        ('all users logins', lambda storage: [user.login for user in storage.users.values()]),
+        ('everything (materialize)', None),
+    ]:
+        if access is None:
+            eager = measure(lambda: serializer.deserialize(serialized))
+            lazy = measure(lambda: serializer.deserialize_lazy(serialized).materialize())
+        else:
+            eager = measure(lambda: access(serializer.deserialize(serialized)))
+            lazy = measure(lambda: access(serializer.deserialize_lazy(serialized)))
+        print('{:<40}{:>16.2f}{:>16.2f}'.format(name, eager * 1000, lazy * 1000))
+
+
+if __name__ == '__main__':
+    main()
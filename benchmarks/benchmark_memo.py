@@ -0,0 +1,62 @@
+"""
+Serializes users sharing the same frozen dataclass and named tuple instances without memo, with memo='call' and
+with memo='weak' (repeated calls with the same instances).
+
+    python benchmarks/benchmark_memo.py
+"""
+import os
+import sys
+from timeit import repeat
+from typing import List, NamedTuple, Union
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source'))
+
+from serializer import create_serializer  # noqa: E402
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, float, str]
+
+
+@dataclass(frozen=True)
+class Company:
+    name: str
+    country: str
+    tags: List[str]
+    attributes: List[UserAttribute]
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    company: Company
+    attributes: List[UserAttribute]
+
+
+ATTRIBUTES = [UserAttribute('plan', 'pro'), UserAttribute('team', 'red'), UserAttribute('quota', 1.5)]
+COMPANIES = [Company('company{}'.format(i), 'France', ['a', 'b', 'c'], ATTRIBUTES) for i in range(10)]
+USERS = [User(i, 'user{}'.format(i), COMPANIES[i % 10], ATTRIBUTES) for i in range(20000)]
+
+
+def measure(function, number: int = 5) -> float:
+    return min(repeat(function, number=number, repeat=3)) / number
+
+
+def main():
+    print('{} users, {} companies'.format(len(USERS), len(COMPANIES)))
+    print('{:<16}{:>16}{:>20}{:>22}'.format('memo', 'serialize, ms', 'serialize_json, ms', 'serialize_binary, ms'))
+    for memo in [None, 'call', 'weak']:
+        serializer = create_serializer(List[User], memo=memo)
+        print('{:<16}{:>16.2f}{:>20.2f}{:>22.2f}'.format(
+            str(memo),
+            measure(lambda: serializer.serialize(USERS)) * 1000,
+            measure(lambda: serializer.serialize_json(USERS)) * 1000,
+            measure(lambda: serializer.serialize_binary(USERS)) * 1000,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Compares deserialize with deserialize_parallel of a large List[User] for different numbers of workers.
+
+    python benchmarks/benchmark_parallel.py [size]
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import List, Optional
+from enum import Enum
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source'))
+
+from serializer import create_serializer  # noqa: E402
+
+
+class UserRank(Enum):
+    user = 0
+    admin = 1
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    email: str
+    rank: UserRank
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+def measure(function) -> float:
+    start = perf_counter()
+    function()
+    return perf_counter() - start
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    serializer = create_serializer(List[User], compile=True)
+    serialized = serializer.serialize([
+        User(i, 'user{}'.format(i), 'user{}@example.com'.format(i), UserRank(i % 2), list(range(i % 10)))
+        for i in range(size)
+    ])
+
+    print('{} users, {} cpus'.format(size, os.cpu_count()))
+    print('{:<12}{:>18}'.format('workers', 'deserialize, ms'))
+    print('{:<12}{:>18.0f}'.format('serial', measure(lambda: serializer.deserialize(serialized)) * 1000))
+    for workers in [2, 4, 8]:
+        with ProcessPoolExecutor(workers) as executor:
+            # Starts the workers and builds the serializer in each of them.
+            serializer.deserialize_parallel(serialized[:workers * 16], executor=executor, chunk_size=16)
+            print('{:<12}{:>18.0f}'.format(workers, measure(
+                lambda: serializer.deserialize_parallel(serialized, workers=workers, executor=executor)
+            ) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Compares replicating a changed state as a whole (serialize_json + deserialize_json) with diff + apply_patch.
+
+    python benchmarks/benchmark_patch.py
+"""
+import copy
+import json
+import os
+import sys
+from timeit import repeat
+from typing import List, Dict, Tuple
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source'))
+
+from serializer import create_serializer  # noqa: E402
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    friend_ids: List[int]
+    location: Tuple[float, float]
+
+
+@dataclass
+class UserStorage:
+    users: Dict[str, User]
+
+
+OLD = UserStorage({str(i): User(i, 'user{}'.format(i), list(range(i % 20)), (i / 3, -i / 7)) for i in range(20000)})
+NEW = copy.deepcopy(OLD)
+for i in range(0, 20000, 1000):
+    NEW.users[str(i)].login = 'renamed{}'.format(i)
+    NEW.users[str(i + 1)].friend_ids.append(i)
+
+
+def measure(function, number: int = 3) -> float:
+    return min(repeat(function, number=number, repeat=3)) / number
+
+
+def main():
+    serializer = create_serializer(UserStorage)
+
+    state_json = serializer.serialize_json(NEW)
+    patch_json = json.dumps(serializer.diff(OLD, NEW))
+    replica = copy.deepcopy(OLD)
+    assert serializer.apply_patch(replica, json.loads(patch_json)) == NEW
+
+    print('{} users, {} changed'.format(len(NEW.users), sum(OLD.users[key] != NEW.users[key] for key in NEW.users)))
+    print('{:<20}{:>12}{:>14}{:>14}'.format('replication', 'size, bytes', 'encode, ms', 'decode, ms'))
+    print('{:<20}{:>12}{:>14.2f}{:>14.2f}'.format(
+        'whole state', len(state_json),
+        measure(lambda: serializer.serialize_json(NEW)) * 1000,
+        measure(lambda: serializer.deserialize_json(state_json)) * 1000,
+    ))
+    # Applying the patch to the same replica again repeats its splices, the timing stays the same.
+    print('{:<20}{:>12}{:>14.2f}{:>14.2f}'.format(
+        'patch', len(patch_json),
+        measure(lambda: json.dumps(serializer.diff(OLD, NEW))) * 1000,
+        measure(lambda: serializer.apply_patch(replica, json.loads(patch_json))) * 1000,
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Compares checked and trusted serialization of the README UserStorage example with many users.
+
+    python benchmarks/benchmark_trusted.py
+"""
+import os
+import sys
+from timeit import repeat
+from typing import List, Dict, Tuple, Union, Optional, NamedTuple
+from enum import IntEnum
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source'))
+
+from serializer import create_serializer  # noqa: E402
+
+
+class UserRank(IntEnum):
+    user = 0
+    admin = 1
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    password: str
+    rank: UserRank
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, float, str]
+
+
+@dataclass
+class UserStorage:
+    users: Dict[int, User]
+    user_location_coordinates: Dict[int, Tuple[float, float]]
+    user_additional_attributes: Dict[int, List[UserAttribute]]
+
+
+STORAGE = UserStorage(
+    users={
+        i: User(i, 'user{}'.format(i), 'secret', UserRank(i % 2), list(range(i % 20)),
+                None if i % 2 else 'https://example.com/a.png')
+        for i in range(5000)
+    },
+    user_location_coordinates={i: (i / 3, -i / 7) for i in range(5000)},
+    user_additional_attributes={
+        i: [UserAttribute('age', i % 90), UserAttribute('height', 1.5 + i % 50 / 100), UserAttribute('city', 'Paris')]
+        for i in range(5000)
+    },
+)
+
+
+def measure(function, number: int = 10) -> float:
+    return min(repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    print('UserStorage with {} users'.format(len(STORAGE.users)))
+    print('{:<12}{:>16}{:>16}{:>20}{:>20}'.format(
+        'compile', 'serialize, ms', 'trusted, ms', 'serialize_json, ms', 'trusted, ms'
+    ))
+    for compile in [False, True]:
+        serializer = create_serializer(UserStorage, compile=compile)
+        trusted_serializer = create_serializer(UserStorage, compile=compile, trusted=True)
+        assert trusted_serializer.serialize(STORAGE) == serializer.serialize(STORAGE)
+
+        print('{:<12}{:>16.2f}{:>16.2f}{:>20.2f}{:>20.2f}'.format(
+            str(compile),
+            measure(lambda: serializer.serialize(STORAGE)) * 1000,
+            measure(lambda: trusted_serializer.serialize(STORAGE)) * 1000,
+            measure(lambda: serializer.serialize_json(STORAGE)) * 1000,
+            measure(lambda: trusted_serializer.serialize_json(STORAGE)) * 1000,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,301 @@
+"""
+Throughput and memory benchmarks of every built-in serializer and of composite schemas, across input sizes and
+nesting depths. Results are written as JSON, so two runs (e.g. before and after a change) can be compared.
+
+    python benchmarks/suite.py run --output before.json
+    python benchmarks/suite.py run --output after.json --sizes 1,100,10000 --cases builtin_int,user_storage
+    python benchmarks/suite.py compare before.json after.json --threshold 0.1
+
+compare exits with status 1 when any operation got slower (or used more memory) by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from enum import Enum
+from time import perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source'))
+
+from serializer import create_serializer, clear_serializer_cache, Discriminated, SerializableClass  # noqa: E402
+
+OPERATIONS = ('build', 'serialize', 'deserialize', 'serialize_json', 'deserialize_json')
+DEFAULT_SIZES = (1, 100, 10000, 1000000)
+DEFAULT_DEPTHS = (1, 4, 16)
+# Every measurement runs for at least this many seconds.
+MIN_TIME = 0.2
+
+
+class UserRank(Enum):
+    user = 0
+    moderator = 1
+    admin = 2
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, float, str]
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    password: str
+    rank: UserRank
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+@dataclass
+class UserStorage:
+    users: Dict[int, User]
+    user_location_coordinates: Dict[int, Tuple[float, float]]
+    user_additional_attributes: Dict[int, List[UserAttribute]]
+
+
+@dataclass
+class Circle:
+    radius: float
+
+
+@dataclass
+class Square:
+    side: float
+    color: str
+
+
+class Point(SerializableClass):
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+
+    def serialize(self) -> Any:
+        return [self.x, self.y]
+
+    @staticmethod
+    def deserialize(instance: Any) -> 'Point':
+        return Point(instance[0], instance[1])
+
+
+def user(i: int) -> User:
+    return User(i, 'user{}'.format(i), 'secret', UserRank(i % 3), list(range(i % 10)),
+                None if i % 2 else 'https://example.com/a.png')
+
+
+def user_storage(size: int) -> UserStorage:
+    return UserStorage(
+        users={i: user(i) for i in range(size)},
+        user_location_coordinates={i: (i / 3, -i / 7) for i in range(size)},
+        user_additional_attributes={i: [UserAttribute('age', i % 90), UserAttribute('city', 'Paris')]
+                                    for i in range(size)},
+    )
+
+
+class Case(NamedTuple):
+    name: str
+    # (size, depth) -> (typing, instance)
+    create: Callable[[int, int], Tuple[Any, Any]]
+    nested: bool = False
+
+
+def nested_lists(size: int, depth: int) -> Tuple[Any, Any]:
+    """
+    List[List[...List[int]]] of `depth` levels with about `size` ints in total.
+    """
+    typing: Any = int
+    for _ in range(depth):
+        typing = List[typing]
+
+    branching = max(1, round(size ** (1 / depth)))
+    instance: Any = list(range(branching))
+    for _ in range(depth - 1):
+        instance = [instance] * branching
+    return typing, instance
+
+
+def nested_dicts(size: int, depth: int) -> Tuple[Any, Any]:
+    typing: Any = User
+    for _ in range(depth):
+        typing = Dict[str, typing]
+
+    branching = max(1, round(size ** (1 / depth)))
+    instance: Any = {'user{}'.format(i): user(i) for i in range(branching)}
+    for _ in range(depth - 1):
+        instance = {'key{}'.format(i): instance for i in range(branching)}
+    return typing, instance
+
+
+CASES = [
+    Case('builtin_int', lambda size, depth: (List[int], list(range(size)))),
+    Case('builtin_str', lambda size, depth: (List[str], ['value{}'.format(i) for i in range(size)])),
+    Case('any', lambda size, depth: (List[Any], [{'a': [i, None]} for i in range(size)])),
+    Case('dict', lambda size, depth: (Dict[str, int], {'key{}'.format(i): i for i in range(size)})),
+    Case('tuple', lambda size, depth: (List[Tuple[int, str, float]], [(i, 'a', i / 2) for i in range(size)])),
+    Case('union', lambda size, depth: (List[Union[int, str, None]], [[i, 'a', None][i % 3] for i in range(size)])),
+    Case('enum', lambda size, depth: (List[UserRank], [UserRank(i % 3) for i in range(size)])),
+    Case('dataclass', lambda size, depth: (List[User], [user(i) for i in range(size)])),
+    Case('named_tuple', lambda size, depth: (List[UserAttribute], [UserAttribute('age', i) for i in range(size)])),
+    Case('discriminated', lambda size, depth: (
+        List[Discriminated[Union[Circle, Square], 'kind']],
+        [Circle(i / 2) if i % 2 else Square(i / 3, 'red') for i in range(size)],
+    )),
+    Case('serializable_class', lambda size, depth: (List[Point], [Point(i, -i) for i in range(size)])),
+    Case('user_storage', lambda size, depth: (UserStorage, user_storage(size))),
+    Case('nested_lists', nested_lists, nested=True),
+    Case('nested_dicts', nested_dicts, nested=True),
+]
+
+
+def measure(function: Callable[[], Any], before: Optional[Callable[[], Any]] = None) -> Tuple[float, int]:
+    """
+    Returns (calls per second, peak memory in bytes of one call).
+    """
+    calls = 0
+    elapsed = 0.0
+    while elapsed < MIN_TIME:
+        if before is not None:
+            before()
+        start = perf_counter()
+        function()
+        elapsed += perf_counter() - start
+        calls += 1
+
+    if before is not None:
+        before()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return calls / elapsed, peak
+
+
+def run_case(case: Case, size: int, depth: int, compile: bool) -> List[Dict[str, Any]]:
+    typing, instance = case.create(size, depth)
+
+    serializer = create_serializer(typing, compile=compile)
+    serialized = serializer.serialize(instance)
+    json_string = serializer.serialize_json(instance)
+
+    functions = {
+        'build': (lambda: create_serializer(typing, compile=compile), clear_serializer_cache),
+        'serialize': (lambda: serializer.serialize(instance), None),
+        'deserialize': (lambda: serializer.deserialize(serialized), None),
+        'serialize_json': (lambda: serializer.serialize_json(instance), None),
+        'deserialize_json': (lambda: serializer.deserialize_json(json_string), None),
+    }
+
+    results = list()
+    for operation in OPERATIONS:
+        if operation == 'deserialize_json' and case.name == 'user_storage':
+            # JSON object keys are strings, Dict[int, ...] can not read them back.
+            continue
+
+        ops_per_sec, peak_memory = measure(*functions[operation])
+        results.append({
+            'case': case.name,
+            'size': size,
+            'depth': depth,
+            'compile': compile,
+            'operation': operation,
+            'ops_per_sec': ops_per_sec,
+            'peak_memory': peak_memory,
+        })
+
+    return results
+
+
+def result_key(result: Dict[str, Any]) -> Tuple[Any, ...]:
+    return result['case'], result['size'], result['depth'], result['compile'], result['operation']
+
+
+def command_run(arguments: argparse.Namespace):
+    sizes = [int(size) for size in arguments.sizes.split(',')]
+    depths = [int(depth) for depth in arguments.depths.split(',')]
+    cases = [case for case in CASES if arguments.cases is None or case.name in arguments.cases.split(',')]
+
+    results = list()
+    for case in cases:
+        for size in sizes:
+            for depth in (depths if case.nested else [1]):
+                for compile in ([False, True] if arguments.compile else [False]):
+                    for result in run_case(case, size, depth, compile):
+                        results.append(result)
+                        print('{case:<20}{size:>10}{depth:>6}{compile!s:>8}  {operation:<18}{ops_per_sec:>14.1f} ops/s'
+                              '{peak_memory:>14} B'.format(**result), file=sys.stderr)
+
+    report = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    if arguments.output is None:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(arguments.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+
+
+def command_compare(arguments: argparse.Namespace) -> int:
+    with open(arguments.base) as fp:
+        base = {result_key(result): result for result in json.load(fp)['results']}
+    with open(arguments.new) as fp:
+        new = {result_key(result): result for result in json.load(fp)['results']}
+
+    print('{:<20}{:>10}{:>6}{:>8}  {:<18}{:>12}{:>12}'.format(
+        'case', 'size', 'depth', 'compile', 'operation', 'speed', 'memory'
+    ))
+    regressions = 0
+    for key in sorted(base.keys() & new.keys(), key=repr):
+        # > 1 is faster and uses less memory.
+        speed = new[key]['ops_per_sec'] / base[key]['ops_per_sec']
+        memory = base[key]['peak_memory'] / new[key]['peak_memory'] if new[key]['peak_memory'] else 1.0
+        regression = speed < 1 - arguments.threshold or memory < 1 - arguments.threshold
+        regressions += regression
+
+        print('{:<20}{:>10}{:>6}{!s:>8}  {:<18}{:>11.2f}x{:>11.2f}x{}'.format(
+            *key, speed, memory, '  REGRESSION' if regression else ''
+        ))
+
+    for key in sorted(base.keys() ^ new.keys(), key=repr):
+        print('{:<20}{:>10}{:>6}{!s:>8}  {:<18}  only in {}'.format(*key, 'base' if key in base else 'new'))
+
+    print('{} regressions'.format(regressions))
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run benchmarks and write results as JSON')
+    run.add_argument('--output', help='JSON file, stdout by default')
+    run.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='comma-separated input sizes')
+    run.add_argument('--depths', default=','.join(map(str, DEFAULT_DEPTHS)),
+                     help='comma-separated nesting depths of nested cases')
+    run.add_argument('--cases', help='comma-separated case names: {}'.format(', '.join(c.name for c in CASES)))
+    run.add_argument('--compile', action='store_true', help='benchmark compiled serializers too')
+
+    compare = commands.add_parser('compare', help='compare two results files')
+    compare.add_argument('base')
+    compare.add_argument('new')
+    compare.add_argument('--threshold', type=float, default=0.1, help='allowed relative slowdown, 0.1 by default')
+
+    arguments = parser.parse_args()
+    if arguments.command == 'run':
+        command_run(arguments)
+        return 0
+
+    return command_compare(arguments)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
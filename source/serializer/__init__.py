@@ -1,3 +1,5 @@
-from serializer.serializer_manager import create_serializer, Serializer
+from serializer.serializer_manager import create_serializer, Serializer, serializer_cache_info, clear_serializer_cache
+from serializer.profiler import SerializerProfiler
 from serializer.serializable_class import SerializableClass
+from serializer.typings import Discriminated, Array, Interned
 import serializer.serializers
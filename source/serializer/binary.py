@@ -0,0 +1,159 @@
+import json
+import struct
+from hashlib import sha256
+from typing import Any
+
+from .exceptions import SerializerError
+
+# Starts every serialize_binary output, followed by the schema fingerprint.
+MAGIC = b'SB\x01'
+FINGERPRINT_SIZE = 8
+
+DOUBLE = struct.Struct('<d')
+
+
+def binary_header(schema: str) -> bytes:
+    return MAGIC + sha256(schema.encode('utf-8')).digest()[:FINGERPRINT_SIZE]
+
+
+def write_varint(buffer: bytearray, value: int):
+    """
+    Unsigned LEB128.
+    """
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def write_int(buffer: bytearray, value: int):
+    # Zigzag, so small negative numbers are short too.
+    write_varint(buffer, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def write_float(buffer: bytearray, value: float):
+    buffer += DOUBLE.pack(value)
+
+
+def write_bool(buffer: bytearray, value: bool):
+    buffer.append(1 if value else 0)
+
+
+def write_none(buffer: bytearray, value: None):
+    pass
+
+
+def write_str(buffer: bytearray, value: str):
+    data = value.encode('utf-8', 'surrogatepass')
+    write_varint(buffer, len(data))
+    buffer += data
+
+
+def write_json(buffer: bytearray, value: Any):
+    write_str(buffer, json.dumps(value))
+
+
+class BinaryReader:
+    def __init__(self, data: bytes, position: int = 0):
+        self.data = data
+        self.position = position
+
+    def read_varint(self) -> int:
+        data = self.data
+        position = self.position
+        if position < len(data) and data[position] < 0x80:
+            self.position = position + 1
+            return data[position]
+
+        result = 0
+        shift = 0
+        while True:
+            if position >= len(data):
+                raise SerializerError('Unexpected end of binary data.')
+
+            byte = data[position]
+            position += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+
+        self.position = position
+        return result
+
+    def read_bytes(self, size: int) -> bytes:
+        end = self.position + size
+        if end > len(self.data):
+            raise SerializerError('Unexpected end of binary data.')
+
+        data = self.data[self.position:end]
+        self.position = end
+        return data
+
+    def read_offset(self, size: int) -> int:
+        """
+        Skips `size` bytes and returns their offset, for readers viewing the data without copying it.
+        """
+        offset = self.position
+        if offset + size > len(self.data):
+            raise SerializerError('Unexpected end of binary data.')
+
+        self.position = offset + size
+        return offset
+
+    def read_int(self) -> int:
+        value = self.read_varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def read_float(self) -> float:
+        return DOUBLE.unpack(self.read_bytes(DOUBLE.size))[0]
+
+    def read_bool(self) -> bool:
+        value = self.read_bytes(1)[0]
+        if value > 1:
+            raise SerializerError('Invalid binary bool {}.'.format(value))
+
+        return value == 1
+
+    def read_none(self) -> None:
+        return None
+
+    def read_str(self) -> str:
+        size = self.read_varint()
+        end = self.position + size
+        if end > len(self.data):
+            raise SerializerError('Unexpected end of binary data.')
+
+        value = self.data[self.position:end].decode('utf-8', 'surrogatepass')
+        self.position = end
+        return value
+
+    def read_json(self) -> Any:
+        return json.loads(self.read_str())
+
+    def read_index(self, size: int) -> int:
+        """
+        Reads an index of one of `size` members (union members, enum members).
+        """
+        index = self.read_varint()
+        if index >= size:
+            raise SerializerError('Invalid binary member index {}, expected less than {}.'.format(index, size))
+
+        return index
+
+
+BINARY_WRITERS = {
+    int: write_int,
+    float: write_float,
+    bool: write_bool,
+    type(None): write_none,
+    str: write_str,
+}
+
+BINARY_READERS = {
+    int: BinaryReader.read_int,
+    float: BinaryReader.read_float,
+    bool: BinaryReader.read_bool,
+    type(None): BinaryReader.read_none,
+    str: BinaryReader.read_str,
+}
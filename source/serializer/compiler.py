@@ -0,0 +1,371 @@
+from keyword import iskeyword
+from typing import List, Dict, Tuple, Any
+
+from .exceptions import SerializerError
+from .serializer_manager import Serializer, BuiltinTypesSerializer, _WrapperSerializer
+from .serializers import (
+    DictSerializer, ListSerializer, TupleSerializer, UnionSerializer, AnySerializer, EnumSerializer,
+    DataclassSerializer, NamedTupleSerializer
+)
+
+SERIALIZE = 'serialize'
+DESERIALIZE = 'deserialize'
+
+
+class _CompiledMismatch(Exception):
+    pass
+
+
+class CompiledSerializer(_WrapperSerializer, register=False):
+    """
+    Runs straight-line functions generated from a serializer tree. Generated code only decides whether the
+    input is valid: on any failed check the interpreted tree is run again, so errors (and their messages)
+    are exactly the ones of the interpreted serializer.
+    """
+
+    def __init__(self, serializer: Serializer, serialize_function, deserialize_function, serialize_trusted_function,
+                 source: str):
+        super().__init__(serializer)
+        self.serialize_function = serialize_function
+        self.deserialize_function = deserialize_function
+        self.serialize_trusted_function = serialize_trusted_function
+        self.source = source
+        self.json_encoders = serializer.json_encoders
+        self.interning = serializer.interning
+        self.memoizing = serializer.memoizing
+        self.graphing = serializer.graphing
+        self.lazy = serializer.lazy
+
+    def _serialize(self, instance: Any) -> Any:
+        try:
+            return self.serialize_function(instance)
+        except (_CompiledMismatch, SerializerError):
+            return self.serializer.serialize(instance)
+
+    def _deserialize(self, instance: Any) -> Any:
+        try:
+            return self.deserialize_function(instance)
+        except (_CompiledMismatch, SerializerError):
+            return self.serializer.deserialize(instance)
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return self.serialize_trusted_function(instance)
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        # Batches run the generated functions item by item, not the interpreted batch methods.
+        return list(map(self._serialize, instances))
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        return list(map(self._deserialize, instances))
+
+
+class _SourceBuilder:
+    def __init__(self, trusted: bool = False):
+        # Trusted serialize functions check nothing and return trusted_identity values as they are.
+        self.trusted = trusted
+        self.namespace: Dict[str, Any] = {'_Mismatch': _CompiledMismatch}
+        self.functions: Dict[Tuple[int, str], str] = dict()
+        self.sources: List[str] = list()
+        self.constants: Dict[int, str] = dict()
+        self.counter = 0
+
+    def name(self, prefix: str) -> str:
+        self.counter += 1
+        return '{}{}'.format(prefix, self.counter)
+
+    def constant(self, value: Any) -> str:
+        name = self.constants.get(id(value))
+        if name is None:
+            name = self.name('_c')
+            self.constants[id(value)] = name
+            self.namespace[name] = value
+        return name
+
+    def function(self, serializer: Serializer, direction: str) -> str:
+        key = (id(serializer), direction)
+        name = self.functions.get(key)
+        if name is not None:
+            return name
+
+        name = self.name('_{}_'.format(direction))
+        self.functions[key] = name
+
+        lines = ['def {}(v):'.format(name)]
+        if type(serializer) is DataclassSerializer or type(serializer) is NamedTupleSerializer:
+            result = self.emit_fields(serializer, direction, 'v', lines, 1)
+        else:
+            result = self.emit(serializer, direction, 'v', lines, 1)
+        lines.append('    return {}'.format(result))
+        self.sources.append('\n'.join(lines))
+
+        return name
+
+    def emit(self, serializer: Serializer, direction: str, source: str, lines: List[str], depth: int) -> str:
+        """
+        Appends statements validating and converting variable `source` with `serializer` to `lines`. Returns an
+        expression evaluating to the converted value.
+        """
+        indent = '    ' * depth
+        serializer_type = type(serializer)
+
+        if self.trusted and serializer.trusted_identity:
+            return source
+
+        if serializer_type is BuiltinTypesSerializer:
+            self.emit_type_check(serializer.type, source, lines, indent)
+            return source
+
+        if serializer_type is AnySerializer:
+            return source
+
+        if serializer_type is EnumSerializer:
+            if direction == SERIALIZE:
+                self.emit_type_check(serializer.enum, source, lines, indent)
+                return '{}[{}]'.format(self.constant(serializer.keys), source)
+
+            lookup = self.constant(serializer.lookup)
+            lines.append('{}if type({}) not in {} or {} not in {}: raise _Mismatch'.format(
+                indent, source, self.constant(serializer.key_types), source, lookup
+            ))
+            return '{}[{}]'.format(lookup, source)
+
+        if serializer_type is ListSerializer:
+            return self.emit_list(serializer, direction, source, lines, depth)
+
+        if serializer_type is DictSerializer:
+            return self.emit_dict(serializer, direction, source, lines, depth)
+
+        if serializer_type is TupleSerializer:
+            return self.emit_tuple(serializer, direction, source, lines, depth)
+
+        if serializer_type is UnionSerializer and self.is_inlinable_optional(serializer):
+            return self.emit_optional(serializer, direction, source, lines, depth)
+
+        if serializer_type is DataclassSerializer or serializer_type is NamedTupleSerializer:
+            return '{}({})'.format(self.function(serializer, direction), source)
+
+        # Custom serializers, serializable classes and general unions run interpreted.
+        method = '_serialize_trusted' if self.trusted else direction
+        return '{}.{}({})'.format(self.constant(serializer), method, source)
+
+    def emit_type_check(self, expected_type: Any, source: str, lines: List[str], indent: str):
+        if self.trusted:
+            return
+
+        if expected_type is type(None):
+            lines.append('{}if {} is not None: raise _Mismatch'.format(indent, source))
+        else:
+            lines.append('{}if not isinstance({}, {}): raise _Mismatch'.format(
+                indent, source, self.constant(expected_type)
+            ))
+
+    def emit_list(self, serializer: ListSerializer, direction: str, source: str, lines: List[str], depth: int) -> str:
+        indent = '    ' * depth
+        result = self.name('r')
+        item = self.name('i')
+        item_serializer = serializer.serializer
+
+        self.emit_type_check(list, source, lines, indent)
+
+        if type(item_serializer) is BuiltinTypesSerializer or type(item_serializer) is AnySerializer:
+            if type(item_serializer) is BuiltinTypesSerializer:
+                lines.append('{}for {} in {}:'.format(indent, item, source))
+                self.emit_type_check(item_serializer.type, item, lines, indent + '    ')
+            lines.append('{}{} = list({})'.format(indent, result, source))
+            return result
+
+        append = self.name('a')
+        lines.append('{}{} = []'.format(indent, result))
+        lines.append('{}{} = {}.append'.format(indent, append, result))
+        lines.append('{}for {} in {}:'.format(indent, item, source))
+        item_result = self.emit(item_serializer, direction, item, lines, depth + 1)
+        lines.append('{}    {}({})'.format(indent, append, item_result))
+
+        return result
+
+    def emit_dict(self, serializer: DictSerializer, direction: str, source: str, lines: List[str], depth: int) -> str:
+        indent = '    ' * depth
+        result = self.name('r')
+        key = self.name('k')
+        value = self.name('i')
+
+        self.emit_type_check(dict, source, lines, indent)
+        lines.append('{}{} = {{}}'.format(indent, result))
+        lines.append('{}for {}, {} in {}.items():'.format(indent, key, value, source))
+        key_result = self.emit(serializer.key_formatter, direction, key, lines, depth + 1)
+        value_result = self.emit(serializer.value_formatter, direction, value, lines, depth + 1)
+        lines.append('{}    {}[{}] = {}'.format(indent, result, key_result, value_result))
+
+        return result
+
+    def emit_tuple(self, serializer: TupleSerializer, direction: str, source: str, lines: List[str],
+                   depth: int) -> str:
+        indent = '    ' * depth
+        item_serializers = serializer.serializer_instances
+
+        if not self.trusted:
+            lines.append('{}if not isinstance({}, (list, tuple)): raise _Mismatch'.format(indent, source))
+            lines.append('{}if len({}) != {}: raise _Mismatch'.format(indent, source, len(item_serializers)))
+
+        item_results = list()
+        for i, item_serializer in enumerate(item_serializers):
+            item = self.name('i')
+            lines.append('{}{} = {}[{}]'.format(indent, item, source, i))
+            item_results.append(self.emit(item_serializer, direction, item, lines, depth))
+
+        if direction == SERIALIZE:
+            return '[{}]'.format(', '.join(item_results))
+        return '({},)'.format(', '.join(item_results)) if item_results else '()'
+
+    @staticmethod
+    def is_inlinable_optional(serializer: UnionSerializer) -> bool:
+        """
+        Optional[X] is inlined as `None if value is None else X` when X surely rejects None, otherwise
+        trying X first (as UnionSerializer does) could give a different result.
+        """
+        if len(serializer.serializer_instances) != 2:
+            return False
+
+        value_serializer, none_serializer = serializer.serializer_instances
+        if not (type(none_serializer) is BuiltinTypesSerializer and none_serializer.type is type(None)):
+            return False
+
+        if type(value_serializer) is BuiltinTypesSerializer:
+            return value_serializer.type is not type(None)
+
+        return type(value_serializer) in (
+            ListSerializer, DictSerializer, TupleSerializer, EnumSerializer, DataclassSerializer,
+            NamedTupleSerializer
+        )
+
+    def emit_optional(self, serializer: UnionSerializer, direction: str, source: str, lines: List[str],
+                      depth: int) -> str:
+        indent = '    ' * depth
+        result = self.name('r')
+
+        lines.append('{}if {} is None:'.format(indent, source))
+        lines.append('{}    {} = None'.format(indent, result))
+        lines.append('{}else:'.format(indent))
+        value_result = self.emit(serializer.serializer_instances[0], direction, source, lines, depth + 1)
+        lines.append('{}    {} = {}'.format(indent, result, value_result))
+
+        return result
+
+    def emit_fields(self, serializer: Serializer, direction: str, source: str, lines: List[str],
+                    depth: int) -> str:
+        indent = '    ' * depth
+        positional = serializer.options.positional
+        if type(serializer) is DataclassSerializer:
+            cls = self.constant(serializer.dataclass)
+        else:
+            cls = self.constant(serializer.named_tuple)
+
+        if direction == SERIALIZE:
+            if not self.trusted:
+                lines.append('{}if not isinstance({}, {}): raise _Mismatch'.format(indent, source, cls))
+        elif positional:
+            lines.append('{}if not isinstance({}, list): raise _Mismatch'.format(indent, source))
+            lines.append('{}if not {} <= len({}) <= {}: raise _Mismatch'.format(
+                indent, serializer.required_size, source, len(serializer.keys)
+            ))
+        else:
+            lines.append('{}if not isinstance({}, dict): raise _Mismatch'.format(indent, source))
+
+        if direction == SERIALIZE:
+            return self.emit_serialize_fields(serializer, source, lines, depth)
+
+        # Fields which may be omitted are collected to a dict and passed to the class as keywords.
+        optional_fields = self.name('o')
+        if any(self.is_optional_field(serializer, i) for i in range(len(serializer.keys))):
+            lines.append('{}{} = {{}}'.format(indent, optional_fields))
+
+        field_results = list()
+        for i, key in enumerate(serializer.keys):
+            field = self.name('f')
+            field_source = '{}[{}]'.format(source, i) if positional else '{}[{!r}]'.format(source, key)
+
+            if self.is_optional_field(serializer, i):
+                if positional:
+                    lines.append('{}if len({}) > {}:'.format(indent, source, i))
+                else:
+                    lines.append('{}if {!r} in {}:'.format(indent, key, source))
+                lines.append('{}    {} = {}'.format(indent, field, field_source))
+                result = self.emit(serializer.formatter_instances[key], DESERIALIZE, field, lines, depth + 1)
+                lines.append('{}    {}[{!r}] = {}'.format(indent, optional_fields, key, result))
+                continue
+
+            if not positional:
+                lines.append('{}if {!r} not in {}: raise _Mismatch'.format(indent, key, source))
+            lines.append('{}{} = {}'.format(indent, field, field_source))
+            result = self.emit(serializer.formatter_instances[key], DESERIALIZE, field, lines, depth)
+            field_results.append((key, result))
+
+        if all(key.isidentifier() and not iskeyword(key) for key, _ in field_results):
+            arguments = ['{}={}'.format(key, result) for key, result in field_results]
+        else:
+            arguments = ['**{{{}}}'.format(', '.join('{!r}: {}'.format(key, result) for key, result in field_results))]
+        if len(field_results) != len(serializer.keys):
+            arguments.append('**{}'.format(optional_fields))
+        return '{}({})'.format(cls, ', '.join(arguments))
+
+    @staticmethod
+    def is_optional_field(serializer: Serializer, i: int) -> bool:
+        if serializer.options.positional:
+            return i >= serializer.required_size
+
+        return serializer.keys[i] in serializer.keys_with_default
+
+    def emit_serialize_fields(self, serializer: Serializer, source: str, lines: List[str], depth: int) -> str:
+        indent = '    ' * depth
+
+        fields = list()
+        for key in serializer.keys:
+            field = self.name('f')
+            if key.isidentifier() and not iskeyword(key):
+                lines.append('{}{} = {}.{}'.format(indent, field, source, key))
+            else:
+                lines.append('{}{} = getattr({}, {!r})'.format(indent, field, source, key))
+
+            fields.append((key, field, self.emit(serializer.formatter_instances[key], SERIALIZE, field, lines, depth)))
+
+        if not serializer.options.positional:
+            return '{{{}}}'.format(', '.join('{!r}: {}'.format(key, result) for key, _, result in fields))
+
+        result = self.name('r')
+        lines.append('{}{} = [{}]'.format(indent, result, ', '.join(result for _, _, result in fields)))
+
+        # Trailing fields equal to their defaults are dropped, last field first.
+        fields_by_key = {key: field for key, field, _ in fields}
+        size = len(fields)
+        for key, default in serializer.trailing_defaults:
+            field = fields_by_key[key]
+            lines.append('{}if len({}) == {} and type({}) is {} and {} == {}: del {}[-1]'.format(
+                indent, result, size, field, self.constant(type(default)), field, self.constant(default), result
+            ))
+            size -= 1
+
+        return result
+
+
+def compile_serializer(serializer: Serializer) -> CompiledSerializer:
+    builder = _SourceBuilder()
+    serialize_name = builder.function(serializer, SERIALIZE)
+    deserialize_name = builder.function(serializer, DESERIALIZE)
+
+    trusted_builder = _SourceBuilder(trusted=True)
+    serialize_trusted_name = trusted_builder.function(serializer, SERIALIZE)
+
+    sources = list()
+    for source_builder in (builder, trusted_builder):
+        source = '\n\n\n'.join(source_builder.sources) + '\n'
+        exec(compile(source, '<compiled serializer {}>'.format(serializer.breadcrumbs), 'exec'),
+             source_builder.namespace)
+        sources.append(source)
+
+    return CompiledSerializer(
+        serializer,
+        builder.namespace[serialize_name],
+        builder.namespace[deserialize_name],
+        trusted_builder.namespace[serialize_trusted_name],
+        '\n\n'.join(sources)
+    )
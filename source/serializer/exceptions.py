@@ -1,2 +1,75 @@
+from typing import List, Tuple, Any, Optional
+
+# Placeholder for the breadcrumbs in error messages, substituted only when the message is rendered.
+BREADCRUMBS = '{breadcrumbs}'
+
+# Edges between a serializer and its child, rendered with the key the error propagated through.
+FIELD_EDGE = '[\'{}\']'
+INDEX_EDGE = '[{}]'
+ITEM_EDGE = '[]'
+KEY_EDGE = '[key]'
+VALUE_EDGE = '[value]'
+
+
+class _NoKey:
+    def __repr__(self) -> str:
+        return 'NO_KEY'
+
+    def __reduce__(self):
+        return 'NO_KEY'
+
+
+NO_KEY = _NoKey()
+
+
 class SerializerError(TypeError):
-    pass
+    """
+    Error paths are not known where errors are raised: serializers are shared between parents, so every parent
+    adds a frame while the error propagates. Nothing is formatted until the message is rendered.
+    """
+
+    def __init__(self, message: str = '', label: Optional[str] = None):
+        super().__init__(message)
+
+        self.message = message
+        self.label = label
+        # (parent label, edge, key) of every serializer the error propagated through, innermost first.
+        self.frames: List[Tuple[str, str, Any]] = list()
+
+    def add_frame(self, label: str, edge: str, key: Any = NO_KEY) -> 'SerializerError':
+        self.frames.append((label, edge, key))
+        return self
+
+    @property
+    def path(self) -> Tuple[Any, ...]:
+        """
+        Keys (dataclass fields, list indexes, dict keys) from the root to the failed value.
+        """
+        return tuple(key for _, _, key in reversed(self.frames) if key is not NO_KEY)
+
+    @property
+    def breadcrumbs(self) -> str:
+        parts = [
+            label + (edge if key is NO_KEY else edge.format(key))
+            for label, edge, key in reversed(self.frames)
+        ]
+        if self.label is not None:
+            parts.append(self.label)
+
+        return '->'.join(parts)
+
+    def __str__(self) -> str:
+        if BREADCRUMBS not in self.message:
+            return self.message
+
+        return self.message.replace(BREADCRUMBS, self.breadcrumbs)
+
+    def __reduce__(self):
+        return _restore_serializer_error, (type(self), self.message, self.label, self.frames)
+
+
+def _restore_serializer_error(error_class: type, message: str, label: Optional[str],
+                              frames: List[Tuple[str, str, Any]]) -> SerializerError:
+    error = error_class(message, label)
+    error.frames = frames
+    return error
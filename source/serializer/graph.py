@@ -0,0 +1,108 @@
+from threading import local
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple
+
+# Keys of objects written in graph mode: the first occurrence of an instance carries its id, later ones only refer
+# to it, see GraphSerializer.
+ID_KEY = '$id'
+REF_KEY = '$ref'
+VALUE_KEY = '$value'
+
+_local = local()
+_end = object()
+
+
+class CallGraph:
+    """
+    Instances met by the running call of a graph mode tree, see GraphSerializer. Serialize calls number instances
+    by id (keeping them, so their ids are not reused during the call), deserialize calls keep the created
+    instances by number.
+    """
+    __slots__ = ('ids', 'instances', 'pairs', 'comparing')
+
+    def __init__(self):
+        self.ids: Dict[int, Tuple[Any, int]] = dict()
+        self.instances: Dict[int, Any] = dict()
+        # (id(old), id(new)) already diffed, so cycles are diffed once.
+        self.pairs: Set[Tuple[int, int]] = set()
+        # True in graphs of trial diffs comparing instances, see GraphSerializer._same.
+        self.comparing = False
+
+
+def active_graph() -> Optional[CallGraph]:
+    return getattr(_local, 'graph', None)
+
+
+def graph_mark() -> Optional[Tuple[int, int]]:
+    """
+    Sizes of the active graph, see restore_graph.
+    """
+    graph = active_graph()
+    return None if graph is None else (len(graph.ids), len(graph.instances))
+
+
+def restore_graph(mark: Optional[Tuple[int, int]]):
+    """
+    Forgets instances met since graph_mark returned mark, when a union member failed: the next member gives
+    them the same ids.
+    """
+    graph = active_graph()
+    if mark is None or graph is None:
+        return
+
+    ids_size, instances_size = mark
+    while len(graph.ids) > ids_size:
+        graph.ids.popitem()
+    while len(graph.instances) > instances_size:
+        graph.instances.popitem()
+
+
+def run_in_graph(function: Callable, *args) -> Any:
+    """
+    Runs function with a new graph active, nested calls keep the graph of the outermost call.
+    """
+    if active_graph() is not None:
+        return function(*args)
+
+    _local.graph = CallGraph()
+    try:
+        return function(*args)
+    finally:
+        _local.graph = None
+
+
+def run_comparing(function: Callable, *args) -> Any:
+    """
+    Runs function with a comparing graph active (a new one unless it runs in one already), the active graph is
+    restored afterwards.
+    """
+    previous = active_graph()
+    if previous is not None and previous.comparing:
+        return function(*args)
+
+    graph = _local.graph = CallGraph()
+    graph.comparing = True
+    try:
+        return function(*args)
+    finally:
+        _local.graph = previous
+
+
+def iter_in_graph(items: Iterator[Any]) -> Iterator[Any]:
+    """
+    Yields items of a generator sharing one graph, active only while an item is produced.
+    """
+    graph = CallGraph()
+    while True:
+        if active_graph() is not None:
+            item = next(items, _end)
+        else:
+            _local.graph = graph
+            try:
+                item = next(items, _end)
+            finally:
+                _local.graph = None
+
+        if item is _end:
+            return
+
+        yield item
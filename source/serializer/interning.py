@@ -0,0 +1,50 @@
+from threading import local
+from typing import Any, Callable, Dict, Optional
+
+_local = local()
+
+# Streaming deserialization shares one pool between items, it is emptied after this many distinct values.
+STREAM_POOL_SIZE = 65536
+
+
+def active_pool() -> Optional[Dict[Any, Any]]:
+    """
+    Pool of the running deserialize call of the current thread, None outside of interning calls.
+    """
+    return getattr(_local, 'pool', None)
+
+
+def run_pooled(pool: Dict[Any, Any], function: Callable, *args) -> Any:
+    """
+    Runs function with `pool` active. Nested calls (e.g. a SerializableClass deserializing its fields with
+    another serializer) keep the pool of the outermost call.
+    """
+    if active_pool() is not None:
+        return function(*args)
+
+    _local.pool = pool
+    try:
+        return function(*args)
+    finally:
+        _local.pool = None
+
+
+def _pool_key(value: Any) -> Any:
+    # Equal values of different types (1, True and 1.0, named tuples and tuples) are pooled apart.
+    if isinstance(value, tuple):
+        return type(value), tuple(map(_pool_key, value))
+
+    return type(value), value
+
+
+def intern_value(pool: Dict[Any, Any], value: Any) -> Any:
+    """
+    Returns the first value of the pool equal to `value` with the same types, adding `value` when there is none.
+    """
+    # Strings, the most common values, are their own keys: keys of other values are tuples.
+    key = value if type(value) is str else _pool_key(value)
+    try:
+        return pool.setdefault(key, value)
+    except TypeError:
+        # Tuples and named tuples holding lists or dicts are not hashable.
+        return value
@@ -0,0 +1,80 @@
+import asyncio
+import json
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, List, Optional, Union
+
+# Smaller batches are processed on the event loop, handing them to an executor costs more than it saves.
+OFFLOAD_SIZE = 64
+
+
+async def _aiter_chunks(source: Any, chunk_size: int) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def aiter_line_batches(source: Any, chunk_size: int = 65536) -> AsyncIterator[List[bytes]]:
+    """
+    Yields lists of non-empty lines read from an asyncio.StreamReader (anything with an async `read`) or an async
+    iterable of bytes chunks. All complete lines of a chunk are yielded together, so they are processed as a batch.
+    """
+    chunks = _aiter_chunks(source, chunk_size) if hasattr(source, 'read') else source
+
+    # Parts of the line which is not complete yet, joined once its end arrives.
+    pending: List[bytes] = list()
+    async for chunk in chunks:
+        if b'\n' not in chunk:
+            pending.append(chunk)
+            continue
+
+        pending.append(chunk)
+        lines = b''.join(pending).split(b'\n')
+        pending = [lines.pop()]
+
+        lines = [line for line in lines if line.strip()]
+        if lines:
+            yield lines
+
+    rest = b''.join(pending)
+    if rest.strip():
+        yield [rest]
+
+
+async def aiter_batches(instances: Union[AsyncIterable[Any], Iterable[Any]], batch_size: int) -> AsyncIterator[list]:
+    batch = list()
+    if hasattr(instances, '__aiter__'):
+        async for instance in instances:
+            batch.append(instance)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = list()
+    else:
+        for instance in instances:
+            batch.append(instance)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = list()
+
+    if batch:
+        yield batch
+
+
+async def run_batch(function: Callable[[list], Any], batch: list, executor: Optional[Executor]) -> Any:
+    """
+    Runs function(batch) in the executor for large batches, so the event loop stays responsive.
+    """
+    if executor is None or len(batch) < OFFLOAD_SIZE:
+        return function(batch)
+
+    return await asyncio.get_running_loop().run_in_executor(executor, function, batch)
+
+
+def deserialize_lines(serializer: Any, lines: List[bytes]) -> List[Any]:
+    return serializer.deserialize_many([json.loads(line) for line in lines])
+
+
+def serialize_lines(serializer: Any, instances: list) -> bytes:
+    # serialize_json output is ascii.
+    return ''.join([serializer.serialize_json(instance) + '\n' for instance in instances]).encode('ascii')
@@ -0,0 +1,138 @@
+import codecs
+from json import JSONDecoder, JSONDecodeError
+from typing import Any, Iterable, Iterator, Tuple, Union, IO
+
+WHITESPACE = ' \t\n\r'
+DELIMITERS = WHITESPACE + ',:]}'
+
+
+class JsonStreamReader:
+    """
+    Reads items of a top-level JSON array or object from a file-like object or an iterable of str/bytes chunks,
+    keeping only the current item and a read buffer in memory.
+    """
+
+    def __init__(self, source: Union[IO, Iterable[Union[str, bytes]]], chunk_size: int = 65536):
+        if hasattr(source, 'read'):
+            self.chunks = iter(lambda: source.read(chunk_size), source.read(0))
+        else:
+            self.chunks = iter(source)
+
+        self.decoder = JSONDecoder()
+        self.utf8_decoder = None
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def __read(self) -> bool:
+        """
+        Appends at least as much text as the buffer holds (so a long item is parsed O(1) times on average) and
+        drops the consumed part of the buffer. Returns False at the end of input.
+        """
+        if self.eof:
+            return False
+
+        buffer = self.buffer[self.position:]
+        self.position = 0
+        wanted = max(len(buffer), 1)
+
+        chunks = [buffer]
+        read = 0
+        for chunk in self.chunks:
+            if isinstance(chunk, bytes):
+                if self.utf8_decoder is None:
+                    self.utf8_decoder = codecs.getincrementaldecoder('utf-8')()
+                chunk = self.utf8_decoder.decode(chunk)
+
+            chunks.append(chunk)
+            read += len(chunk)
+            if read >= wanted:
+                break
+        else:
+            self.eof = True
+            if self.utf8_decoder is not None:
+                chunks.append(self.utf8_decoder.decode(b'', final=True))
+
+        self.buffer = ''.join(chunks)
+
+        return read > 0 or not self.eof
+
+    def __peek(self) -> str:
+        """
+        Skips whitespace and returns the next character, '' at the end of input.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+
+            if not self.__read():
+                return ''
+
+    def __expect(self, characters: str) -> str:
+        character = self.__peek()
+        if not character or character not in characters:
+            raise JSONDecodeError('Expecting one of {!r}'.format(characters), self.buffer, self.position)
+
+        self.position += 1
+        return character
+
+    def __value(self) -> Any:
+        self.__peek()
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except JSONDecodeError:
+                if self.__read():
+                    continue
+                raise
+
+            # A number cut at the end of the buffer (e.g. '1.' of '1.5') may be decoded as its prefix, so the value
+            # is only complete when followed by a delimiter.
+            if not self.eof and (end == len(self.buffer) or self.buffer[end] not in DELIMITERS):
+                self.__read()
+                continue
+
+            self.position = end
+            return value
+
+    def __end(self):
+        if self.__peek():
+            raise JSONDecodeError('Extra data', self.buffer, self.position)
+
+    def iter_array(self) -> Iterator[Any]:
+        self.__expect('[')
+
+        if self.__peek() == ']':
+            self.position += 1
+        else:
+            while True:
+                yield self.__value()
+
+                if self.__expect(',]') == ']':
+                    break
+
+        self.__end()
+
+    def iter_object(self) -> Iterator[Tuple[str, Any]]:
+        self.__expect('{')
+
+        if self.__peek() == '}':
+            self.position += 1
+        else:
+            while True:
+                if self.__peek() != '"':
+                    raise JSONDecodeError('Expecting property name enclosed in double quotes', self.buffer,
+                                          self.position)
+                key = self.__value()
+                self.__expect(':')
+
+                yield key, self.__value()
+
+                if self.__expect(',}') == '}':
+                    break
+
+        self.__end()
@@ -0,0 +1,110 @@
+from dataclasses import fields, MISSING
+from typing import Any, Callable, Dict
+
+from .exceptions import SerializerError, FIELD_EDGE
+
+
+def _load_field(instance: Any, key: str) -> Any:
+    serializer = instance._lazy_serializer
+    data = instance._lazy_data
+    if isinstance(data, list):
+        # Positional mode.
+        index = instance._lazy_indexes[key]
+        if index >= len(data):
+            return instance._lazy_defaults[key]()
+        value = data[index]
+    else:
+        if key not in data:
+            return instance._lazy_defaults[key]()
+        value = data[key]
+
+    try:
+        return serializer.formatter_instances[key]._deserialize_lazy(value)
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
+
+def _lazy_field(key: str) -> property:
+    def get(self) -> Any:
+        values = self._lazy_values
+        try:
+            return values[key]
+        except KeyError:
+            pass
+
+        value = _load_field(self, key)
+        values[key] = value
+        return value
+
+    def set(self, value: Any):
+        self._lazy_values[key] = value
+        self._lazy_assigned.add(key)
+
+    return property(get, set)
+
+
+def _default_getter(field: Any) -> Callable[[], Any]:
+    if field.default_factory is not MISSING:
+        return field.default_factory
+
+    return lambda: field.default
+
+
+def materialize(self) -> Any:
+    """
+    Deserializes the whole data with all checks, returning an instance of the dataclass itself. Fields assigned
+    since are kept.
+    """
+    instance = self._lazy_serializer._deserialize(self._lazy_data)
+    for key in self._lazy_assigned:
+        setattr(instance, key, self._lazy_values[key])
+
+    return instance
+
+
+def _eq(self, other: Any) -> bool:
+    return self.materialize() == other
+
+
+def _materialized(instance: Any) -> Any:
+    return instance
+
+
+def _reduce_ex(self, protocol: int) -> Any:
+    # Pickled and copied as the dataclass itself.
+    return _materialized, (self.materialize(),)
+
+
+def create_lazy_class(serializer: Any) -> type:
+    """
+    Subclass of serializer.dataclass whose fields are deserialized on first access and then cached, see
+    Serializer.deserialize_lazy. Instances are created by create_lazy_instance, __init__ and __post_init__
+    are not called.
+    """
+    dataclass = serializer.dataclass
+
+    namespace: Dict[str, Any] = {
+        '__slots__': ('_lazy_serializer', '_lazy_data', '_lazy_values', '_lazy_assigned'),
+        '__module__': dataclass.__module__,
+        '__qualname__': 'Lazy{}'.format(dataclass.__qualname__),
+        '_lazy_indexes': {key: i for i, key in enumerate(serializer.keys)},
+        '_lazy_defaults': {field.name: _default_getter(field) for field in fields(dataclass)},
+        'materialize': materialize,
+        '__eq__': _eq,
+        '__hash__': dataclass.__hash__,
+        '__reduce_ex__': _reduce_ex,
+    }
+    for key in serializer.keys:
+        namespace[key] = _lazy_field(key)
+
+    return type('Lazy{}'.format(dataclass.__name__), (dataclass,), namespace)
+
+
+def create_lazy_instance(lazy_class: type, serializer: Any, data: Any) -> Any:
+    instance = object.__new__(lazy_class)
+    # Frozen dataclasses forbid __setattr__.
+    object.__setattr__(instance, '_lazy_serializer', serializer)
+    object.__setattr__(instance, '_lazy_data', data)
+    object.__setattr__(instance, '_lazy_values', dict())
+    object.__setattr__(instance, '_lazy_assigned', set())
+    return instance
@@ -0,0 +1,76 @@
+from threading import local, Lock
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+_local = local()
+
+# Serializer node -> outputs kept between calls with memo='weak', see weak_outputs. Kept apart from the nodes, which
+# are immutable once built.
+_weak_outputs: 'WeakKeyDictionary[Any, Dict[int, List[Any]]]' = WeakKeyDictionary()
+_weak_outputs_lock = Lock()
+
+
+class CallMemo:
+    """
+    Outputs of the running serialize call by id of the serialized instance, see MemoizedSerializer. Instances are
+    kept with their outputs, so their ids are not reused during the call.
+    """
+    __slots__ = ('serialized', 'trusted', 'json', 'binary')
+
+    def __init__(self):
+        self.serialized: Dict[int, Tuple[Any, Any]] = dict()
+        self.trusted: Dict[int, Tuple[Any, Any]] = dict()
+        self.json: Dict[int, Tuple[Any, str]] = dict()
+        self.binary: Dict[int, Tuple[Any, bytes]] = dict()
+
+
+def active_memo() -> Optional[CallMemo]:
+    return getattr(_local, 'memo', None)
+
+
+def run_memoized(function: Callable, *args) -> Any:
+    """
+    Runs function with a new memo active, nested calls keep the memo of the outermost call.
+    """
+    if active_memo() is not None:
+        return function(*args)
+
+    _local.memo = CallMemo()
+    try:
+        return function(*args)
+    finally:
+        _local.memo = None
+
+
+def iter_memoized(chunks: Iterator[Any]) -> Iterator[Any]:
+    """
+    Yields chunks of a generator sharing one memo, active only while a chunk is produced.
+    """
+    memo = CallMemo()
+    while True:
+        if active_memo() is not None:
+            chunk = next(chunks, None)
+        else:
+            _local.memo = memo
+            try:
+                chunk = next(chunks, None)
+            finally:
+                _local.memo = None
+
+        if chunk is None:
+            return
+
+        yield chunk
+
+
+def weak_outputs(serializer: Any) -> Dict[int, List[Any]]:
+    """
+    Outputs memoized by `serializer` between calls: id of the instance -> [weak reference, JSON, binary], None for
+    outputs not produced yet.
+    """
+    outputs = _weak_outputs.get(serializer)
+    if outputs is None:
+        with _weak_outputs_lock:
+            outputs = _weak_outputs.setdefault(serializer, dict())
+
+    return outputs
@@ -0,0 +1,54 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+from math import ceil
+from typing import Any, Optional, Sized, List, Callable
+
+from .exceptions import SerializerError
+
+
+def _run_chunk(serializer: Any, deserialize: bool, chunk: Any) -> Any:
+    # Runs in a worker process, the serializer is rebuilt there from its typing.
+    return serializer.deserialize(chunk) if deserialize else serializer.serialize(chunk)
+
+
+def run_parallel(serializer: Any, instance: Any, deserialize: bool, workers: Optional[int],
+                 chunk_size: Optional[int], executor: Optional[Executor]) -> Any:
+    """
+    Splits the top-level list or dict into chunks, serializes or deserializes them in worker processes and joins
+    the results in order.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        # A few chunks per worker, so workers finishing early pick up the rest.
+        chunk_size = max(1, ceil(len(instance) / (workers * 4))) if isinstance(instance, Sized) else 1
+
+    chunks = serializer._split_parallel(instance, chunk_size)
+    if len(chunks) <= 1:
+        return serializer.deserialize(instance) if deserialize else serializer.serialize(instance)
+
+    function = partial(_run_chunk, serializer, deserialize)
+    try:
+        if executor is None:
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(pool.map(function, chunks))
+        else:
+            results = list(executor.map(function, chunks))
+    except SerializerError:
+        # Error paths of a chunk start at the chunk, run again in this process to raise the error with the path
+        # from the root.
+        return serializer.deserialize(instance) if deserialize else serializer.serialize(instance)
+
+    return serializer._join_parallel(results)
+
+
+def map_chunks(function: Callable[[List[Any]], List[Any]], instances: List[Any], executor: Executor,
+               chunk_size: int) -> List[Any]:
+    """
+    Runs a batch function over chunks of instances in an executor (e.g. a ThreadPoolExecutor), joining the results
+    in order.
+    """
+    chunks = [instances[i:i + chunk_size] for i in range(0, len(instances), chunk_size)]
+    return list(chain.from_iterable(executor.map(function, chunks)))
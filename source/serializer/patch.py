@@ -0,0 +1,26 @@
+from typing import Any
+
+# Patch operations, see Serializer.diff:
+# [SET, path, serialized value]
+# [REMOVE, path] of a dict key
+# [SPLICE, path of a list, start, number of removed items, [serialized inserted items]]
+SET = 'set'
+REMOVE = 'remove'
+SPLICE = 'splice'
+OPERATIONS = (SET, REMOVE, SPLICE)
+
+
+def is_same(old: Any, new: Any) -> bool:
+    """
+    Whether new needs no patch: equal values of the same type (1, 1.0 and True are written differently).
+    """
+    if old is new:
+        return True
+    if type(old) is not type(new):
+        return False
+
+    try:
+        return bool(old == new)
+    except (TypeError, ValueError):
+        # E.g. NumPy arrays compare element-wise.
+        return False
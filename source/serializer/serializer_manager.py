@@ -1,56 +1,432 @@
+import io
 import json
-from typing import List, Type, Any
+from collections import OrderedDict
+from heapq import merge
+from itertools import islice
+from operator import itemgetter
+from threading import RLock, local
+from time import perf_counter
+from types import MappingProxyType
+from concurrent.futures import Executor
+from functools import partial
+from typing import (
+    List, Dict, Tuple, Type, Any, NamedTuple, Optional, Iterable, Iterator, IO, Union, Callable, AsyncIterable,
+    AsyncIterator
+)
 from abc import ABC, abstractmethod
 from inspect import isclass, isfunction
 
 from .serializable_class import SerializableClass
-from .exceptions import SerializerError
+from .exceptions import SerializerError, BREADCRUMBS, NO_KEY, ITEM_EDGE
+from .json_stream import JsonStreamReader
+from .binary import BinaryReader, MAGIC, BINARY_WRITERS, BINARY_READERS, binary_header, write_json
+from .parallel import run_parallel, map_chunks
+from .json_lines import aiter_line_batches, aiter_batches, run_batch, deserialize_lines, serialize_lines
+from .profiler import active_profiler
+from .interning import run_pooled, STREAM_POOL_SIZE
+from .memo import run_memoized, iter_memoized
+from .graph import run_in_graph, iter_in_graph
+from .typings import Discriminated, Array, Interned
+from .patch import SET, OPERATIONS, is_same
+from .utils import json_value, JSON_ENCODERS
+
+
+class SerializerCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class SerializerOptions(NamedTuple):
+    """
+    Options of a whole serializer tree, passed to create_serializer as keyword arguments.
+    """
+    # Dataclasses and named tuples are written as JSON arrays of field values, without trailing defaults.
+    positional: bool = False
+    # Serialized instances are not validated, see TrustedSerializer.
+    trusted: bool = False
+    # Every node records its calls in the active SerializerProfiler, see ProfiledSerializer.
+    profile: bool = False
+    # Deserialized str, Tuple and NamedTuple values are deduplicated: 'call' shares equal values within one
+    # deserialize call, 'sys' interns strings with sys.intern (and pools tuples per call), see InternedSerializer.
+    intern: Optional[str] = None
+    # Enum members are written as their 'name', 'value' or 'ordinal' (index in the enum), see EnumSerializer.
+    enum_encoding: str = 'name'
+    # Serialized NamedTuple and frozen dataclass instances are memoized by identity: 'call' reuses outputs within
+    # one serialize call, 'weak' also keeps JSON and binary outputs of frozen dataclasses with immutable fields
+    # between calls while the instance lives, see MemoizedSerializer.
+    memo: Optional[str] = None
+    # Dataclass instances met more than once in a call are written once with an id and referenced afterwards,
+    # deserialize restores them as shared instances (cycles included), see GraphSerializer.
+    graph: bool = False
+
+
+DEFAULT_OPTIONS = SerializerOptions()
+INTERN_MODES = (None, 'call', 'sys')
+ENUM_ENCODINGS = ('name', 'value', 'ordinal')
+MEMO_MODES = (None, 'call', 'weak')
+
+
+def _typing_key(typing: Any) -> Any:
+    """
+    typing with the arguments of parameterized typings in order: Union[A, B] equals Union[B, A] but their
+    serializers try members in a different order.
+    """
+    if isinstance(typing, Discriminated):
+        return Discriminated, _typing_key(typing.union), typing.key
+    if isinstance(typing, (Array, Interned)):
+        return type(typing), _typing_key(typing.item)
+
+    args = getattr(typing, '__args__', None)
+    if type(args) is tuple and args:
+        return typing, tuple(map(_typing_key, args))
+
+    return typing
 
 
 class _SerializersManager:
-    def __init__(self):
+    def __init__(self, cache_maxsize: int = 1024):
         self.__serializers: List[Type['Serializer']] = list()
 
+        # Dispatch index. Every entry is (registration index, serializer class); the serializer registered
+        # first wins, so every bucket is kept sorted by registration index. Buckets are tuples replaced on
+        # registration, so lookups read them without the lock.
+        self.__types_index: Dict[Any, Tuple[Tuple[int, Type['Serializer']], ...]] = dict()
+        self.__origins_index: Dict[Any, Tuple[Tuple[int, Type['Serializer']], ...]] = dict()
+        self.__fallback_index: Tuple[Tuple[int, Type['Serializer']], ...] = ()
+
+        # Built serializers keyed by (typing, compile, options) (see _typing_key), least recently used first.
+        # Serializers do not depend on where they are used, so one instance is shared by all parents.
+        self.__cache: 'OrderedDict[Any, Serializer]' = OrderedDict()
+        self.__cache_maxsize = cache_maxsize
+        self.__cache_hits = 0
+        self.__cache_misses = 0
+        # Incremented by every registration: serializers built before it may use outdated serializer classes.
+        self.__generation = 0
+        self.__lock = RLock()
+
+        # Options of the serializer being constructed by the current thread, see Serializer.__new__.
+        self.__local = local()
+
     def register_serializer(self, serializer_class: Type['Serializer']):
-        self.__serializers.append(serializer_class)
+        with self.__lock:
+            entry = (len(self.__serializers), serializer_class)
+            self.__serializers.append(serializer_class)
 
-    def create_serializer(self, typing: Any, breadcrumbs: str) -> 'Serializer':
-        serializer = None
+            if serializer_class.dispatch_types or serializer_class.dispatch_origins:
+                for dispatch_type in serializer_class.dispatch_types:
+                    self.__types_index[dispatch_type] = self.__types_index.get(dispatch_type, ()) + (entry,)
+                for dispatch_origin in serializer_class.dispatch_origins:
+                    self.__origins_index[dispatch_origin] = self.__origins_index.get(dispatch_origin, ()) + (entry,)
+            else:
+                self.__fallback_index += (entry,)
 
-        for _serializer in reversed(self.__serializers):
-            if _serializer.test_typing(typing):
-                serializer = _serializer(typing, breadcrumbs)
+            # A new serializer class may take over typings which are already cached.
+            self.__cache.clear()
+            self.__generation += 1
 
-        if BuiltinTypesSerializer.test_typing(typing):
-            serializer = BuiltinTypesSerializer(typing, breadcrumbs)
+    def cache_info(self) -> SerializerCacheInfo:
+        with self.__lock:
+            return SerializerCacheInfo(self.__cache_hits, self.__cache_misses, self.__cache_maxsize, len(self.__cache))
 
-        if serializer is None:
-            raise SerializerError(
-                '{}: serializer class for typing \'{}\' is not defined. You can write one. '
-                'See serializer/serializers.py for details.'.format(breadcrumbs, typing)
+    def clear_cache(self):
+        with self.__lock:
+            self.__cache.clear()
+            self.__cache_hits = 0
+            self.__cache_misses = 0
+
+    def save_registry(self) -> Any:
+        """
+        State of the registered serializer classes and the cache, see restore_registry. Used by tests defining
+        serializer classes.
+        """
+        with self.__lock:
+            return (
+                list(self.__serializers), dict(self.__types_index), dict(self.__origins_index), self.__fallback_index,
+                OrderedDict(self.__cache), self.__cache_hits, self.__cache_misses
             )
 
+    def restore_registry(self, state: Any):
+        with self.__lock:
+            (
+                serializers, types_index, origins_index, self.__fallback_index, cache, self.__cache_hits,
+                self.__cache_misses
+            ) = state
+            # Copied again, so the state can be restored more than once.
+            self.__serializers = list(serializers)
+            self.__types_index = dict(types_index)
+            self.__origins_index = dict(origins_index)
+            self.__cache = OrderedDict(cache)
+            # Builds running meanwhile may use serializer classes which are not registered anymore.
+            self.__generation += 1
+
+    def build_options(self) -> SerializerOptions:
+        return getattr(self.__local, 'options', DEFAULT_OPTIONS)
+
+    def create_serializer(self, typing: Any, compile: bool = False,
+                          options: SerializerOptions = DEFAULT_OPTIONS) -> 'Serializer':
+        cache_key = (_typing_key(typing), compile, options)
+        try:
+            hash(cache_key)
+        except TypeError:
+            # Unhashable typing, nothing to cache.
+            return self.__build_serializer(typing, compile, options)
+
+        with self.__lock:
+            serializer = self.__cache.get(cache_key)
+            if serializer is not None:
+                self.__cache.move_to_end(cache_key)
+                self.__cache_hits += 1
+                return serializer
+
+            self.__cache_misses += 1
+            generation = self.__generation
+
+        # Children are created recursively during construction, so the lock is not held here.
+        serializer = self.__build_tracked_serializer(typing, compile, options)
+        if any(self.__local.building.values()):
+            # Placeholders of a recursive typing are pending: serializers holding them are cached with the root of
+            # the recursion only, which resolves them.
+            return serializer
+
+        with self.__lock:
+            if generation != self.__generation:
+                # A serializer class was registered during the build, the result is not cached.
+                return serializer
+
+            # Another thread may have built the same serializer meanwhile, prefer the cached one.
+            serializer = self.__cache.setdefault(cache_key, serializer)
+            if len(self.__cache) > self.__cache_maxsize:
+                self.__cache.popitem(last=False)
+
+        return serializer
+
+    def __find_serializer_class(self, typing: Any) -> Optional[Type['Serializer']]:
+        candidates: List[Iterable[Tuple[int, Type['Serializer']]]] = [self.__fallback_index]
+
+        try:
+            candidates.append(self.__types_index.get(typing, ()))
+        except TypeError:
+            # Unhashable typing can not be an exact type match.
+            pass
+
+        origin = getattr(typing, '__origin__', None)
+        if origin is not None:
+            try:
+                candidates.append(self.__origins_index.get(origin, ()))
+            except TypeError:
+                pass
+
+        for _, serializer_class in merge(*candidates, key=itemgetter(0)):
+            if serializer_class.test_typing(typing):
+                return serializer_class
+
+        return None
+
+    def __build_tracked_serializer(self, typing: Any, compile: bool, options: SerializerOptions) -> 'Serializer':
+        """
+        Builds a hashable typing. Its recursive uses (a dataclass with a field of its own type) get placeholders,
+        resolved once the build is done.
+        """
+        building = getattr(self.__local, 'building', None)
+        if building is None:
+            building = self.__local.building = dict()
+
+        key = (_typing_key(typing), compile, options)
+        placeholders = building.get(key)
+        if placeholders is not None:
+            placeholder = RecursiveSerializer(options)
+            placeholders.append(placeholder)
+            return placeholder
+
+        building[key] = placeholders = list()
+        try:
+            serializer = self.__build_serializer(typing, compile, options)
+        finally:
+            del building[key]
+
+        for placeholder in placeholders:
+            placeholder.resolve(serializer)
+
         return serializer
 
+    def __build_serializer(self, typing: Any, compile: bool, options: SerializerOptions) -> 'Serializer':
+        serializer = self.__construct_serializer(typing, compile, options)
+        # Serializers are pickled as the arguments they were built from, see Serializer.__reduce__.
+        serializer._build_arguments = (typing, compile, options)
+        # Built serializers are shared by all threads, see Serializer.__setattr__.
+        serializer._frozen = True
+        return serializer
+
+    def __construct_serializer(self, typing: Any, compile: bool, options: SerializerOptions) -> 'Serializer':
+        if options.trusted:
+            return TrustedSerializer(self.create_serializer(typing, compile, options._replace(trusted=False)))
+
+        if compile and not options.graph:
+            # Generated code runs the interpreted tree again after a failed check, graph mode ids are assigned once.
+            from .compiler import compile_serializer
+
+            return compile_serializer(self.create_serializer(typing, options=options))
+
+        serializer_class = self.__find_serializer_class(typing)
+
+        if serializer_class is None:
+            raise SerializerError(
+                BREADCRUMBS + ': serializer class for typing \'{}\' is not defined. You can write one. '
+                'See serializer/serializers.py for details.'.format(typing)
+            )
+
+        previous_options = self.build_options()
+        self.__local.options = options
+        try:
+            serializer = serializer_class(typing)
+            if options.intern is not None and serializer.internable:
+                serializer = self.__find_serializer_class(Interned[typing])(Interned[typing], serializer)
+            if options.memo is not None and serializer.memoizable:
+                from .serializers import MemoizedSerializer
+
+                serializer = MemoizedSerializer(serializer)
+            if options.graph and serializer.graphable:
+                from .serializers import GraphSerializer
+
+                serializer = GraphSerializer(serializer)
+
+            return serializer
+        finally:
+            self.__local.options = previous_options
+
 
 _serializers_manager = _SerializersManager()
 
 
-def create_serializer(typing: Any) -> 'Serializer':
-    return _serializers_manager.create_serializer(typing, '')
+def create_serializer(typing: Any, compile: bool = False, **options) -> 'Serializer':
+    """
+    Options (see SerializerOptions) apply to the whole serializer tree.
+    """
+    options = SerializerOptions(**options)
+    if options.intern not in INTERN_MODES:
+        raise SerializerError('intern must be one of {}, got {!r}.'.format(INTERN_MODES, options.intern))
+    if options.enum_encoding not in ENUM_ENCODINGS:
+        raise SerializerError('enum_encoding must be one of {}, got {!r}.'.format(ENUM_ENCODINGS, options.enum_encoding))
+    if options.memo not in MEMO_MODES:
+        raise SerializerError('memo must be one of {}, got {!r}.'.format(MEMO_MODES, options.memo))
+    if options.graph and options.memo is not None:
+        raise SerializerError('graph and memo options can not be combined: memoized outputs hold no references.')
+
+    return _create_root_serializer(typing, compile, options)
+
+
+def _create_root_serializer(typing: Any, compile: bool, options: SerializerOptions) -> 'Serializer':
+    root = _serializers_manager.create_serializer(typing, compile, options)
+    if options.profile:
+        # Children are wrapped by their parents, see Serializer._create_serializer.
+        root = ProfiledSerializer(root, None)
+    if root.interning:
+        # Pools live as long as one call of the root, not of every node.
+        root = PooledSerializer(root)
+    if root.memoizing:
+        root = MemoScopeSerializer(root)
+    if root.graphing:
+        root = GraphScopeSerializer(root)
+    if root._build_arguments is None:
+        object.__setattr__(root, '_build_arguments', (typing, compile, options))
+
+    return root
+
+
+def _rebuild_serializer(typing: Any, compile: bool, options: SerializerOptions) -> 'Serializer':
+    return _create_root_serializer(typing, compile, options)
+
+
+def serializer_cache_info() -> SerializerCacheInfo:
+    return _serializers_manager.cache_info()
+
+
+def clear_serializer_cache():
+    _serializers_manager.clear_cache()
 
 
 class Serializer(ABC):
     breadcrumbs: str = ''
 
+    # Optional dispatch hints. A serializer declaring any of them is only tested against typings which are
+    # one of dispatch_types or whose __origin__ is one of dispatch_origins; otherwise it is tested against
+    # every typing.
+    dispatch_types: Tuple[Any, ...] = ()
+    dispatch_origins: Tuple[Any, ...] = ()
+
+    # Runtime types (checked with isinstance) _serialize and _deserialize may accept, None if unknown. Used by
+    # unions to pick candidate members without trying every one of them.
+    serialize_types: Optional[Tuple[type, ...]] = None
+    deserialize_types: Optional[Tuple[type, ...]] = None
+
+    # Runtime type -> function returning JSON of instances of exactly that type, for values _encode_json would
+    # always accept. Parents use them to encode leaves without calling _encode_json.
+    json_encoders: Dict[type, Callable[[Any], str]] = MappingProxyType({})
+
+    _binary_header: Optional[bytes] = None
+
+    # (typing, compile, options) of serializers built by create_serializer.
+    _build_arguments: Optional[Tuple[Any, bool, SerializerOptions]] = None
+
+    _frozen: bool = False
+
+    # True when _serialize_trusted returns the instance itself (JSON primitives and containers of them), so
+    # trusted parents do not call it at all.
+    trusted_identity: bool = False
+
+    options: SerializerOptions = DEFAULT_OPTIONS
+
+    # True for str, Tuple and NamedTuple serializers, which are wrapped in InternedSerializer by the intern option.
+    internable: bool = False
+    # True when _deserialize_lazy defers some work (dataclasses and containers of them), see deserialize_lazy.
+    lazy: bool = False
+    # True for NamedTuple and frozen dataclass serializers, which are wrapped in MemoizedSerializer by the memo
+    # option.
+    memoizable: bool = False
+    # True when the tree memoizes outputs per call, so its root opens a memo, see MemoScopeSerializer.
+    memoizing: bool = False
+    # True when the tree deduplicates values through a per-call pool, so its root opens one, see PooledSerializer.
+    interning: bool = False
+    # True for dataclass serializers, which are wrapped in GraphSerializer by the graph option.
+    graphable: bool = False
+    # True when the tree references instances by ids assigned per call, so its root opens a graph, see
+    # GraphScopeSerializer.
+    graphing: bool = False
+
+    def __new__(cls, *args, **kwargs):
+        # Options are set before __init__, so serializers can use them while creating their children.
+        serializer = super().__new__(cls)
+        serializer.options = _serializers_manager.build_options()
+        return serializer
+
+    def __setattr__(self, name: str, value: Any):
+        # Serializers built by create_serializer are shared between threads and parents, so they can not change.
+        if self._frozen:
+            raise AttributeError('Serializers are immutable once built, can not set \'{}\'.'.format(name))
+
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        # Serializer trees hold functions and generated code, so they are rebuilt from their typing instead,
+        # e.g. in worker processes.
+        if self._build_arguments is None:
+            raise TypeError('Only serializers created by create_serializer can be pickled.')
+
+        return _rebuild_serializer, self._build_arguments
+
     @staticmethod
     @abstractmethod
     def test_typing(typing: Any) -> bool:
         pass
 
     @classmethod
-    def __init_subclass__(cls):
-        _serializers_manager.register_serializer(cls)
+    def __init_subclass__(cls, register: bool = True, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if register:
+            _serializers_manager.register_serializer(cls)
 
     @abstractmethod
     def _serialize(self, instance: Any) -> Any:
@@ -60,16 +436,143 @@ class Serializer(ABC):
     def _deserialize(self, instance: Any) -> Any:
         pass
 
+    def _serialize_trusted(self, instance: Any) -> Any:
+        """
+        Serializes an instance known to be valid, without any checks. The result for invalid instances is
+        undefined.
+        """
+        return self._serialize(instance)
+
+    def _validate(self, instance: Any):
+        """
+        Raises the error _deserialize would raise, without building the result. Built-in serializers override it
+        to allocate nothing; the default runs _deserialize.
+        """
+        self._deserialize(instance)
+
+    def _validate_instance(self, instance: Any):
+        """
+        Raises the error _serialize would raise, without building the result.
+        """
+        self._serialize(instance)
+
+    def _deserialize_lazy(self, instance: Any) -> Any:
+        """
+        Checks the shape of the instance and defers deserializing its fields, see deserialize_lazy. Serializers
+        without anything to defer deserialize at once.
+        """
+        return self._deserialize(instance)
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        """
+        Appends operations turning old into new to patch, see diff. By default a changed value is replaced whole;
+        containers override it to patch their changed parts only.
+        """
+        if not is_same(old, new):
+            patch.append([SET, list(path), self._serialize(new)])
+
+    def _same(self, old: Any, new: Any) -> bool:
+        """
+        Whether new needs no patch, see is_same. Used by parents to skip unchanged items before diffing the rest.
+        """
+        return is_same(old, new)
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        """
+        Applies the operation whose path continues at operation[1][index] to instance, returning the new value:
+        mutable containers are changed in place and returned, immutable ones are rebuilt.
+        """
+        if operation[0] != SET or index != len(operation[1]):
+            raise self._create_patch_error(operation)
+
+        return self._deserialize(operation[2])
+
+    def _create_patch_error(self, operation: List[Any]) -> SerializerError:
+        return SerializerError(BREADCRUMBS + ': invalid patch operation {!r}.'.format(operation), self.breadcrumbs)
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        """
+        Batch hook, may be overridden to serialize a whole batch at once (e.g. field by field). May return
+        `instances` itself and may raise any SerializerError on invalid input: failed batches are serialized
+        one by one again to raise the error of the first invalid instance.
+        """
+        return [self._serialize(instance) for instance in instances]
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        return [self._deserialize(instance) for instance in instances]
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        """
+        Appends JSON of serialized instance to parts. Serializers override it to write JSON directly instead of
+        building the serialized value first.
+        """
+        parts.append(json.dumps(self._serialize(instance)))
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        """
+        Yields JSON of serialized instance in chunks. Containers override it to stream their items instead of
+        encoding the whole value at once.
+        """
+        parts = list()
+        self._encode_json(instance, parts)
+        return iter(parts)
+
+    def _iter_deserialize_json(self, reader: JsonStreamReader) -> Iterator[Any]:
+        """
+        Yields deserialized items of the top-level JSON container read by `reader`.
+        """
+        raise SerializerError(
+            BREADCRUMBS + ': only List and Dict serializers can deserialize JSON incrementally.', self.breadcrumbs
+        )
+
+    def _split_parallel(self, instance: Any, chunk_size: int) -> List[Any]:
+        """
+        Splits the instance into chunks processed by separate serialize/deserialize calls, see _join_parallel.
+        """
+        raise SerializerError(BREADCRUMBS + ': only List and Dict serializers can run in parallel.', self.breadcrumbs)
+
+    def _join_parallel(self, chunks: List[Any]) -> Any:
+        raise NotImplementedError
+
+    def _binary_schema(self) -> str:
+        """
+        Describes what _encode_binary writes. deserialize_binary rejects data written with a different schema.
+        """
+        return 'json({})'.format(self.breadcrumbs)
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        """
+        Appends binary of instance to buffer. By default the serialized value is written as a JSON string.
+        """
+        write_json(buffer, self._serialize(instance))
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        return self._deserialize(reader.read_json())
+
     def _init_breadcrumbs(self, personal_breadcrumbs: str, prev_breadcrumbs: str = None):
-        if prev_breadcrumbs:
-            self.breadcrumbs = '{}->{}'.format(prev_breadcrumbs, personal_breadcrumbs)
-        else:
-            self.breadcrumbs = personal_breadcrumbs
+        # Serializers only know their own breadcrumbs, the full path is collected by SerializerError.
+        # prev_breadcrumbs is accepted for compatibility with serializers written for older versions.
+        self.breadcrumbs = personal_breadcrumbs
+
+    def _create_serializer(self, typing: Any, additional_breadcrumbs: str = '', key: Any = NO_KEY) -> 'Serializer':
+        try:
+            serializer = _serializers_manager.create_serializer(typing, options=self.options)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, additional_breadcrumbs, key)
+
+        if serializer.interning:
+            self.interning = True
+        if serializer.memoizing:
+            self.memoizing = True
+        if serializer.graphing:
+            self.graphing = True
 
-    def _create_serializer(self, typing: Any, additional_breadcrumbs: str = '') -> 'Serializer':
-        breadcrumbs = self.breadcrumbs + additional_breadcrumbs
+        if self.options.profile:
+            # Wrapped per edge, so stats of shared serializers are told apart by their paths.
+            return ProfiledSerializer(serializer, additional_breadcrumbs if key is NO_KEY else
+                                      additional_breadcrumbs.format(key))
 
-        return _serializers_manager.create_serializer(typing, breadcrumbs)
+        return serializer
 
     def _create_standard_type_error(self, expected_types: List[Any], instance: Any) -> SerializerError:
         if len(expected_types) == 1:
@@ -78,25 +581,250 @@ class Serializer(ABC):
             expected_types_str = 'expected types: {}'.format(expected_types)
 
         return SerializerError(
-            'Validation error. {}: '
+            'Validation error. ' + BREADCRUMBS + ': '
             '{}; '
-            'got {}. '.format(self.breadcrumbs, expected_types_str, type(instance))
+            'got {}. '.format(expected_types_str, type(instance)),
+            self.breadcrumbs
         )
 
-    def serialize(self, instance: Any) -> Any:
+    def serialize(self, instance: Any, trusted: bool = False) -> Any:
+        """
+        With trusted=True the instance is not validated, see create_serializer(typing, trusted=True).
+        """
+        if trusted:
+            return self._serialize_trusted(instance)
+
         return self._serialize(instance)
 
     def deserialize(self, instance: Any) -> Any:
         return self._deserialize(instance)
 
-    def serialize_json(self, instance: Any) -> str:
-        return json.dumps(self.serialize(instance))
+    def deserialize_lazy(self, instance: Any) -> Any:
+        """
+        Returns dataclasses whose fields are deserialized (and validated) on first access and then cached; lists and
+        dicts are deserialized when the field holding them is read, with lazy dataclass items. Errors raise on
+        access, with paths relative to the accessed dataclass. materialize() of a lazy dataclass deserializes all
+        its data with all checks.
+        """
+        return self._deserialize_lazy(instance)
+
+    def diff(self, old: Any, new: Any) -> List[Any]:
+        """
+        Returns a patch turning old into new for apply_patch: a JSON-ready list of operations on changed dataclass
+        and named tuple fields, dict keys, list ranges and tuple items, with values serialized as by serialize.
+        Equal values are skipped, so the patch is as large as the change.
+        """
+        patch: List[Any] = list()
+        self._diff(old, new, (), patch)
+        return patch
+
+    def apply_patch(self, instance: Any, patch: List[Any]) -> Any:
+        """
+        Applies a patch made by diff (or its JSON) to instance, which is changed in place where possible (lists, dicts
+        and dataclasses; frozen dataclasses and tuples are replaced). Returns the patched value.
+        """
+        if not isinstance(patch, list):
+            raise SerializerError('Invalid patch: expected list, got {}.'.format(type(patch)))
+
+        for operation in patch:
+            if not isinstance(operation, list) or len(operation) < 2 or operation[0] not in OPERATIONS or \
+                    not isinstance(operation[1], list):
+                raise SerializerError('Invalid patch operation {!r}.'.format(operation))
+
+            instance = self._patch(instance, operation, 0)
+
+        return instance
+
+    def validate(self, instance: Any):
+        """
+        Checks that deserialize would accept instance: raises the same SerializerError, returns None.
+        """
+        self._validate(instance)
+
+    def validate_instance(self, instance: Any):
+        """
+        Checks that serialize would accept instance: raises the same SerializerError, returns None.
+        """
+        self._validate_instance(instance)
+
+    def serialize_many(self, instances: Iterable[Any], executor: Optional[Executor] = None,
+                       chunk_size: int = 1024) -> List[Any]:
+        """
+        With an executor (e.g. a ThreadPoolExecutor, which runs in parallel on free-threaded Python) instances are
+        serialized in chunks of `chunk_size` by its workers. Built serializers are immutable, so threads share them.
+        """
+        instances = list(instances)
+        if executor is not None and len(instances) > chunk_size:
+            return self.__map_chunks(self.serialize_many, instances, executor, chunk_size)
+
+        return self.__run_many(self._serialize_many, self.serialize, instances)
+
+    def deserialize_many(self, instances: Iterable[Any], executor: Optional[Executor] = None,
+                         chunk_size: int = 1024) -> List[Any]:
+        instances = list(instances)
+        if executor is not None and len(instances) > chunk_size:
+            return self.__map_chunks(self.deserialize_many, instances, executor, chunk_size)
+
+        return self.__run_many(self._deserialize_many, self.deserialize, instances)
+
+    def iter_serialize_many(self, instances: Iterable[Any], batch_size: int = 1024) -> Iterator[Any]:
+        instances = iter(instances)
+        start = 0
+        batch = list(islice(instances, batch_size))
+        while batch:
+            yield from self.__run_many(self._serialize_many, self.serialize, batch, start)
+            start += len(batch)
+            batch = list(islice(instances, batch_size))
+
+    def iter_deserialize_many(self, instances: Iterable[Any], batch_size: int = 1024) -> Iterator[Any]:
+        instances = iter(instances)
+        start = 0
+        batch = list(islice(instances, batch_size))
+        while batch:
+            yield from self.__run_many(self._deserialize_many, self.deserialize, batch, start)
+            start += len(batch)
+            batch = list(islice(instances, batch_size))
+
+    def __run_many(self, function_many: Callable[[List[Any]], List[Any]], function: Callable[[Any], Any],
+                   instances: List[Any], start: int = 0) -> List[Any]:
+        try:
+            return function_many(instances)
+        except SerializerError:
+            pass
+
+        # The batch is run again item by item, so the error is the one of the first invalid item, with its index
+        # (from the start of the stream for iter_*_many) in the path.
+        results = list()
+        for i, instance in enumerate(instances, start):
+            try:
+                results.append(function(instance))
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, ITEM_EDGE, i)
+
+        return results
+
+    @staticmethod
+    def __map_chunks(function: Callable[[List[Any]], List[Any]], instances: List[Any], executor: Executor,
+                     chunk_size: int) -> List[Any]:
+        try:
+            return map_chunks(function, instances, executor, chunk_size)
+        except SerializerError:
+            # Indexes of a chunk start at the chunk, run again in this thread for the index in the whole batch.
+            return function(instances)
+
+    def serialize_json(self, instance: Any, trusted: bool = False) -> str:
+        if trusted:
+            return json.dumps(self._serialize_trusted(instance))
+
+        parts = list()
+        self._encode_json(instance, parts)
+        return ''.join(parts)
 
     def deserialize_json(self, json_string: str) -> Any:
         return self.deserialize(json.loads(json_string))
 
+    def iter_serialize_json(self, instance: Any, chunk_size: int = 65536) -> Iterator[str]:
+        """
+        Yields the same JSON as serialize_json, in chunks of about chunk_size characters.
+        """
+        chunks = list()
+        size = 0
+        for chunk in self._iter_json(instance):
+            chunks.append(chunk)
+            size += len(chunk)
+
+            if size >= chunk_size:
+                yield ''.join(chunks)
+                chunks = list()
+                size = 0
+
+        if chunks:
+            yield ''.join(chunks)
+
+    def iter_deserialize_json(self, fp: Union[IO, Iterable[Union[str, bytes]]],
+                              chunk_size: int = 65536) -> Iterator[Any]:
+        """
+        Incrementally reads a top-level JSON array (yielding items) or object (yielding (key, value) pairs) from
+        a text or binary file-like object or an iterable of str/bytes chunks.
+        """
+        return self._iter_deserialize_json(JsonStreamReader(fp, chunk_size))
+
+    def serialize_json_to(self, fp: IO, instance: Any, chunk_size: int = 65536):
+        binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase))
+        for chunk in self.iter_serialize_json(instance, chunk_size):
+            # JSON is ascii only.
+            fp.write(chunk.encode('ascii') if binary else chunk)
+
+    def serialize_parallel(self, instance: Any, workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                           executor: Optional[Executor] = None) -> Any:
+        """
+        serialize in a process pool: the top-level list or dict is split into chunks of `chunk_size` items
+        serialized by `workers` processes (or by `executor`). The serializer is pickled, see __reduce__.
+        """
+        return run_parallel(self, instance, False, workers, chunk_size, executor)
+
+    def deserialize_parallel(self, instance: Any, workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                             executor: Optional[Executor] = None) -> Any:
+        return run_parallel(self, instance, True, workers, chunk_size, executor)
+
+    async def adeserialize_lines(self, reader: Any, executor: Optional[Executor] = None,
+                                 chunk_size: int = 65536) -> AsyncIterator[Any]:
+        """
+        Yields deserialized records of JSON Lines read from an asyncio.StreamReader or an async iterable of bytes
+        chunks. Lines are decoded in batches; with an executor, large batches are decoded in it.
+        """
+        async for lines in aiter_line_batches(reader, chunk_size):
+            for instance in await run_batch(partial(deserialize_lines, self), lines, executor):
+                yield instance
+
+    async def aserialize_lines(self, writer: Any, instances: Union[AsyncIterable[Any], Iterable[Any]],
+                               executor: Optional[Executor] = None, batch_size: int = 1024):
+        """
+        Writes instances as JSON Lines to an asyncio.StreamWriter (anything with `write` and an optional async
+        `drain`), waiting for the writer to drain after every batch of `batch_size` instances.
+        """
+        async for batch in aiter_batches(instances, batch_size):
+            writer.write(await run_batch(partial(serialize_lines, self), batch, executor))
+
+            drain = getattr(writer, 'drain', None)
+            if drain is not None:
+                await drain()
+
+    @property
+    def binary_header(self) -> bytes:
+        """
+        Format magic and fingerprint of the binary schema, written before every serialize_binary output.
+        """
+        if self._binary_header is None:
+            # A lazily computed constant, threads racing here store equal values.
+            object.__setattr__(self, '_binary_header', binary_header(self._binary_schema()))
+
+        return self._binary_header
+
+    def serialize_binary(self, instance: Any) -> bytes:
+        buffer = bytearray(self.binary_header)
+        self._encode_binary(instance, buffer)
+        return bytes(buffer)
+
+    def deserialize_binary(self, data: bytes) -> Any:
+        data = bytes(data)
+        header = self.binary_header
+        if not data.startswith(header):
+            if not data.startswith(MAGIC):
+                raise SerializerError('Invalid binary data: unknown format.')
+            raise SerializerError('Invalid binary data: it was written by a serializer with a different schema.')
+
+        reader = BinaryReader(data, len(header))
+        instance = self._decode_binary(reader)
+        if reader.position != len(data):
+            raise SerializerError('Invalid binary data: {} extra bytes.'.format(len(data) - reader.position))
+
+        return instance
+
 
 class BuiltinTypesSerializer(Serializer):
+    dispatch_types = (int, str, float, bool, None, type(None), dict, list, tuple)
+
     @staticmethod
     def test_typing(typing: Any) -> bool:
         is_primitive = (typing is int) or \
@@ -111,13 +839,25 @@ class BuiltinTypesSerializer(Serializer):
 
         return is_primitive or is_collection
 
-    def __init__(self, typing: Any, prev_breadcrumbs: str = None):
+    def __init__(self, typing: Any):
         if typing is None:
             self.type = type(None)
-            self._init_breadcrumbs('None', prev_breadcrumbs)
+            self._init_breadcrumbs('None')
         else:
             self.type = typing
-            self._init_breadcrumbs(typing.__name__, prev_breadcrumbs)
+            self._init_breadcrumbs(typing.__name__)
+
+        self.internable = self.type is str
+
+        self.serialize_types = (self.type,)
+        self.deserialize_types = (self.type,)
+        if self.type in JSON_ENCODERS:
+            self.json_encoders = {self.type: JSON_ENCODERS[self.type]}
+
+        # Untyped dict, list and tuple are written as JSON.
+        self.binary_writer = BINARY_WRITERS.get(self.type)
+        self.binary_reader = BINARY_READERS.get(self.type)
+        self.trusted_identity = True
 
     def _serialize(self, instance: Any) -> Any:
         if not isinstance(instance, self.type):
@@ -131,6 +871,52 @@ class BuiltinTypesSerializer(Serializer):
 
         return instance
 
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return instance
+
+    def _validate(self, instance: Any):
+        if not isinstance(instance, self.type):
+            raise self._create_standard_type_error([self.type], instance)
+
+    _validate_instance = _validate
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        for instance in instances:
+            if not isinstance(instance, self.type):
+                raise self._create_standard_type_error([self.type], instance)
+
+        return instances
+
+    _deserialize_many = _serialize_many
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        if not isinstance(instance, self.type):
+            raise self._create_standard_type_error([self.type], instance)
+
+        parts.append(json_value(instance))
+
+    def _binary_schema(self) -> str:
+        if self.binary_writer is None:
+            return super()._binary_schema()
+
+        return self.breadcrumbs
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        # Binary ints would read bools back as 1 and 0, JSON keeps them: unions try their next member.
+        if not isinstance(instance, self.type) or self.type is int and type(instance) is bool:
+            raise self._create_standard_type_error([self.type], instance)
+
+        if self.binary_writer is None:
+            write_json(buffer, instance)
+        else:
+            self.binary_writer(buffer, instance)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        if self.binary_reader is None:
+            return self._deserialize(reader.read_json())
+
+        return self.binary_reader(reader)
+
 
 class SerializableClassSerializer(Serializer):
     @staticmethod
@@ -144,10 +930,12 @@ class SerializableClassSerializer(Serializer):
         #     isfunction(getattr(typing, 'deserialize'))
         # )
 
-    def __init__(self, typing: Any, prev_breadcrumbs: str = None):
-        self._init_breadcrumbs('serializable_class.{}'.format(typing.__name__), prev_breadcrumbs)
+    def __init__(self, typing: Any):
+        self._init_breadcrumbs('serializable_class.{}'.format(typing.__name__))
 
         self.type = typing
+        self.serialize_types = (typing,)
+        self.deserialize_types = (int, str, float, bool, type(None), dict, list, tuple)
 
     @staticmethod
     def __ensure_serialization_valid(instance: Any):
@@ -177,3 +965,349 @@ class SerializableClassSerializer(Serializer):
 
     def _deserialize(self, instance: Any) -> Any:
         return self.type.deserialize(self.__ensure_serialization_valid(instance))
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return instance.serialize()
+
+
+class _WrapperSerializer(Serializer, register=False):
+    """
+    Base of serializers wrapping another one, e.g. to run it in a call scope or to record its calls: every hook is
+    forwarded to the wrapped serializer, subclasses override only the hooks they change.
+    """
+
+    @staticmethod
+    def test_typing(typing: Any) -> bool:
+        return False
+
+    def __init__(self, serializer: Serializer):
+        self._init_breadcrumbs(serializer.breadcrumbs)
+        self.options = serializer.options
+
+        self.serializer = serializer
+        self.serialize_types = serializer.serialize_types
+        self.deserialize_types = serializer.deserialize_types
+
+    def _serialize(self, instance: Any) -> Any:
+        return self.serializer._serialize(instance)
+
+    def _deserialize(self, instance: Any) -> Any:
+        return self.serializer._deserialize(instance)
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return self.serializer._serialize_trusted(instance)
+
+    def _validate(self, instance: Any):
+        self.serializer._validate(instance)
+
+    def _validate_instance(self, instance: Any):
+        self.serializer._validate_instance(instance)
+
+    def _deserialize_lazy(self, instance: Any) -> Any:
+        return self.serializer._deserialize_lazy(instance)
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        self.serializer._diff(old, new, path, patch)
+
+    def _same(self, old: Any, new: Any) -> bool:
+        return self.serializer._same(old, new)
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        return self.serializer._patch(instance, operation, index)
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        return self.serializer._serialize_many(instances)
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        return self.serializer._deserialize_many(instances)
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        self.serializer._encode_json(instance, parts)
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        return self.serializer._iter_json(instance)
+
+    def _iter_deserialize_json(self, reader: JsonStreamReader) -> Iterator[Any]:
+        return self.serializer._iter_deserialize_json(reader)
+
+    def _split_parallel(self, instance: Any, chunk_size: int) -> List[Any]:
+        return self.serializer._split_parallel(instance, chunk_size)
+
+    def _join_parallel(self, chunks: List[Any]) -> Any:
+        return self.serializer._join_parallel(chunks)
+
+    def _binary_schema(self) -> str:
+        return self.serializer._binary_schema()
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        self.serializer._encode_binary(instance, buffer)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        return self.serializer._decode_binary(reader)
+
+
+class TrustedSerializer(_WrapperSerializer, register=False):
+    """
+    Serializes with the unchecked _serialize_trusted path of the wrapped serializer: for instances built by
+    the program itself, whose types are known to match the typing. Deserialization is validated as usual.
+    """
+
+    def __init__(self, serializer: Serializer):
+        super().__init__(serializer)
+        self.options = serializer.options._replace(trusted=True)
+
+        self.trusted_identity = serializer.trusted_identity
+        self.interning = serializer.interning
+        self.memoizing = serializer.memoizing
+        self.graphing = serializer.graphing
+        self.lazy = serializer.lazy
+
+    def _serialize(self, instance: Any) -> Any:
+        return self.serializer._serialize_trusted(instance)
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        return list(map(self.serializer._serialize_trusted, instances))
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        # Trusted values need no checks, so json encodes them faster than the serializer tree.
+        parts.append(json.dumps(self.serializer._serialize_trusted(instance)))
+
+
+class ProfiledSerializer(_WrapperSerializer, register=False):
+    """
+    Records calls of the wrapped serializer in the active SerializerProfiler. `edge` leads from the parent to the
+    wrapped serializer, None for roots. Leaves encoded by their parents with json_encoders are not recorded.
+    """
+
+    def __init__(self, serializer: Serializer, edge: Optional[str]):
+        super().__init__(serializer)
+
+        self.edge = edge
+        self.json_encoders = serializer.json_encoders
+        self.trusted_identity = serializer.trusted_identity
+        self.interning = serializer.interning
+        self.memoizing = serializer.memoizing
+        self.graphing = serializer.graphing
+        self.lazy = serializer.lazy
+        self._frozen = True
+
+    def __run(self, function: Callable, instance: Any, output: Any = None) -> Any:
+        profiler = active_profiler()
+        if profiler is None:
+            return function(instance) if output is None else function(instance, output)
+
+        frame = profiler.enter(self.breadcrumbs, self.edge, output)
+        start = perf_counter()
+        try:
+            return function(instance) if output is None else function(instance, output)
+        finally:
+            profiler.exit(frame, perf_counter() - start, instance, output)
+
+    def _serialize(self, instance: Any) -> Any:
+        return self.__run(self.serializer._serialize, instance)
+
+    def _deserialize(self, instance: Any) -> Any:
+        return self.__run(self.serializer._deserialize, instance)
+
+    def _deserialize_lazy(self, instance: Any) -> Any:
+        return self.__run(self.serializer._deserialize_lazy, instance)
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return self.__run(self.serializer._serialize_trusted, instance)
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        return self.__run(self.serializer._serialize_many, instances)
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        return self.__run(self.serializer._deserialize_many, instances)
+
+    def _validate(self, instance: Any):
+        self.__run(self.serializer._validate, instance)
+
+    def _validate_instance(self, instance: Any):
+        self.__run(self.serializer._validate_instance, instance)
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        self.__run(self.serializer._encode_json, instance, parts)
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        self.__run(self.serializer._encode_binary, instance, buffer)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        profiler = active_profiler()
+        if profiler is None:
+            return self.serializer._decode_binary(reader)
+
+        frame = profiler.enter(self.breadcrumbs, self.edge, reader)
+        start = perf_counter()
+        try:
+            return self.serializer._decode_binary(reader)
+        finally:
+            profiler.exit(frame, perf_counter() - start, None, reader)
+
+
+class PooledSerializer(_WrapperSerializer, register=False):
+    """
+    Root of a tree with InternedSerializer nodes using a per-call pool: every deserialize call (or batch of
+    deserialize_many, or binary data) gets a fresh pool, dropped when the call returns.
+    """
+
+    def __init__(self, serializer: Serializer):
+        super().__init__(serializer)
+        self.json_encoders = serializer.json_encoders
+        self.trusted_identity = serializer.trusted_identity
+        self._frozen = True
+
+    def _deserialize(self, instance: Any) -> Any:
+        return run_pooled({}, self.serializer._deserialize, instance)
+
+    def _deserialize_lazy(self, instance: Any) -> Any:
+        # Fields are read after the call returned, they are not interned.
+        return self.serializer._deserialize_lazy(instance)
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        return run_pooled({}, self.serializer._patch, instance, operation, index)
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        return run_pooled({}, self.serializer._deserialize_many, instances)
+
+    def _iter_deserialize_json(self, reader: JsonStreamReader) -> Iterator[Any]:
+        # The pool is shared by all items, but only active while an item is read: the consumer runs in between.
+        pool: Dict[Any, Any] = dict()
+        items = self.serializer._iter_deserialize_json(reader)
+        while True:
+            if len(pool) > STREAM_POOL_SIZE:
+                pool = dict()
+
+            try:
+                item = run_pooled(pool, next, items)
+            except StopIteration:
+                return
+
+            yield item
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        return run_pooled({}, self.serializer._decode_binary, reader)
+
+
+class MemoScopeSerializer(_WrapperSerializer, register=False):
+    """
+    Root of a tree with MemoizedSerializer nodes: every serialize call gets a fresh memo of outputs by instance
+    identity, dropped when the call returns.
+    """
+
+    def __init__(self, serializer: Serializer):
+        super().__init__(serializer)
+        self.trusted_identity = serializer.trusted_identity
+        self._frozen = True
+
+    def _serialize(self, instance: Any) -> Any:
+        return run_memoized(self.serializer._serialize, instance)
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        run_memoized(self.serializer._diff, old, new, path, patch)
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return run_memoized(self.serializer._serialize_trusted, instance)
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        return run_memoized(self.serializer._serialize_many, instances)
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        run_memoized(self.serializer._encode_json, instance, parts)
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        return iter_memoized(iter(self.serializer._iter_json(instance)))
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        run_memoized(self.serializer._encode_binary, instance, buffer)
+
+
+class GraphScopeSerializer(_WrapperSerializer, register=False):
+    """
+    Root of a tree with GraphSerializer nodes: instance ids are assigned per call, so every serialize and deserialize
+    call (and every item of the batch methods) gets a fresh graph. Streamed items share one graph, as do the values
+    of one patch.
+    """
+
+    def __init__(self, serializer: Serializer):
+        super().__init__(serializer)
+        self._frozen = True
+
+    def apply_patch(self, instance: Any, patch: List[Any]) -> Any:
+        return run_in_graph(super().apply_patch, instance, patch)
+
+    def _serialize(self, instance: Any) -> Any:
+        return run_in_graph(self.serializer._serialize, instance)
+
+    def _deserialize(self, instance: Any) -> Any:
+        return run_in_graph(self.serializer._deserialize, instance)
+
+    def _deserialize_lazy(self, instance: Any) -> Any:
+        return run_in_graph(self.serializer._deserialize_lazy, instance)
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        run_in_graph(self.serializer._diff, old, new, path, patch)
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        return run_in_graph(self.serializer._patch, instance, operation, index)
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return run_in_graph(self.serializer._serialize_trusted, instance)
+
+    def _validate(self, instance: Any):
+        run_in_graph(self.serializer._validate, instance)
+
+    def _validate_instance(self, instance: Any):
+        run_in_graph(self.serializer._validate_instance, instance)
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        serialize = self.serializer._serialize
+        return [run_in_graph(serialize, instance) for instance in instances]
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        deserialize = self.serializer._deserialize
+        return [run_in_graph(deserialize, instance) for instance in instances]
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        run_in_graph(self.serializer._encode_json, instance, parts)
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        return iter_in_graph(iter(self.serializer._iter_json(instance)))
+
+    def _iter_deserialize_json(self, reader: JsonStreamReader) -> Iterator[Any]:
+        return iter_in_graph(iter(self.serializer._iter_deserialize_json(reader)))
+
+    def _split_parallel(self, instance: Any, chunk_size: int) -> List[Any]:
+        # References span the whole instance, it is processed in one call.
+        return [instance]
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        run_in_graph(self.serializer._encode_binary, instance, buffer)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        return run_in_graph(self.serializer._decode_binary, reader)
+
+
+class RecursiveSerializer(_WrapperSerializer, register=False):
+    """
+    Placeholder for a typing used within its own definition (e.g. a dataclass field of type Optional['Node']),
+    created while the typing is built and resolved to its serializer once built. Its runtime types are unknown
+    to parents, so unions try it as a candidate for any value.
+    """
+
+    def __init__(self, options: SerializerOptions):
+        self.options = options
+        self.serializer: Optional[Serializer] = None
+
+    def resolve(self, serializer: Serializer):
+        self._init_breadcrumbs(serializer.breadcrumbs)
+        self.serializer = serializer
+        self.lazy = serializer.lazy
+        self._frozen = True
+
+    def _binary_schema(self) -> str:
+        # The schema of the typing itself contains this placeholder.
+        return 'recursive({})'.format(self.breadcrumbs)
+
+
@@ -1,27 +1,424 @@
+import sys
+from array import array
 from inspect import signature, isclass
-from typing import List, Tuple, Dict, Type, Any, Union, Optional
+from weakref import ref
+from itertools import repeat, islice, chain
+from operator import attrgetter, itemgetter
+from typing import List, Tuple, Dict, Set, Type, Any, Union, Optional, Iterator, Callable, get_type_hints
 from enum import Enum
-from dataclasses import is_dataclass
+from dataclasses import is_dataclass, fields, replace, MISSING
+
+from .exceptions import SerializerError, BREADCRUMBS, FIELD_EDGE, INDEX_EDGE, ITEM_EDGE, KEY_EDGE, VALUE_EDGE
+from .serializer_manager import Serializer, BuiltinTypesSerializer, ProfiledSerializer, _WrapperSerializer
+from .json_stream import JsonStreamReader
+from .binary import BinaryReader, write_varint
+from .typings import Discriminated, Array, Interned
+from .interning import active_pool, intern_value
+from .lazy import create_lazy_class, create_lazy_instance
+from .patch import SET, REMOVE, SPLICE, is_same
+from .memo import active_memo, weak_outputs
+from .graph import CallGraph, active_graph, graph_mark, restore_graph, run_in_graph, run_comparing, iter_in_graph, \
+    ID_KEY, REF_KEY, VALUE_KEY
+from .utils import is_typing, json_key, json_value, parse_json_key
+
+try:
+    import numpy
+except ImportError:
+    # Array fields are deserialized into lists.
+    numpy = None
+
+# Python types json.loads produces.
+JSON_TYPES = (dict, list, str, int, float, bool, type(None))
+
+
+def _split_lists(instances: List[list], items: List[Any]) -> List[list]:
+    """
+    Splits items of all instances, processed in one batch, back into lists of instance lengths.
+    """
+    lists = list()
+    start = 0
+    for instance in instances:
+        end = start + len(instance)
+        lists.append(items[start:end])
+        start = end
+
+    return lists
+
+
+def _split_dicts(instances: List[dict], keys: List[Any], values: List[Any]) -> List[dict]:
+    dicts = list()
+    start = 0
+    for instance in instances:
+        end = start + len(instance)
+        dicts.append(dict(zip(keys[start:end], values[start:end])))
+        start = end
+
+    return dicts
+
+
+def _iter_json_list(serializer: Serializer, serializers: Any, instance: Any, edge: str) -> Iterator[str]:
+    """
+    Yields JSON array of instance items, serialized by the matching items of `serializers`.
+    """
+    yield '['
+
+    i = 0
+    try:
+        for item, item_serializer in zip(instance, serializers):
+            if i:
+                yield ', '
+            yield from item_serializer._iter_json(item)
+            i += 1
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, edge, i)
+
+    yield ']'
+
+
+def _encode_json_list(serializer: Serializer, serializers: Any, instance: Any, edge: str, parts: List[str]):
+    separator = '['
+
+    i = 0
+    try:
+        for item, item_serializer in zip(instance, serializers):
+            encoder = item_serializer.json_encoders.get(type(item))
+            if encoder is None:
+                parts.append(separator)
+                item_serializer._encode_json(item, parts)
+            else:
+                parts.append(separator + encoder(item))
+            separator = ', '
+            i += 1
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, edge, i)
+
+    parts.append(']' if i else '[]')
+
+
+def _json_fields(keys: List[str], formatter_instances: Dict[str, Serializer],
+                 positional: bool) -> Tuple[Tuple[Any, ...], ...]:
+    """
+    (JSON written before the value, key, serializer) of every field, e.g. '{"id": ' and ', "login": ', or '['
+    and ', ' in positional mode.
+    """
+    if positional:
+        return tuple((('[' if i == 0 else ', '), key, formatter_instances[key]) for i, key in enumerate(keys))
+
+    return tuple(
+        (('{' if i == 0 else ', ') + json_key(key) + ': ', key, formatter_instances[key])
+        for i, key in enumerate(keys)
+    )
+
+
+def _trailing_defaults(keys: List[str], defaults: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """
+    (key, default) of the last fields which have a default value, last field first. In positional mode such
+    fields are not written while they are equal to their defaults.
+    """
+    trailing_defaults = list()
+    for key in reversed(keys):
+        if key not in defaults:
+            break
+        trailing_defaults.append((key, defaults[key]))
+
+    return tuple(trailing_defaults)
+
+
+def _required_size(keys: List[str], keys_with_default: Set[str]) -> int:
+    """
+    Minimal length of a positional JSON array: position of the last field without default value plus one.
+    """
+    size = len(keys)
+    while size and keys[size - 1] in keys_with_default:
+        size -= 1
+
+    return size
+
+
+def _positional_size(serializer: Any, instance: Any) -> int:
+    """
+    Number of fields of instance written in positional mode.
+    """
+    size = len(serializer.keys)
+    for key, default in serializer.trailing_defaults:
+        value = getattr(instance, key)
+        if type(value) is not type(default) or value != default:
+            break
+        size -= 1
+
+    return size
+
+
+def _trusted_fields(keys: List[str], formatter_instances: Dict[str, Serializer]) -> Tuple[Tuple[Any, ...], ...]:
+    """
+    (key, trusted serialize function) of every field, the function is None for fields serialized as they are.
+    """
+    return tuple(
+        (key, None if formatter_instances[key].trusted_identity else formatter_instances[key]._serialize_trusted)
+        for key in keys
+    )
+
+
+def _serialize_fields_trusted(serializer: Any, instance: Any) -> Any:
+    trusted_fields = serializer.trusted_fields
+    if serializer.options.positional:
+        trusted_fields = trusted_fields[:_positional_size(serializer, instance)]
+
+    values = list()
+    for key, function in trusted_fields:
+        value = getattr(instance, key)
+        values.append(value if function is None else function(value))
+
+    if serializer.options.positional:
+        return values
+
+    return dict(zip(serializer.keys, values))
+
+
+def _serialize_positional(serializer: Any, instance: Any) -> List[Any]:
+    values = list()
+    try:
+        for _, key, formatter_instance in serializer.json_fields[:_positional_size(serializer, instance)]:
+            values.append(formatter_instance.serialize(getattr(instance, key)))
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
+    return values
+
+
+def _diff_fields(serializer: Any, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+    """
+    Diffs fields of dataclasses or named tuples one by one.
+    """
+    try:
+        for key in serializer.keys:
+            serializer.formatter_instances[key]._diff(getattr(old, key), getattr(new, key), path + (key,), patch)
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
+
+def _patch_field(serializer: Any, instance: Any, operation: List[Any], index: int) -> Tuple[str, Any]:
+    """
+    Returns (field name, patched field value) of the operation continuing at operation[1][index].
+    """
+    key = operation[1][index]
+    formatter_instance = serializer.formatter_instances.get(key) if isinstance(key, str) else None
+    if formatter_instance is None:
+        raise serializer._create_patch_error(operation)
+
+    try:
+        return key, formatter_instance._patch(getattr(instance, key), operation, index + 1)
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
+
+def _immutable(serializer: Serializer) -> bool:
+    """
+    Whether values of serializer can not change once created: primitives, enums, and tuples, named tuples and frozen
+    dataclasses of such values.
+    """
+    while isinstance(serializer, (ProfiledSerializer, InternedSerializer, MemoizedSerializer)):
+        serializer = serializer.serializer
+
+    serializer_type = type(serializer)
+    if serializer_type is BuiltinTypesSerializer:
+        return serializer.type in (int, str, float, bool, type(None))
+    if serializer_type is EnumSerializer:
+        return True
+    if serializer_type is TupleSerializer or serializer_type is UnionSerializer:
+        return all(map(_immutable, serializer.serializer_instances))
+    if serializer_type is NamedTupleSerializer or (serializer_type is DataclassSerializer and serializer.frozen):
+        return all(map(_immutable, serializer.formatter_instances.values()))
+
+    # Lists, dicts, Any, custom serializers and recursive typings.
+    return False
+
+
+def _type_hints(typing: Any) -> Dict[str, Any]:
+    """
+    Field annotations with forward references resolved (e.g. Optional['Node'] in a recursive dataclass), empty when
+    they can not be resolved.
+    """
+    try:
+        return get_type_hints(typing, include_extras=True)
+    except (NameError, TypeError):
+        return {}
+
+
+def _check_positional_size(serializer: Any, size: int):
+    if not serializer.required_size <= size <= len(serializer.keys):
+        raise SerializerError(BREADCRUMBS + ': expected from {} to {} positional fields, got {}.'.format(
+            serializer.required_size, len(serializer.keys), size
+        ), serializer.breadcrumbs)
+
+
+def _deserialize_positional(serializer: Any, instance: List[Any]) -> Dict[str, Any]:
+    """
+    Deserializes fields of a positional JSON array, omitted fields are left to their defaults.
+    """
+    _check_positional_size(serializer, len(instance))
+
+    values = dict()
+    try:
+        for key, value in zip(serializer.keys, instance):
+            values[key] = serializer.formatter_instances[key].deserialize(value)
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
+    return values
+
+
+def _validate_fields(serializer: Any, instance: Any, start: int = 0):
+    """
+    Validates a JSON object of fields, or a positional JSON array of fields from index `start`, raising the
+    errors _deserialize raises.
+    """
+    formatter_instances = serializer.formatter_instances
+
+    if serializer.options.positional and isinstance(instance, list):
+        _check_positional_size(serializer, len(instance) - start)
+
+        try:
+            for key in serializer.keys:
+                if start == len(instance):
+                    break
+                formatter_instances[key]._validate(instance[start])
+                start += 1
+        except SerializerError as e:
+            raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+        return
+
+    if not isinstance(instance, dict):
+        raise serializer._create_standard_type_error(list(serializer.deserialize_types), instance)
+
+    for key in serializer.keys:
+        if key not in instance and key not in serializer.keys_with_default:
+            raise SerializerError('missing required key \'{}\''.format(key))
+
+    try:
+        for key in serializer.keys:
+            if key in instance:
+                formatter_instances[key]._validate(instance[key])
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
+
+def _validate_instance_fields(serializer: Any, instance: Any):
+    try:
+        for key, formatter_instance in serializer.formatter_instances.items():
+            formatter_instance._validate_instance(getattr(instance, key))
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
+
+def _encode_json_fields(serializer: Any, instance: Any, parts: List[str]):
+    json_fields = serializer.json_fields
+    if serializer.options.positional:
+        json_fields = json_fields[:_positional_size(serializer, instance)]
+
+    if not json_fields:
+        parts.append('[]' if serializer.options.positional else '{}')
+        return
+
+    try:
+        for prefix, key, formatter_instance in json_fields:
+            value = getattr(instance, key)
+            encoder = formatter_instance.json_encoders.get(type(value))
+            if encoder is None:
+                parts.append(prefix)
+                formatter_instance._encode_json(value, parts)
+            else:
+                parts.append(prefix + encoder(value))
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
+    parts.append(']' if serializer.options.positional else '}')
+
+
+def _binary_decoder(serializer: Serializer) -> Callable[[BinaryReader], Any]:
+    """
+    Primitives are read by the reader directly, skipping the serializer call.
+    """
+    if type(serializer) is BuiltinTypesSerializer and serializer.binary_reader is not None:
+        return serializer.binary_reader
+
+    return serializer._decode_binary
+
+
+def _binary_fields_schema(serializer: Any) -> str:
+    return '{}{{{}}}'.format(serializer.breadcrumbs, ', '.join(
+        '{}: {}'.format(key, serializer.formatter_instances[key]._binary_schema()) for key in serializer.keys
+    ))
+
+
+def _encode_binary_fields(serializer: Any, instance: Any, buffer: bytearray):
+    try:
+        for key, formatter_instance in serializer.formatter_instances.items():
+            formatter_instance._encode_binary(getattr(instance, key), buffer)
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
 
-from .exceptions import SerializerError
-from .serializer_manager import Serializer
-from .utils import is_typing
+def _decode_binary_fields(serializer: Any, reader: BinaryReader) -> Dict[str, Any]:
+    values = dict()
+    try:
+        for key, decoder in serializer.binary_decoders:
+            values[key] = decoder(reader)
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
+    return values
+
+
+def _iter_json_fields(serializer: Any, instance: Any) -> Iterator[str]:
+    json_fields = serializer.json_fields
+    if serializer.options.positional:
+        json_fields = json_fields[:_positional_size(serializer, instance)]
+
+    if not json_fields:
+        yield '[]' if serializer.options.positional else '{}'
+        return
+
+    try:
+        for prefix, key, formatter_instance in json_fields:
+            yield prefix
+            yield from formatter_instance._iter_json(getattr(instance, key))
+    except SerializerError as e:
+        raise e.add_frame(serializer.breadcrumbs, FIELD_EDGE, key)
+
+    yield ']' if serializer.options.positional else '}'
+
+
+def _join_rows(keys: List[str], columns: List[List[Any]], instances: List[Any], factory: Any) -> List[Any]:
+    """
+    Creates factory(**fields) for every instance from per-field columns.
+    """
+    if not keys:
+        return [factory() for _ in instances]
+
+    return [factory(**dict(zip(keys, row))) for row in zip(*columns)]
 
 
 class DictSerializer(Serializer):
+    dispatch_origins = (dict, Dict)
+    serialize_types = (dict,)
+    deserialize_types = (dict,)
+
     @staticmethod
     def test_typing(typing: Any) -> bool:
         return is_typing(typing, Dict)
 
-    def __init__(self, typing, prev_breadcrumbs: str = None):
+    def __init__(self, typing):
         key_class = typing.__args__[0]
         value_class = typing.__args__[1]
 
-        # self._init_breadcrumbs('Dict[{}, {}]'.format(key_class.__name__, value_class.__name__), prev_breadcrumbs)
-        self._init_breadcrumbs('Dict', prev_breadcrumbs)
+        # self._init_breadcrumbs('Dict[{}, {}]'.format(key_class.__name__, value_class.__name__))
+        self._init_breadcrumbs('Dict')
 
-        self.key_formatter: Serializer = self._create_serializer(key_class, '[key]')
-        self.value_formatter: Serializer = self._create_serializer(value_class, '[value]')
+        self.key_formatter: Serializer = self._create_serializer(key_class, KEY_EDGE)
+        self.value_formatter: Serializer = self._create_serializer(value_class, VALUE_EDGE)
+        self.trusted_identity = self.key_formatter.trusted_identity and self.value_formatter.trusted_identity
+        self.lazy = self.value_formatter.lazy
 
     def _serialize(self, instance: Any) -> Any:
         if not isinstance(instance, dict):
@@ -29,8 +426,15 @@ class DictSerializer(Serializer):
 
         new_dict = dict()
         for dict_key in instance:
-            key = self.key_formatter.serialize(dict_key)
-            value = self.value_formatter.serialize(instance[dict_key])
+            try:
+                key = self.key_formatter.serialize(dict_key)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, KEY_EDGE, dict_key)
+
+            try:
+                value = self.value_formatter.serialize(instance[dict_key])
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, VALUE_EDGE, dict_key)
 
             new_dict[key] = value
 
@@ -42,33 +446,306 @@ class DictSerializer(Serializer):
 
         new_dict = dict()
         for dict_key in instance.keys():
-            key = self.key_formatter.deserialize(dict_key)
-            value = self.value_formatter.deserialize(instance[dict_key])
+            try:
+                key = self.key_formatter.deserialize(dict_key)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, KEY_EDGE, dict_key)
+
+            try:
+                value = self.value_formatter.deserialize(instance[dict_key])
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, VALUE_EDGE, dict_key)
 
             new_dict[key] = value
 
         return new_dict
 
+    def _deserialize_lazy(self, instance: Any) -> Any:
+        if not self.lazy:
+            return self._deserialize(instance)
+
+        if not isinstance(instance, dict):
+            raise self._create_standard_type_error([dict], instance)
+
+        new_dict = dict()
+        for dict_key, dict_value in instance.items():
+            try:
+                key = self.key_formatter.deserialize(dict_key)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, KEY_EDGE, dict_key)
+
+            try:
+                new_dict[key] = self.value_formatter._deserialize_lazy(dict_value)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, VALUE_EDGE, dict_key)
+
+        return new_dict
+
+    def _validate(self, instance: Any):
+        self.__validate(instance, self.key_formatter._validate, self.value_formatter._validate)
+
+    def _validate_instance(self, instance: Any):
+        self.__validate(instance, self.key_formatter._validate_instance, self.value_formatter._validate_instance)
+
+    def __validate(self, instance: Any, validate_key: Callable[[Any], None], validate_value: Callable[[Any], None]):
+        if not isinstance(instance, dict):
+            raise self._create_standard_type_error([dict], instance)
+
+        for dict_key in instance:
+            try:
+                validate_key(dict_key)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, KEY_EDGE, dict_key)
+
+            try:
+                validate_value(instance[dict_key])
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, VALUE_EDGE, dict_key)
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        if self.trusted_identity:
+            return instance
+
+        serialize_value = self.value_formatter._serialize_trusted
+        if self.key_formatter.trusted_identity:
+            return {key: serialize_value(value) for key, value in instance.items()}
+
+        serialize_key = self.key_formatter._serialize_trusted
+        return {serialize_key(key): serialize_value(value) for key, value in instance.items()}
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        if not isinstance(old, dict) or not isinstance(new, dict):
+            return Serializer._diff(self, old, new, path, patch)
+
+        if old is new:
+            return
+
+        for key in old:
+            if key not in new:
+                patch.append([REMOVE, list(path) + [self.key_formatter._serialize(key)]])
+
+        for key, value in new.items():
+            try:
+                serialized_key = self.key_formatter._serialize(key)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, KEY_EDGE, key)
+
+            try:
+                if key in old:
+                    self.value_formatter._diff(old[key], value, path + (serialized_key,), patch)
+                else:
+                    patch.append([SET, list(path) + [serialized_key], self.value_formatter._serialize(value)])
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, VALUE_EDGE, key)
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        path = operation[1]
+        if index == len(path) or not isinstance(instance, dict):
+            return Serializer._patch(self, instance, operation, index)
+
+        try:
+            key = self.key_formatter._deserialize(path[index])
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, KEY_EDGE, path[index])
+
+        try:
+            if index + 1 == len(path) and operation[0] == REMOVE:
+                if key not in instance:
+                    raise self._create_patch_error(operation)
+                del instance[key]
+            elif index + 1 == len(path) and key not in instance:
+                instance[key] = self.value_formatter._patch(None, operation, index + 1)
+            elif key in instance:
+                instance[key] = self.value_formatter._patch(instance[key], operation, index + 1)
+            else:
+                raise self._create_patch_error(operation)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, VALUE_EDGE, key)
+
+        return instance
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        for instance in instances:
+            if not isinstance(instance, dict):
+                raise self._create_standard_type_error([dict], instance)
+
+        keys = self.key_formatter._serialize_many([key for instance in instances for key in instance])
+        values = self.value_formatter._serialize_many([value for instance in instances for value in instance.values()])
+
+        return _split_dicts(instances, keys, values)
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        for instance in instances:
+            if not isinstance(instance, dict):
+                raise self._create_standard_type_error([dict], instance)
+
+        keys = self.key_formatter._deserialize_many([key for instance in instances for key in instance])
+        values = self.value_formatter._deserialize_many([
+            value for instance in instances for value in instance.values()
+        ])
+
+        return _split_dicts(instances, keys, values)
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        if not isinstance(instance, dict):
+            raise self._create_standard_type_error([dict], instance)
+
+        yield '{'
+
+        first = True
+        for dict_key in instance:
+            try:
+                key = json_key(self.key_formatter.serialize(dict_key))
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, KEY_EDGE, dict_key)
+
+            if not first:
+                yield ', '
+            first = False
+
+            yield key
+            yield ': '
+            try:
+                yield from self.value_formatter._iter_json(instance[dict_key])
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, VALUE_EDGE, dict_key)
+
+        yield '}'
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        if not isinstance(instance, dict):
+            raise self._create_standard_type_error([dict], instance)
+
+        if not instance:
+            parts.append('{}')
+            return
+
+        key_encoders = self.key_formatter.json_encoders
+        value_encoders = self.value_formatter.json_encoders
+        separator = '{'
+        for dict_key, value in instance.items():
+            key_encoder = key_encoders.get(type(dict_key))
+            if key_encoder is None:
+                try:
+                    key = json_key(self.key_formatter._serialize(dict_key))
+                except SerializerError as e:
+                    raise e.add_frame(self.breadcrumbs, KEY_EDGE, dict_key)
+            else:
+                key = key_encoder(dict_key)
+                # Non-string keys are quoted, as json.dumps does.
+                if key[0] != '"':
+                    key = '"' + key + '"'
+
+            encoder = value_encoders.get(type(value))
+            if encoder is None:
+                parts.append(separator + key + ': ')
+                try:
+                    self.value_formatter._encode_json(value, parts)
+                except SerializerError as e:
+                    raise e.add_frame(self.breadcrumbs, VALUE_EDGE, dict_key)
+            else:
+                parts.append(separator + key + ': ' + encoder(value))
+
+            separator = ', '
+
+        parts.append('}')
+
+    def _binary_schema(self) -> str:
+        return 'Dict[{}, {}]'.format(self.key_formatter._binary_schema(), self.value_formatter._binary_schema())
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        if not isinstance(instance, dict):
+            raise self._create_standard_type_error([dict], instance)
+
+        write_varint(buffer, len(instance))
+        for dict_key, value in instance.items():
+            try:
+                self.key_formatter._encode_binary(dict_key, buffer)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, KEY_EDGE, dict_key)
+
+            try:
+                self.value_formatter._encode_binary(value, buffer)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, VALUE_EDGE, dict_key)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        new_dict = dict()
+        for _ in range(reader.read_varint()):
+            try:
+                key = self.key_formatter._decode_binary(reader)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, KEY_EDGE)
+
+            try:
+                new_dict[key] = self.value_formatter._decode_binary(reader)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, VALUE_EDGE, key)
+
+        return new_dict
+
+    def _split_parallel(self, instance: Any, chunk_size: int) -> List[Any]:
+        if not isinstance(instance, dict):
+            raise self._create_standard_type_error([dict], instance)
+
+        items = iter(instance.items())
+        return [dict(islice(items, chunk_size)) for _ in range(0, len(instance), chunk_size)]
+
+    def _join_parallel(self, chunks: List[Any]) -> Any:
+        new_dict = dict()
+        for chunk in chunks:
+            new_dict.update(chunk)
+
+        return new_dict
+
+    def _iter_deserialize_json(self, reader: JsonStreamReader) -> Iterator[Any]:
+        key_types = self.key_formatter.deserialize_types
+        for dict_key, dict_value in reader.iter_object():
+            dict_key = parse_json_key(dict_key, key_types)
+
+            try:
+                key = self.key_formatter.deserialize(dict_key)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, KEY_EDGE, dict_key)
+
+            try:
+                value = self.value_formatter.deserialize(dict_value)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, VALUE_EDGE, dict_key)
+
+            yield key, value
+
 
 class ListSerializer(Serializer):
+    dispatch_origins = (list, List)
+    serialize_types = (list,)
+    deserialize_types = (list,)
+
     @staticmethod
     def test_typing(typing: Any) -> bool:
         return is_typing(typing, List)
 
-    def __init__(self, typing, prev_breadcrumbs: str = None):
+    def __init__(self, typing):
         list_class = typing.__args__[0]
-        self._init_breadcrumbs('List', prev_breadcrumbs)
+        self._init_breadcrumbs('List')
 
-        self.serializer: Serializer = self._create_serializer(list_class, '[]')
+        self.serializer: Serializer = self._create_serializer(list_class, ITEM_EDGE)
+        self.binary_decoder = _binary_decoder(self.serializer)
+        self.trusted_identity = self.serializer.trusted_identity
+        self.lazy = self.serializer.lazy
 
     def _serialize(self, instance: Any) -> Any:
         if not isinstance(instance, list):
             raise self._create_standard_type_error([list], instance)
 
         new_list = list()
-        for list_unit in instance:
-            item = self.serializer.serialize(list_unit)
-            new_list.append(item)
+        try:
+            for list_unit in instance:
+                item = self.serializer.serialize(list_unit)
+                new_list.append(item)
+        except SerializerError as e:
+            # Items before the failed one are already in new_list.
+            raise e.add_frame(self.breadcrumbs, ITEM_EDGE, len(new_list))
 
         return new_list
 
@@ -77,29 +754,221 @@ class ListSerializer(Serializer):
             raise self._create_standard_type_error([list], instance)
 
         new_list = list()
-        for list_unit in instance:
-            item = self.serializer.deserialize(list_unit)
-            new_list.append(item)
+        try:
+            for list_unit in instance:
+                item = self.serializer.deserialize(list_unit)
+                new_list.append(item)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, ITEM_EDGE, len(new_list))
 
         return new_list
 
+    def _deserialize_lazy(self, instance: Any) -> Any:
+        if not self.lazy:
+            return self._deserialize(instance)
+
+        if not isinstance(instance, list):
+            raise self._create_standard_type_error([list], instance)
+
+        new_list = list()
+        try:
+            for list_unit in instance:
+                new_list.append(self.serializer._deserialize_lazy(list_unit))
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, ITEM_EDGE, len(new_list))
+
+        return new_list
+
+    def _validate(self, instance: Any):
+        self.__validate(instance, self.serializer._validate)
+
+    def _validate_instance(self, instance: Any):
+        self.__validate(instance, self.serializer._validate_instance)
+
+    def __validate(self, instance: Any, validate: Callable[[Any], None]):
+        if not isinstance(instance, list):
+            raise self._create_standard_type_error([list], instance)
+
+        i = 0
+        try:
+            for item in instance:
+                validate(item)
+                i += 1
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, ITEM_EDGE, i)
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        if self.trusted_identity:
+            return instance
+
+        return list(map(self.serializer._serialize_trusted, instance))
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        if not isinstance(old, list) or not isinstance(new, list):
+            return Serializer._diff(self, old, new, path, patch)
+
+        if old is new:
+            return
+
+        # Only the range between the common head and tail changed.
+        same = self.serializer._same
+        start = 0
+        size = min(len(old), len(new))
+        while start < size and same(old[start], new[start]):
+            start += 1
+        old_end = len(old)
+        new_end = len(new)
+        while old_end > start and new_end > start and same(old[old_end - 1], new[new_end - 1]):
+            old_end -= 1
+            new_end -= 1
+
+        if old_end - start == new_end - start:
+            # Items changed in place.
+            for i in range(start, old_end):
+                try:
+                    self.serializer._diff(old[i], new[i], path + (i,), patch)
+                except SerializerError as e:
+                    raise e.add_frame(self.breadcrumbs, ITEM_EDGE, i)
+            return
+
+        items = list()
+        try:
+            for item in new[start:new_end]:
+                items.append(self.serializer._serialize(item))
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, ITEM_EDGE, start + len(items))
+
+        patch.append([SPLICE, list(path), start, old_end - start, items])
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        path = operation[1]
+        if not isinstance(instance, list):
+            return Serializer._patch(self, instance, operation, index)
+
+        if index == len(path):
+            if operation[0] != SPLICE:
+                return Serializer._patch(self, instance, operation, index)
+
+            if len(operation) != 5 or type(operation[2]) is not int or type(operation[3]) is not int or \
+                    not 0 <= operation[2] <= operation[2] + operation[3] <= len(instance):
+                raise self._create_patch_error(operation)
+
+            start, removed = operation[2], operation[3]
+            instance[start:start + removed] = self._deserialize(operation[4])
+            return instance
+
+        i = path[index]
+        if type(i) is not int or not 0 <= i < len(instance):
+            raise self._create_patch_error(operation)
+
+        try:
+            instance[i] = self.serializer._patch(instance[i], operation, index + 1)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, ITEM_EDGE, i)
+
+        return instance
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        for instance in instances:
+            if not isinstance(instance, list):
+                raise self._create_standard_type_error([list], instance)
+
+        items = self.serializer._serialize_many([item for instance in instances for item in instance])
+
+        return _split_lists(instances, items)
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        for instance in instances:
+            if not isinstance(instance, list):
+                raise self._create_standard_type_error([list], instance)
+
+        items = self.serializer._deserialize_many([item for instance in instances for item in instance])
+
+        return _split_lists(instances, items)
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        if not isinstance(instance, list):
+            raise self._create_standard_type_error([list], instance)
+
+        return _iter_json_list(self, repeat(self.serializer), instance, ITEM_EDGE)
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        if not isinstance(instance, list):
+            raise self._create_standard_type_error([list], instance)
+
+        _encode_json_list(self, repeat(self.serializer), instance, ITEM_EDGE, parts)
+
+    def _binary_schema(self) -> str:
+        return 'List[{}]'.format(self.serializer._binary_schema())
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        if not isinstance(instance, list):
+            raise self._create_standard_type_error([list], instance)
+
+        write_varint(buffer, len(instance))
+        i = 0
+        try:
+            for item in instance:
+                self.serializer._encode_binary(item, buffer)
+                i += 1
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, ITEM_EDGE, i)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        size = reader.read_varint()
+
+        decoder = self.binary_decoder
+        new_list = list()
+        try:
+            for _ in range(size):
+                new_list.append(decoder(reader))
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, ITEM_EDGE, len(new_list))
+
+        return new_list
+
+    def _split_parallel(self, instance: Any, chunk_size: int) -> List[Any]:
+        if not isinstance(instance, list):
+            raise self._create_standard_type_error([list], instance)
+
+        return [instance[i:i + chunk_size] for i in range(0, len(instance), chunk_size)]
+
+    def _join_parallel(self, chunks: List[Any]) -> Any:
+        return list(chain.from_iterable(chunks))
+
+    def _iter_deserialize_json(self, reader: JsonStreamReader) -> Iterator[Any]:
+        i = 0
+        for list_unit in reader.iter_array():
+            try:
+                item = self.serializer.deserialize(list_unit)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, ITEM_EDGE, i)
+
+            yield item
+            i += 1
+
 
 class TupleSerializer(Serializer):
+    dispatch_origins = (tuple, Tuple)
+    serialize_types = (list, tuple)
+    deserialize_types = (list, tuple)
+    internable = True
+
     @staticmethod
     def test_typing(typing: Any) -> bool:
         return is_typing(typing, Tuple)
 
-    def __init__(self, typing, prev_breadcrumbs: str = None):
+    def __init__(self, typing):
         tuple_classes = typing.__args__
 
         # breadcrumbs = 'Tuple[{}]'.format(', '.join([tuple_class.__name__ for tuple_class in tuple_classes]))
-        # self._init_breadcrumbs(breadcrumbs, prev_breadcrumbs)
-        self._init_breadcrumbs('Tuple', prev_breadcrumbs)
+        # self._init_breadcrumbs(breadcrumbs)
+        self._init_breadcrumbs('Tuple')
 
         self.serializer_instances: List[Serializer] = list()
         i = 0
         for tuple_class in tuple_classes:
-            self.serializer_instances.append(self._create_serializer(tuple_class, '[{}]'.format(i)))
+            self.serializer_instances.append(self._create_serializer(tuple_class, INDEX_EDGE, i))
             i += 1
 
     def _serialize(self, instance: Any) -> Any:
@@ -113,10 +982,13 @@ class TupleSerializer(Serializer):
 
         new_list = list()
         i = 0
-        for list_unit in instance:
-            item = self.serializer_instances[i].serialize(list_unit)
-            new_list.append(item)
-            i += 1
+        try:
+            for list_unit in instance:
+                item = self.serializer_instances[i].serialize(list_unit)
+                new_list.append(item)
+                i += 1
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, INDEX_EDGE, i)
 
         return new_list
 
@@ -125,65 +997,395 @@ class TupleSerializer(Serializer):
             raise self._create_standard_type_error([list, tuple], instance)
 
         if len(self.serializer_instances) != len(instance):
-            return 'Expected input tuple instance with length {}, got {}.'.format(
+            raise SerializerError('Expected input tuple instance with length {}, got {}.'.format(
                 len(self.serializer_instances), len(instance)
-            )
+            ))
 
         new_list = list()
         i = 0
-        for list_unit in instance:
-            item = self.serializer_instances[i].deserialize(list_unit)
-            new_list.append(item)
+        try:
+            for list_unit in instance:
+                item = self.serializer_instances[i].deserialize(list_unit)
+                new_list.append(item)
+                i += 1
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, INDEX_EDGE, i)
+
+        return tuple(new_list)
+
+    def _validate(self, instance: Any):
+        self.__validate(instance, False)
+
+    def _validate_instance(self, instance: Any):
+        self.__validate(instance, True)
+
+    def __validate(self, instance: Any, serialize: bool):
+        if not (isinstance(instance, list) or isinstance(instance, tuple)):
+            raise self._create_standard_type_error([list, tuple], instance)
+
+        if len(self.serializer_instances) != len(instance):
+            raise SerializerError('Expected input tuple instance with length {}, got {}.'.format(
+                len(self.serializer_instances), len(instance)
+            ))
+
+        i = 0
+        try:
+            for serializer_instance in self.serializer_instances:
+                if serialize:
+                    serializer_instance._validate_instance(instance[i])
+                else:
+                    serializer_instance._validate(instance[i])
+                i += 1
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, INDEX_EDGE, i)
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return [
+            serializer_instance._serialize_trusted(item)
+            for serializer_instance, item in zip(self.serializer_instances, instance)
+        ]
+
+    def __columns_many(self, instances: List[Any], deserialize: bool) -> List[List[Any]]:
+        for instance in instances:
+            if not (isinstance(instance, list) or isinstance(instance, tuple)):
+                raise self._create_standard_type_error([list, tuple], instance)
+
+            if len(self.serializer_instances) != len(instance):
+                raise SerializerError('Expected input tuple instance with length {}, got {}.'.format(
+                    len(self.serializer_instances), len(instance)
+                ))
+
+        columns = list()
+        i = 0
+        for serializer_instance in self.serializer_instances:
+            column = list(map(itemgetter(i), instances))
+            if deserialize:
+                columns.append(serializer_instance._deserialize_many(column))
+            else:
+                columns.append(serializer_instance._serialize_many(column))
             i += 1
 
+        return columns
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        size = len(self.serializer_instances)
+        if not isinstance(old, tuple) or not isinstance(new, tuple) or len(old) != size or len(new) != size:
+            return Serializer._diff(self, old, new, path, patch)
+
+        for i in range(size):
+            try:
+                self.serializer_instances[i]._diff(old[i], new[i], path + (i,), patch)
+            except SerializerError as e:
+                raise e.add_frame(self.breadcrumbs, INDEX_EDGE, i)
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        path = operation[1]
+        if index == len(path) or not isinstance(instance, tuple):
+            return Serializer._patch(self, instance, operation, index)
+
+        i = path[index]
+        if type(i) is not int or not 0 <= i < len(instance) or len(instance) != len(self.serializer_instances):
+            raise self._create_patch_error(operation)
+
+        try:
+            item = self.serializer_instances[i]._patch(instance[i], operation, index + 1)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, INDEX_EDGE, i)
+
+        return instance[:i] + (item,) + instance[i + 1:]
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        if not self.serializer_instances:
+            return [self._serialize(instance) for instance in instances]
+
+        return [list(row) for row in zip(*self.__columns_many(instances, False))]
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        if not self.serializer_instances:
+            return [self._deserialize(instance) for instance in instances]
+
+        return list(zip(*self.__columns_many(instances, True)))
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        if not (isinstance(instance, list) or isinstance(instance, tuple)):
+            raise self._create_standard_type_error([list, tuple], instance)
+
+        if len(self.serializer_instances) != len(instance):
+            raise SerializerError('Expected input tuple instance with length {}, got {}.'.format(
+                len(self.serializer_instances), len(instance)
+            ))
+
+        return _iter_json_list(self, self.serializer_instances, instance, INDEX_EDGE)
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        if not (isinstance(instance, list) or isinstance(instance, tuple)):
+            raise self._create_standard_type_error([list, tuple], instance)
+
+        if len(self.serializer_instances) != len(instance):
+            raise SerializerError('Expected input tuple instance with length {}, got {}.'.format(
+                len(self.serializer_instances), len(instance)
+            ))
+
+        _encode_json_list(self, self.serializer_instances, instance, INDEX_EDGE, parts)
+
+    def _binary_schema(self) -> str:
+        return 'Tuple[{}]'.format(', '.join(s._binary_schema() for s in self.serializer_instances))
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        if not (isinstance(instance, list) or isinstance(instance, tuple)):
+            raise self._create_standard_type_error([list, tuple], instance)
+
+        if len(self.serializer_instances) != len(instance):
+            raise SerializerError('Expected input tuple instance with length {}, got {}.'.format(
+                len(self.serializer_instances), len(instance)
+            ))
+
+        i = 0
+        try:
+            for item, serializer_instance in zip(instance, self.serializer_instances):
+                serializer_instance._encode_binary(item, buffer)
+                i += 1
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, INDEX_EDGE, i)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        new_list = list()
+        try:
+            for serializer_instance in self.serializer_instances:
+                new_list.append(serializer_instance._decode_binary(reader))
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, INDEX_EDGE, len(new_list))
+
         return tuple(new_list)
 
 
 class UnionSerializer(Serializer):
+    dispatch_origins = (Union,)
+
     @staticmethod
     def test_typing(typing: Any) -> bool:
         return is_typing(typing, Union)
 
-    def __init__(self, typing, prev_breadcrumbs: str = None):
+    def __init__(self, typing):
         union_classes = typing.__args__
 
         # breadcrumbs = 'Union[{}]'.format(', '.join([union_class.__name__ for union_class in union_classes]))
-        # self._init_breadcrumbs(breadcrumbs, prev_breadcrumbs)
-        self._init_breadcrumbs('Union', prev_breadcrumbs)
+        # self._init_breadcrumbs(breadcrumbs)
+        self._init_breadcrumbs('Union')
 
         i = 0
         self.serializer_instances: List[Serializer] = list()
         self.union_classes = union_classes
         for union_class in union_classes:
-            self.serializer_instances.append(self._create_serializer(union_class, '[{}]'.format(i)))
+            self.serializer_instances.append(self._create_serializer(union_class, INDEX_EDGE.format(i)))
             i += 1
 
-    def _serialize(self, instance: Any):
+        self.serialize_types = self.__join_types([s.serialize_types for s in self.serializer_instances])
+        self.deserialize_types = self.__join_types([s.deserialize_types for s in self.serializer_instances])
+
+        # Runtime type -> members which may accept it, in union order. Members are only tried one by one when
+        # there is more than one candidate; types first seen at runtime are added lazily.
+        self.serialize_candidates: Dict[type, Tuple[Serializer, ...]] = dict()
+        self.deserialize_candidates: Dict[type, Tuple[Serializer, ...]] = dict()
+        for instance_type in self.serialize_types or ():
+            self.__find_candidates(self.serialize_candidates, 'serialize_types', instance_type)
+        for instance_type in JSON_TYPES:
+            self.__find_candidates(self.deserialize_candidates, 'deserialize_types', instance_type)
+
+        self.trusted_identity = all(s.trusted_identity for s in self.serializer_instances)
+        self.binary_indexes: Dict[Serializer, int] = {
+            serializer_instance: i for i, serializer_instance in enumerate(self.serializer_instances)
+        }
+
+        # A member encoder is used only when the member is the first candidate for the type.
+        self.json_encoders = dict()
         for serializer_instance in self.serializer_instances:
+            for instance_type, encoder in serializer_instance.json_encoders.items():
+                candidates = self.serialize_candidates.get(instance_type)
+                if candidates is None:
+                    candidates = self.__find_candidates(self.serialize_candidates, 'serialize_types', instance_type)
+                if candidates[0] is serializer_instance:
+                    self.json_encoders.setdefault(instance_type, encoder)
+
+    @staticmethod
+    def __join_types(types_list: List[Optional[Tuple[type, ...]]]) -> Optional[Tuple[type, ...]]:
+        if any(types is None for types in types_list):
+            return None
+
+        return tuple(set(t for types in types_list for t in types))
+
+    def __find_candidates(self, candidates: Dict[type, Tuple[Serializer, ...]], types_attribute: str,
+                          instance_type: type) -> Tuple[Serializer, ...]:
+        found = list()
+        for serializer_instance in self.serializer_instances:
+            types = getattr(serializer_instance, types_attribute)
+            if types is None or issubclass(instance_type, types):
+                found.append(serializer_instance)
+
+        # The only state changed after the build: threads racing here store equal tuples.
+        candidates[instance_type] = tuple(found)
+        return candidates[instance_type]
+
+    def _serialize(self, instance: Any):
+        candidates = self.serialize_candidates.get(type(instance))
+        if candidates is None:
+            candidates = self.__find_candidates(self.serialize_candidates, 'serialize_types', type(instance))
+
+        mark = graph_mark() if self.graphing else None
+        for serializer_instance in candidates:
             try:
                 return serializer_instance._serialize(instance)
             except SerializerError:
-                pass
+                restore_graph(mark)
 
         raise self._create_standard_type_error(self.union_classes, instance)
 
+    def _serialize_trusted(self, instance: Any) -> Any:
+        if self.trusted_identity:
+            return instance
+
+        candidates = self.serialize_candidates.get(type(instance))
+        if candidates is None:
+            candidates = self.__find_candidates(self.serialize_candidates, 'serialize_types', type(instance))
+
+        if len(candidates) == 1:
+            return candidates[0]._serialize_trusted(instance)
+
+        # Only validation tells which of the members accepts the instance.
+        return self._serialize(instance)
+
     def _deserialize(self, instance: Any):
-        for serializer_instance in self.serializer_instances:
+        candidates = self.deserialize_candidates.get(type(instance))
+        if candidates is None:
+            candidates = self.__find_candidates(self.deserialize_candidates, 'deserialize_types', type(instance))
+
+        mark = graph_mark() if self.graphing else None
+        for serializer_instance in candidates:
             try:
                 return serializer_instance._deserialize(instance)
             except SerializerError:
-                pass
+                restore_graph(mark)
+
+        raise self._create_standard_type_error(self.union_classes, instance)
+
+    def _validate(self, instance: Any):
+        candidates = self.deserialize_candidates.get(type(instance))
+        if candidates is None:
+            candidates = self.__find_candidates(self.deserialize_candidates, 'deserialize_types', type(instance))
+
+        mark = graph_mark() if self.graphing else None
+        for serializer_instance in candidates:
+            try:
+                return serializer_instance._validate(instance)
+            except SerializerError:
+                restore_graph(mark)
 
         raise self._create_standard_type_error(self.union_classes, instance)
 
+    def _validate_instance(self, instance: Any):
+        candidates = self.serialize_candidates.get(type(instance))
+        if candidates is None:
+            candidates = self.__find_candidates(self.serialize_candidates, 'serialize_types', type(instance))
+
+        mark = graph_mark() if self.graphing else None
+        for serializer_instance in candidates:
+            try:
+                return serializer_instance._validate_instance(instance)
+            except SerializerError:
+                restore_graph(mark)
+
+        raise self._create_standard_type_error(self.union_classes, instance)
+
+    def __only_candidate(self, instance: Any) -> Optional[Serializer]:
+        candidates = self.serialize_candidates.get(type(instance))
+        if candidates is None:
+            candidates = self.__find_candidates(self.serialize_candidates, 'serialize_types', type(instance))
+
+        return candidates[0] if len(candidates) == 1 else None
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        # Values of the same type accepted by one member only are diffed by that member, e.g. Optional dataclasses.
+        member = self.__only_candidate(new) if type(old) is type(new) else None
+        if member is None:
+            return Serializer._diff(self, old, new, path, patch)
+
+        member._diff(old, new, path, patch)
+
+    def _same(self, old: Any, new: Any) -> bool:
+        member = self.__only_candidate(new) if type(old) is type(new) else None
+        if member is None:
+            return is_same(old, new)
+
+        return member._same(old, new)
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        if index == len(operation[1]):
+            return Serializer._patch(self, instance, operation, index)
+
+        member = self.__only_candidate(instance)
+        if member is None:
+            raise self._create_patch_error(operation)
+
+        return member._patch(instance, operation, index)
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        candidates = self.serialize_candidates.get(type(instance))
+        if candidates is None:
+            candidates = self.__find_candidates(self.serialize_candidates, 'serialize_types', type(instance))
+
+        length = len(parts)
+        mark = graph_mark() if self.graphing else None
+        for serializer_instance in candidates:
+            try:
+                serializer_instance._encode_json(instance, parts)
+                return
+            except SerializerError:
+                # Drops JSON written by the failed member, and the graph mode ids it gave.
+                del parts[length:]
+                restore_graph(mark)
+
+        raise self._create_standard_type_error(self.union_classes, instance)
+
+    def _binary_schema(self) -> str:
+        return 'Union[{}]'.format(', '.join(s._binary_schema() for s in self.serializer_instances))
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        candidates = self.serialize_candidates.get(type(instance))
+        if candidates is None:
+            candidates = self.__find_candidates(self.serialize_candidates, 'serialize_types', type(instance))
+
+        length = len(buffer)
+        mark = graph_mark() if self.graphing else None
+        for serializer_instance in candidates:
+            # Members are written as their index, followed by the value.
+            write_varint(buffer, self.binary_indexes[serializer_instance])
+            try:
+                serializer_instance._encode_binary(instance, buffer)
+                return
+            except SerializerError:
+                del buffer[length:]
+                restore_graph(mark)
+
+        raise self._create_standard_type_error(self.union_classes, instance)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        i = reader.read_index(len(self.serializer_instances))
+        try:
+            return self.serializer_instances[i]._decode_binary(reader)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, INDEX_EDGE.format(i))
+
 
 class AnySerializer(Serializer):
+    dispatch_types = (Any,)
+
     @staticmethod
     def test_typing(typing: Any) -> bool:
         return typing is Any
 
-    def __init__(self, typing: Any, prev_breadcrumbs: str = None):
-        self._init_breadcrumbs('Any', prev_breadcrumbs)
+    def __init__(self, typing: Any):
+        self._init_breadcrumbs('Any')
+        self.trusted_identity = True
 
     def _deserialize(self, instance):
         return instance
@@ -191,82 +1393,219 @@ class AnySerializer(Serializer):
     def _serialize(self, instance):
         return instance
 
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return instance
+
+    def _validate(self, instance: Any):
+        pass
+
+    _validate_instance = _validate
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        return instances
+
+    _deserialize_many = _serialize_many
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        parts.append(json_value(instance))
+
 
 class EnumSerializer(Serializer):
     @staticmethod
     def test_typing(typing: Any) -> bool:
         return isclass(typing) and issubclass(typing, Enum)
 
-    def __init__(self, typing: Any, prev_breadcrumbs: str = None):
-        self._init_breadcrumbs('enum.{}'.format(typing.__name__), prev_breadcrumbs)
+    def __init__(self, typing: Any):
+        self._init_breadcrumbs('enum.{}'.format(typing.__name__))
 
         self.enum: Type[Enum] = typing
+        # Members are written as their index in binary and in the 'ordinal' encoding; aliases are the same objects
+        # as their members.
+        self.members: Tuple[Enum, ...] = tuple(typing)
+        self.ordinals: Dict[Enum, int] = {member: i for i, member in enumerate(self.members)}
+
+        encoding = self.options.enum_encoding
+        if encoding == 'name':
+            self.keys: Dict[Enum, Any] = {member: member.name for member in self.members}
+            # Aliases are accepted by their names too.
+            self.lookup: Dict[Any, Enum] = dict(typing.__members__)
+        elif encoding == 'value':
+            self.keys = {member: member.value for member in self.members}
+            self.lookup = {member.value: member for member in self.members}
+        else:
+            self.keys = dict(self.ordinals)
+            self.lookup = dict(enumerate(self.members))
+
+        # Exact types, so True is not read as the member with value 1.
+        self.key_types: Set[type] = set(map(type, self.lookup))
+        if not self.key_types <= {str, int, float, bool, type(None)}:
+            raise SerializerError(BREADCRUMBS + ': enum_encoding=\'{}\' requires str, int, float, bool or None values, '
+                                  'got {}.'.format(encoding, list(self.lookup)), self.breadcrumbs)
+
+        self.invalid_message = 'Invalid enum {} {{!r}}, allowed {}s: {}.'.format(
+            'member' if encoding == 'name' else encoding, 'member' if encoding == 'name' else encoding,
+            list(self.lookup)
+        )
+        self.json_names: Dict[Enum, str] = {member: json_value(key) for member, key in self.keys.items()}
+        self.json_encoders = {typing: self.json_names.__getitem__}
+        self.serialize_types = (typing,)
+        self.deserialize_types = tuple(sorted(self.key_types, key=attrgetter('__name__')))
+
+    def __find_member(self, instance: Any) -> Enum:
+        """
+        Slow path of a failed lookup: str subclasses, or the error.
+        """
+        if isinstance(instance, str) and str in self.key_types:
+            member = self.lookup.get(str(instance))
+            if member is not None:
+                return member
+
+        if not isinstance(instance, self.deserialize_types) or type(instance) is bool:
+            raise self._create_standard_type_error(list(self.deserialize_types), instance)
+
+        raise SerializerError(self.invalid_message.format(instance))
 
     def _serialize(self, instance: Any) -> Any:
         if not isinstance(instance, self.enum):
             raise self._create_standard_type_error([self.enum], instance)
 
-        return instance.name
+        return self.keys[instance]
 
     def _deserialize(self, instance: Any) -> Any:
-        if not isinstance(instance, str):
-            raise self._create_standard_type_error([str], instance)
+        if type(instance) in self.key_types:
+            member = self.lookup.get(instance)
+            if member is not None:
+                return member
 
-        if instance not in self.enum.__members__:
-            raise SerializerError('Invalid enum member \'{}\', allowed members: {}.'.format(
-                instance,
-                list(self.enum.__members__)
-            ))
+        return self.__find_member(instance)
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return self.keys[instance]
+
+    def _validate(self, instance: Any):
+        if type(instance) not in self.key_types or instance not in self.lookup:
+            self.__find_member(instance)
+
+    def _validate_instance(self, instance: Any):
+        if not isinstance(instance, self.enum):
+            raise self._create_standard_type_error([self.enum], instance)
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        for instance in instances:
+            if not isinstance(instance, self.enum):
+                raise self._create_standard_type_error([self.enum], instance)
 
-        return self.enum[instance]
+        return list(map(self.keys.__getitem__, instances))
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        if set(map(type, instances)) <= self.key_types:
+            try:
+                return list(map(self.lookup.__getitem__, instances))
+            except KeyError:
+                pass
+
+        # Find the invalid instance.
+        return [self._deserialize(instance) for instance in instances]
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        if not isinstance(instance, self.enum):
+            raise self._create_standard_type_error([self.enum], instance)
+
+        parts.append(self.json_names[instance])
+
+    def _binary_schema(self) -> str:
+        return '{}[{}]'.format(self.breadcrumbs, ', '.join(member.name for member in self.members))
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        if not isinstance(instance, self.enum):
+            raise self._create_standard_type_error([self.enum], instance)
+
+        write_varint(buffer, self.ordinals[instance])
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        return self.members[reader.read_index(len(self.members))]
 
 
 class DataclassSerializer(Serializer):
+    lazy = True
+    graphable = True
+    _lazy_class: Optional[type] = None
+
     @staticmethod
     def test_typing(typing: Any) -> bool:
         return  is_dataclass(typing)
         # return hasattr(typing, '__dataclass_fields__')
 
-    def __init__(self, typing: Any, prev_breadcrumbs: str = None):
-        self._init_breadcrumbs('dataclass.{}'.format(typing.__name__), prev_breadcrumbs)
+    def __init__(self, typing: Any):
+        self._init_breadcrumbs('dataclass.{}'.format(typing.__name__))
 
         formatter_instances = dict()
         keys = list()
         keys_with_default = set()
         dataclass_signature = signature(typing)
         parameters = dataclass_signature.parameters
+        hints = _type_hints(typing)
         for key in parameters.keys():
             keys.append(key)
             parameter = parameters[key]
-            parameter_annotation = parameter.annotation
+            parameter_annotation = hints.get(key, parameter.annotation)
 
             if parameter.default is not parameter.empty:
                 keys_with_default.add(key)
 
                 if parameter.default is None:
-                    parameter_annotation = Optional[parameter.annotation]
+                    parameter_annotation = Optional[parameter_annotation]
 
-            formatter_instances[key] = self._create_serializer(parameter_annotation, '[\'{}\']'.format(key))
+            formatter_instances[key] = self._create_serializer(parameter_annotation, FIELD_EDGE, key)
 
         self.keys = keys
         self.keys_with_default = keys_with_default
         self.formatter_instances = formatter_instances
         self.dataclass = typing
+        self.frozen = typing.__dataclass_params__.frozen
+        self.memoizable = self.frozen
+        self.json_fields = _json_fields(keys, formatter_instances, self.options.positional)
+        self.trusted_fields = _trusted_fields(keys, formatter_instances)
+        # Default factories are not comparable, only fields with default values are omitted in positional mode.
+        defaults = {field.name: field.default for field in fields(typing) if field.default is not MISSING}
+        self.trailing_defaults = _trailing_defaults(keys, defaults)
+        self.required_size = _required_size(keys, keys_with_default)
+        self.binary_decoders = tuple((key, _binary_decoder(formatter_instances[key])) for key in keys)
+        self.serialize_types = (typing,)
+        self.deserialize_types = (list, dict) if self.options.positional else (dict,)
 
     def _serialize(self, instance: Any) -> Any:
         if not isinstance(instance, self.dataclass):
             raise self._create_standard_type_error([self.dataclass], instance)
 
+        if self.options.positional:
+            return _serialize_positional(self, instance)
+
         final_dict = dict()
-        for key in self.keys:
-            formatter_instance = self.formatter_instances[key]
-            final_dict[key] = formatter_instance.serialize(getattr(instance, key))
+        try:
+            for key in self.keys:
+                formatter_instance = self.formatter_instances[key]
+                final_dict[key] = formatter_instance.serialize(getattr(instance, key))
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, FIELD_EDGE, key)
 
         return final_dict
 
-    def _deserialize(self, instance: Any) -> Any:
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return _serialize_fields_trusted(self, instance)
+
+    def _validate(self, instance: Any):
+        _validate_fields(self, instance)
+
+    def _validate_instance(self, instance: Any):
+        if not isinstance(instance, self.dataclass):
+            raise self._create_standard_type_error([self.dataclass], instance)
+
+        _validate_instance_fields(self, instance)
+
+    def __ensure_keys(self, instance: Any):
         if not isinstance(instance, dict):
-            raise self._create_standard_type_error([dict], instance)
+            raise self._create_standard_type_error(list(self.deserialize_types), instance)
 
         for key in self.keys:
             if key not in instance:
@@ -276,59 +1615,200 @@ class DataclassSerializer(Serializer):
                         key=key
                     ))
 
+    def _deserialize(self, instance: Any) -> Any:
+        return self.dataclass(**self._deserialize_fields(instance))
+
+    def _deserialize_fields(self, instance: Any) -> Dict[str, Any]:
+        """
+        Deserialized values of the fields present in instance, by name.
+        """
+        if self.options.positional and isinstance(instance, list):
+            return _deserialize_positional(self, instance)
+
+        self.__ensure_keys(instance)
+
         final_dict = dict()
-        for key in self.keys:
-            formatter_instance = self.formatter_instances[key]
-            final_dict[key] = formatter_instance.deserialize(instance[key])
+        try:
+            for key in self.keys:
+                if key not in instance:
+                    # Left to the default value.
+                    continue
+
+                formatter_instance = self.formatter_instances[key]
+                final_dict[key] = formatter_instance.deserialize(instance[key])
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, FIELD_EDGE, key)
+
+        return final_dict
+
+    def _deserialize_lazy(self, instance: Any) -> Any:
+        if self.options.positional and isinstance(instance, list):
+            _check_positional_size(self, len(instance))
+        else:
+            self.__ensure_keys(instance)
+
+        lazy_class = self._lazy_class
+        if lazy_class is None:
+            # Created on first use; serializers are frozen, see Serializer.binary_header.
+            lazy_class = create_lazy_class(self)
+            object.__setattr__(self, '_lazy_class', lazy_class)
+
+        return create_lazy_instance(lazy_class, self, instance)
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        if not isinstance(old, self.dataclass) or not isinstance(new, self.dataclass):
+            return Serializer._diff(self, old, new, path, patch)
+
+        if old is not new:
+            _diff_fields(self, old, new, path, patch)
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        if index == len(operation[1]) or not isinstance(instance, self.dataclass):
+            return Serializer._patch(self, instance, operation, index)
+
+        key, value = _patch_field(self, instance, operation, index)
+        if self.frozen:
+            return replace(instance, **{key: value})
+
+        setattr(instance, key, value)
+        return instance
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        for instance in instances:
+            if not isinstance(instance, self.dataclass):
+                raise self._create_standard_type_error([self.dataclass], instance)
+
+        columns = [
+            self.formatter_instances[key]._serialize_many(list(map(attrgetter(key), instances)))
+            for key in self.keys
+        ]
+
+        if self.options.positional:
+            rows = [list(row) for row in zip(*columns)] if self.keys else [[] for _ in instances]
+            for instance, row in zip(instances, rows):
+                del row[_positional_size(self, instance):]
+            return rows
+
+        return _join_rows(self.keys, columns, instances, dict)
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        keys = self.formatter_instances.keys()
+        size = len(keys)
+        if self.options.positional and all(type(instance) is list and len(instance) == size for instance in instances):
+            getters = [itemgetter(i) for i in range(size)]
+        elif all(type(instance) is dict and instance.keys() >= keys for instance in instances):
+            getters = [itemgetter(key) for key in self.keys]
+        else:
+            # Invalid instances, positional arrays without trailing fields and dicts without keys with default
+            # values are deserialized one by one.
+            return [self._deserialize(instance) for instance in instances]
+
+        columns = [
+            self.formatter_instances[key]._deserialize_many(list(map(getter, instances)))
+            for key, getter in zip(self.keys, getters)
+        ]
+
+        return _join_rows(self.keys, columns, instances, self.dataclass)
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        if not isinstance(instance, self.dataclass):
+            raise self._create_standard_type_error([self.dataclass], instance)
+
+        return _iter_json_fields(self, instance)
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        if not isinstance(instance, self.dataclass):
+            raise self._create_standard_type_error([self.dataclass], instance)
+
+        _encode_json_fields(self, instance, parts)
 
-        return self.dataclass(**final_dict)
+    def _binary_schema(self) -> str:
+        return _binary_fields_schema(self)
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        if not isinstance(instance, self.dataclass):
+            raise self._create_standard_type_error([self.dataclass], instance)
+
+        _encode_binary_fields(self, instance, buffer)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        return self.dataclass(**_decode_binary_fields(self, reader))
 
 
 class NamedTupleSerializer(Serializer):
+    internable = True
+    memoizable = True
+
     @staticmethod
     def test_typing(typing: Any) -> bool:
         return isclass(typing) and (len(typing.__bases__) == 1) and (typing.__bases__[0] == tuple)
 
-    def __init__(self, typing: Any, prev_breadcrumbs: str = None):
-        self._init_breadcrumbs('named_tuple.{}'.format(typing.__name__), prev_breadcrumbs)
+    def __init__(self, typing: Any):
+        self._init_breadcrumbs('named_tuple.{}'.format(typing.__name__))
 
         formatter_instances = dict()
         keys = list()
         keys_with_default = set()
         named_tuple_signature = signature(typing)
         parameters = named_tuple_signature.parameters
+        hints = _type_hints(typing)
         for key in parameters.keys():
             keys.append(key)
             parameter = parameters[key]
-            parameter_annotation = parameter.annotation
+            parameter_annotation = hints.get(key, parameter.annotation)
 
             if parameter.default is not parameter.empty:
                 keys_with_default.add(key)
 
                 if parameter.default is None:
-                    parameter_annotation = Optional[parameter.annotation]
+                    parameter_annotation = Optional[parameter_annotation]
 
-            formatter_instances[key] = self._create_serializer(parameter_annotation, '[\'{}\']'.format(key))
+            formatter_instances[key] = self._create_serializer(parameter_annotation, FIELD_EDGE, key)
 
         self.keys = keys
         self.keys_with_default = keys_with_default
         self.formatter_instances = formatter_instances
         self.named_tuple = typing
+        self.json_fields = _json_fields(keys, formatter_instances, self.options.positional)
+        self.trusted_fields = _trusted_fields(keys, formatter_instances)
+        self.trailing_defaults = _trailing_defaults(keys, typing._field_defaults)
+        self.required_size = _required_size(keys, keys_with_default)
+        self.binary_decoders = tuple((key, _binary_decoder(formatter_instances[key])) for key in keys)
+        self.serialize_types = (typing,)
+        self.deserialize_types = (list, dict) if self.options.positional else (dict,)
 
     def _serialize(self, instance: Any) -> Any:
         if not isinstance(instance, self.named_tuple):
             raise self._create_standard_type_error([self.named_tuple], instance)
 
+        if self.options.positional:
+            return _serialize_positional(self, instance)
+
         final_dict = dict()
-        for key in self.keys:
-            formatter_instance = self.formatter_instances[key]
-            final_dict[key] = formatter_instance.serialize(getattr(instance, key))
+        try:
+            for key in self.keys:
+                formatter_instance = self.formatter_instances[key]
+                final_dict[key] = formatter_instance.serialize(getattr(instance, key))
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, FIELD_EDGE, key)
 
         return final_dict
 
-    def _deserialize(self, instance: Any) -> Any:
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return _serialize_fields_trusted(self, instance)
+
+    def _validate(self, instance: Any):
+        _validate_fields(self, instance)
+
+    def _validate_instance(self, instance: Any):
+        if not isinstance(instance, self.named_tuple):
+            raise self._create_standard_type_error([self.named_tuple], instance)
+
+        _validate_instance_fields(self, instance)
+
+    def __ensure_keys(self, instance: Any):
         if not isinstance(instance, dict):
-            raise self._create_standard_type_error([dict], instance)
+            raise self._create_standard_type_error(list(self.deserialize_types), instance)
 
         for key in self.keys:
             if key not in instance:
@@ -338,9 +1818,809 @@ class NamedTupleSerializer(Serializer):
                         key=key
                     ))
 
+    def _deserialize(self, instance: Any) -> Any:
+        if self.options.positional and isinstance(instance, list):
+            return self.named_tuple(**_deserialize_positional(self, instance))
+
+        self.__ensure_keys(instance)
+
         final_dict = dict()
-        for key in self.keys:
-            formatter_instance = self.formatter_instances[key]
-            final_dict[key] = formatter_instance.deserialize(instance[key])
+        try:
+            for key in self.keys:
+                if key not in instance:
+                    # Left to the default value.
+                    continue
+
+                formatter_instance = self.formatter_instances[key]
+                final_dict[key] = formatter_instance.deserialize(instance[key])
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, FIELD_EDGE, key)
 
         return self.named_tuple(**final_dict)
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        if not isinstance(old, self.named_tuple) or not isinstance(new, self.named_tuple):
+            return Serializer._diff(self, old, new, path, patch)
+
+        _diff_fields(self, old, new, path, patch)
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        if index == len(operation[1]) or not isinstance(instance, self.named_tuple):
+            return Serializer._patch(self, instance, operation, index)
+
+        key, value = _patch_field(self, instance, operation, index)
+        return instance._replace(**{key: value})
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        for instance in instances:
+            if not isinstance(instance, self.named_tuple):
+                raise self._create_standard_type_error([self.named_tuple], instance)
+
+        columns = [
+            self.formatter_instances[key]._serialize_many(list(map(attrgetter(key), instances)))
+            for key in self.keys
+        ]
+
+        if self.options.positional:
+            rows = [list(row) for row in zip(*columns)] if self.keys else [[] for _ in instances]
+            for instance, row in zip(instances, rows):
+                del row[_positional_size(self, instance):]
+            return rows
+
+        return _join_rows(self.keys, columns, instances, dict)
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        keys = self.formatter_instances.keys()
+        size = len(keys)
+        if self.options.positional and all(type(instance) is list and len(instance) == size for instance in instances):
+            getters = [itemgetter(i) for i in range(size)]
+        elif all(type(instance) is dict and instance.keys() >= keys for instance in instances):
+            getters = [itemgetter(key) for key in self.keys]
+        else:
+            # Invalid instances, positional arrays without trailing fields and dicts without keys with default
+            # values are deserialized one by one.
+            return [self._deserialize(instance) for instance in instances]
+
+        columns = [
+            self.formatter_instances[key]._deserialize_many(list(map(getter, instances)))
+            for key, getter in zip(self.keys, getters)
+        ]
+
+        return _join_rows(self.keys, columns, instances, self.named_tuple)
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        if not isinstance(instance, self.named_tuple):
+            raise self._create_standard_type_error([self.named_tuple], instance)
+
+        return _iter_json_fields(self, instance)
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        if not isinstance(instance, self.named_tuple):
+            raise self._create_standard_type_error([self.named_tuple], instance)
+
+        _encode_json_fields(self, instance, parts)
+
+    def _binary_schema(self) -> str:
+        return _binary_fields_schema(self)
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        if not isinstance(instance, self.named_tuple):
+            raise self._create_standard_type_error([self.named_tuple], instance)
+
+        _encode_binary_fields(self, instance, buffer)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        return self.named_tuple(**_decode_binary_fields(self, reader))
+
+
+class DiscriminatedUnionSerializer(Serializer):
+    @staticmethod
+    def test_typing(typing: Any) -> bool:
+        return isinstance(typing, Discriminated)
+
+    def __init__(self, typing: Discriminated):
+        self._init_breadcrumbs('Discriminated')
+
+        if not is_typing(typing.union, Union):
+            raise SerializerError(BREADCRUMBS + ': expected Union, got \'{}\'.'.format(typing.union), self.breadcrumbs)
+
+        self.key = typing.key
+        self.union_classes = typing.union.__args__
+        self.tags: Dict[type, str] = dict()
+        self.serializer_instances: Dict[str, Serializer] = dict()
+        # Dataclass and named tuple nodes of members, without their interning and memoizing wrappers.
+        self.fields_instances: Dict[str, Serializer] = dict()
+        self.edges: Dict[str, str] = dict()
+
+        i = 0
+        for union_class in self.union_classes:
+            edge = INDEX_EDGE.format(i)
+            serializer_instance = self._create_serializer(union_class, edge)
+            i += 1
+            while isinstance(serializer_instance, ProfiledSerializer):
+                # Member calls are part of the discriminated union time.
+                serializer_instance = serializer_instance.serializer
+
+            if isinstance(serializer_instance, GraphSerializer):
+                # References to members already written would carry no discriminator.
+                raise SerializerError(BREADCRUMBS + ': discriminated union members can not be written in graph mode, '
+                                      'got \'{}\'.'.format(union_class), self.breadcrumbs)
+
+            fields_instance = serializer_instance
+            while isinstance(fields_instance, (InternedSerializer, MemoizedSerializer)):
+                fields_instance = fields_instance.serializer
+
+            if not isinstance(fields_instance, (DataclassSerializer, NamedTupleSerializer)):
+                raise SerializerError(BREADCRUMBS + ': discriminated union members must be dataclasses or named '
+                                      'tuples, got \'{}\'.'.format(union_class), self.breadcrumbs)
+
+            if self.key in fields_instance.keys:
+                raise SerializerError(BREADCRUMBS + ': discriminator key \'{}\' is a field of \'{}\'.'.format(
+                    self.key, union_class.__name__
+                ), self.breadcrumbs)
+
+            self.tags[union_class] = union_class.__name__
+            self.serializer_instances[union_class.__name__] = serializer_instance
+            self.fields_instances[union_class.__name__] = fields_instance
+            self.edges[union_class.__name__] = edge
+
+        self.serialize_types = tuple(self.tags)
+        self.deserialize_types = (list, dict) if self.options.positional else (dict,)
+        self.binary_indexes: Dict[str, int] = {tag: i for i, tag in enumerate(self.serializer_instances)}
+        self.binary_tags: Tuple[str, ...] = tuple(self.serializer_instances)
+
+    def _serialize(self, instance: Any) -> Any:
+        tag = self.tags.get(type(instance))
+        if tag is None:
+            raise self._create_standard_type_error(self.union_classes, instance)
+
+        try:
+            serialized = self.serializer_instances[tag].serialize(instance)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, self.edges[tag])
+
+        if self.options.positional:
+            # Positional members are written as [tag, *fields].
+            return [tag] + serialized
+
+        if self.options.memo is not None:
+            # Memoized outputs are shared with other occurrences of the instance.
+            serialized = dict(serialized)
+        serialized[self.key] = tag
+        return serialized
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        tag = self.tags[type(instance)]
+        serialized = self.serializer_instances[tag]._serialize_trusted(instance)
+
+        if self.options.positional:
+            return [tag] + serialized
+
+        if self.options.memo is not None:
+            serialized = dict(serialized)
+        serialized[self.key] = tag
+        return serialized
+
+    def _deserialize(self, instance: Any) -> Any:
+        positional = self.options.positional and isinstance(instance, list)
+        if not (positional or isinstance(instance, dict)):
+            raise self._create_standard_type_error(list(self.deserialize_types), instance)
+
+        if positional:
+            tag = instance[0] if instance else None
+        else:
+            tag = instance.get(self.key)
+        serializer_instance = self.serializer_instances.get(tag) if isinstance(tag, str) else None
+        if serializer_instance is None:
+            raise SerializerError('Invalid discriminator \'{}\' in key \'{}\', allowed values: {}.'.format(
+                tag, self.key, list(self.serializer_instances)
+            ))
+
+        try:
+            return serializer_instance.deserialize(instance[1:] if positional else instance)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, self.edges[tag])
+
+    def _validate(self, instance: Any):
+        positional = self.options.positional and isinstance(instance, list)
+        if not (positional or isinstance(instance, dict)):
+            raise self._create_standard_type_error(list(self.deserialize_types), instance)
+
+        if positional:
+            tag = instance[0] if instance else None
+        else:
+            tag = instance.get(self.key)
+        serializer_instance = self.serializer_instances.get(tag) if isinstance(tag, str) else None
+        if serializer_instance is None:
+            raise SerializerError('Invalid discriminator \'{}\' in key \'{}\', allowed values: {}.'.format(
+                tag, self.key, list(self.serializer_instances)
+            ))
+
+        try:
+            # The tag of positional members is skipped instead of slicing it off.
+            _validate_fields(self.fields_instances[tag], instance, 1 if positional else 0)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, self.edges[tag])
+
+    def _validate_instance(self, instance: Any):
+        tag = self.tags.get(type(instance))
+        if tag is None:
+            raise self._create_standard_type_error(self.union_classes, instance)
+
+        try:
+            self.serializer_instances[tag]._validate_instance(instance)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, self.edges[tag])
+
+    def _binary_schema(self) -> str:
+        return 'Discriminated[{}]'.format(', '.join(s._binary_schema() for s in self.serializer_instances.values()))
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        tag = self.tags.get(type(instance))
+        if tag is None:
+            raise self._create_standard_type_error(self.union_classes, instance)
+
+        write_varint(buffer, self.binary_indexes[tag])
+        try:
+            self.serializer_instances[tag]._encode_binary(instance, buffer)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, self.edges[tag])
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        tag = self.binary_tags[reader.read_index(len(self.binary_tags))]
+        try:
+            return self.serializer_instances[tag]._decode_binary(reader)
+        except SerializerError as e:
+            raise e.add_frame(self.breadcrumbs, self.edges[tag])
+
+
+class ArraySerializer(Serializer):
+    """
+    Array[...] fields: lists of numbers (or of fixed-size tuples of numbers) checked and converted by NumPy at once,
+    and written to binary as raw little-endian values. Without NumPy they are handled as List[...].
+    """
+
+    @staticmethod
+    def test_typing(typing: Any) -> bool:
+        return isinstance(typing, Array)
+
+    def __init__(self, typing: Array):
+        self._init_breadcrumbs('Array')
+
+        item = typing.item
+        self.width: Optional[int] = None
+        if is_typing(item, Tuple):
+            self.width = len(item.__args__)
+            scalar = item.__args__[0] if len(set(item.__args__)) == 1 else None
+        else:
+            scalar = item
+
+        if scalar is not int and scalar is not float:
+            raise SerializerError(BREADCRUMBS + ': expected Array of int, float or a Tuple of one of them, got '
+                                  '\'{}\'.'.format(item), self.breadcrumbs)
+
+        # Items are checked one by one by the list serializer when NumPy is not installed or rejects the input, so
+        # errors are the ones of List[...].
+        self.serializer: Serializer = self._create_serializer(List[item])
+        self.dtype = '<f8' if scalar is float else '<i8'
+        self.kind = 'f' if scalar is float else 'i'
+        # Types of values List[...] accepts: NumPy would silently convert ints to floats.
+        self.value_types = {float} if scalar is float else {int, bool}
+        self.typecode = 'd' if scalar is float else 'q'
+        self.shape_tail: Tuple[int, ...] = () if self.width is None else (self.width,)
+        self.serialize_types = (list,) if numpy is None else (list, numpy.ndarray)
+        self.deserialize_types = (list,)
+
+    def __check_array(self, instance: Any):
+        if instance.dtype.kind != self.kind or instance.shape[1:] != self.shape_tail or \
+                instance.ndim != len(self.shape_tail) + 1:
+            raise SerializerError(BREADCRUMBS + ': expected array of {} with shape {}, got {} {}.'.format(
+                self.dtype, ('n',) + self.shape_tail, instance.dtype, instance.shape
+            ), self.breadcrumbs)
+
+    def _serialize(self, instance: Any) -> Any:
+        if numpy is not None and isinstance(instance, numpy.ndarray):
+            self.__check_array(instance)
+            return instance.tolist()
+
+        return self.serializer._serialize(instance)
+
+    def _deserialize(self, instance: Any) -> Any:
+        if numpy is None:
+            return self.serializer._deserialize(instance)
+
+        if not isinstance(instance, list):
+            raise self._create_standard_type_error([list], instance)
+
+        if not instance:
+            return numpy.empty((0,) + self.shape_tail, self.dtype)
+
+        try:
+            # Types are collected in C, without a Python call per value.
+            types = set(map(type, instance if self.width is None else chain.from_iterable(instance)))
+            values = numpy.array(instance) if types <= self.value_types else None
+        except (TypeError, ValueError):
+            # Not iterable tuples or tuples of different sizes.
+            values = None
+
+        # Lists of bools only are bool arrays.
+        if values is None or values.dtype.kind not in (self.kind, 'b') or values.shape[1:] != self.shape_tail:
+            self.serializer._deserialize(instance)
+            raise SerializerError(BREADCRUMBS + ': values do not fit {}.'.format(self.dtype), self.breadcrumbs)
+
+        return values.astype(self.dtype, copy=False)
+
+    def __fits(self, instance: List[Any]) -> bool:
+        """
+        Whether _deserialize makes an array of instance: rows of width values of the accepted types, ints within
+        int64. Checked one value at a time, without building anything.
+        """
+        value_types = self.value_types
+        bounded = self.kind == 'i'
+        width = self.width
+        for row in (instance,) if width is None else instance:
+            if width is not None and not ((type(row) is list or type(row) is tuple) and len(row) == width):
+                return False
+
+            for value in row:
+                if type(value) not in value_types or bounded and not -(1 << 63) <= value < 1 << 63:
+                    return False
+
+        return True
+
+    def _validate(self, instance: Any):
+        if numpy is None:
+            self.serializer._validate(instance)
+            return
+
+        if not isinstance(instance, list):
+            raise self._create_standard_type_error([list], instance)
+
+        if not self.__fits(instance):
+            self.serializer._validate(instance)
+            raise SerializerError(BREADCRUMBS + ': values do not fit {}.'.format(self.dtype), self.breadcrumbs)
+
+    def _validate_instance(self, instance: Any):
+        if numpy is not None and isinstance(instance, numpy.ndarray):
+            self.__check_array(instance)
+            return
+
+        self.serializer._validate_instance(instance)
+
+    def _binary_schema(self) -> str:
+        return 'Array[{}{}]'.format(self.dtype, '' if self.width is None else ' x {}'.format(self.width))
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        if numpy is not None and isinstance(instance, numpy.ndarray):
+            self.__check_array(instance)
+            write_varint(buffer, len(instance))
+            buffer += numpy.ascontiguousarray(instance, self.dtype).data
+            return
+
+        self.serializer._serialize(instance)
+        values = array(self.typecode)
+        try:
+            values.extend(instance if self.width is None else chain.from_iterable(instance))
+        except OverflowError:
+            raise SerializerError(BREADCRUMBS + ': values do not fit {}.'.format(self.dtype), self.breadcrumbs)
+        if sys.byteorder == 'big':
+            values.byteswap()
+
+        write_varint(buffer, len(instance))
+        buffer += values
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        size = reader.read_varint()
+        count = size * (self.width or 1)
+        offset = reader.read_offset(count * 8)
+
+        if numpy is not None:
+            # A read-only view of the binary data, nothing is copied.
+            values = numpy.frombuffer(reader.data, self.dtype, count, offset)
+            return values.reshape((size,) + self.shape_tail)
+
+        values = array(self.typecode)
+        values.frombytes(reader.data[offset:offset + count * 8])
+        if sys.byteorder == 'big':
+            values.byteswap()
+
+        if self.width is None:
+            return values.tolist()
+
+        return list(zip(*[iter(values.tolist())] * self.width))
+
+
+class InternedSerializer(_WrapperSerializer):
+    """
+    Interned[...] fields, and every str, Tuple and NamedTuple node of trees created with the intern option.
+    Deserialized values are replaced by an equal value from the pool of the running call (see PooledSerializer),
+    or by sys.intern for strings with intern='sys'. Serialization is the one of the wrapped serializer.
+    """
+
+    @staticmethod
+    def test_typing(typing: Any) -> bool:
+        return isinstance(typing, Interned)
+
+    def __init__(self, typing: Interned, serializer: Optional[Serializer] = None):
+        if serializer is None:
+            serializer = self._create_serializer(typing.item)
+        while isinstance(serializer, InternedSerializer):
+            # Interned[str] of a tree created with the intern option.
+            serializer = serializer.serializer
+
+        super().__init__(serializer)
+        self.sys_intern = self.options.intern == 'sys' and type(serializer) is BuiltinTypesSerializer and \
+            serializer.type is str
+        self.interning = not self.sys_intern
+        self.json_encoders = serializer.json_encoders
+        self.trusted_identity = serializer.trusted_identity
+
+    def __intern(self, value: Any) -> Any:
+        if self.sys_intern:
+            # sys.intern rejects str subclasses.
+            return sys.intern(value) if type(value) is str else value
+
+        pool = active_pool()
+        if pool is None:
+            # Called without the root, e.g. by a custom serializer.
+            return value
+
+        return intern_value(pool, value)
+
+    def _deserialize(self, instance: Any) -> Any:
+        return self.__intern(self.serializer._deserialize(instance))
+
+    def _deserialize_lazy(self, instance: Any) -> Any:
+        return self.__intern(self.serializer._deserialize_lazy(instance))
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        return list(map(self.__intern, self.serializer._deserialize_many(instances)))
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        return self.__intern(self.serializer._patch(instance, operation, index))
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        return self.__intern(self.serializer._decode_binary(reader))
+
+
+class MemoizedSerializer(_WrapperSerializer, register=False):
+    """
+    NamedTuple and frozen dataclass nodes of trees created with the memo option. Outputs of serialize, JSON and
+    binary encoding are reused for an instance already serialized during the same call (see MemoScopeSerializer).
+    With memo='weak', JSON and binary outputs of frozen dataclasses whose fields can not change (see _immutable)
+    are also reused during later calls while the instance lives. Outputs shared within a call: do not mutate the
+    results of serialize.
+    """
+
+    def __init__(self, serializer: Serializer):
+        super().__init__(serializer)
+        self.memoizing = True
+        self.lazy = serializer.lazy
+        # Outputs kept between calls, see weak_outputs.
+        self.weak = self.options.memo == 'weak' and type(serializer) is DataclassSerializer and \
+            _immutable(serializer)
+
+    def __cached(self, instance: Any, slot: int) -> Any:
+        entry = weak_outputs(self).get(id(instance))
+        if entry is not None and entry[0]() is instance:
+            return entry[slot]
+
+        return None
+
+    def __cache(self, instance: Any, slot: int, output: Any):
+        outputs = weak_outputs(self)
+        key = id(instance)
+        entry = outputs.get(key)
+        if entry is None or entry[0]() is not instance:
+            def forget(reference: Any):
+                entry = outputs.get(key)
+                if entry is not None and entry[0] is reference:
+                    del outputs[key]
+
+            try:
+                entry = [ref(instance, forget), None, None]
+            except TypeError:
+                # Slotted dataclasses without __weakref__.
+                return
+            outputs[key] = entry
+
+        entry[slot] = output
+
+    def __memoize(self, function: Callable, instance: Any, memo_name: str, slot: Optional[int] = None) -> Any:
+        memo = active_memo()
+        memo_outputs = getattr(memo, memo_name) if memo is not None else None
+        if memo_outputs is not None:
+            entry = memo_outputs.get(id(instance))
+            if entry is not None:
+                return entry[1]
+
+        weak = self.weak and slot is not None
+        output = self.__cached(instance, slot) if weak else None
+        if output is None:
+            output = function(instance)
+            if weak:
+                self.__cache(instance, slot, output)
+
+        if memo_outputs is not None:
+            memo_outputs[id(instance)] = (instance, output)
+
+        return output
+
+    def _serialize(self, instance: Any) -> Any:
+        # Serialized values are mutable, they are not kept between calls.
+        return self.__memoize(self.serializer._serialize, instance, 'serialized')
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        # Not shared with _serialize: trusted outputs of invalid instances would skip validation.
+        return self.__memoize(self.serializer._serialize_trusted, instance, 'trusted')
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        return list(map(self._serialize, instances))
+
+    def __encode_json(self, instance: Any) -> str:
+        parts: List[str] = list()
+        self.serializer._encode_json(instance, parts)
+        return ''.join(parts)
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        parts.append(self.__memoize(self.__encode_json, instance, 'json', 1))
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        return iter([self.__memoize(self.__encode_json, instance, 'json', 1)])
+
+    def __encode_binary(self, instance: Any) -> bytes:
+        buffer = bytearray()
+        self.serializer._encode_binary(instance, buffer)
+        return bytes(buffer)
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        buffer += self.__memoize(self.__encode_binary, instance, 'binary', 2)
+
+
+class GraphSerializer(_WrapperSerializer, register=False):
+    """
+    Dataclass nodes of trees created with the graph option. The first occurrence of an instance during a call (see
+    GraphScopeSerializer) is written with an id, under the '$id' key (positional fields under '$value'), and later
+    ones as {'$ref': id}; binary data writes 0 before the fields and id + 1 for references. Deserialized instances
+    are created before their fields, so references to them (cycles of recursive dataclasses included) are restored
+    as the same instance: __init__ and __post_init__ are not called.
+    """
+
+    def __init__(self, serializer: DataclassSerializer):
+        super().__init__(serializer)
+        self.graphing = True
+        self.dataclass = serializer.dataclass
+        self.fields = fields(serializer.dataclass)
+        # JSON of a reference and the start of an object with an id, formatted with the id.
+        self.ref_json = '{"%s": %%d}' % REF_KEY
+        self.id_json = '{"%s": %%d, "%s": ' % (ID_KEY, VALUE_KEY) if self.options.positional else '{"%s": %%d' % ID_KEY
+
+    def __register(self, graph: CallGraph, instance: Any) -> Tuple[bool, int]:
+        """
+        Returns (whether instance was met before, its id).
+        """
+        entry = graph.ids.get(id(instance))
+        if entry is not None:
+            return True, entry[1]
+
+        number = len(graph.ids)
+        graph.ids[id(instance)] = (instance, number)
+        return False, number
+
+    def __serialize(self, function: Callable, instance: Any) -> Any:
+        graph = active_graph()
+        if graph is None:
+            return run_in_graph(self.__serialize, function, instance)
+        if not isinstance(instance, self.dataclass):
+            return function(instance)
+
+        met, number = self.__register(graph, instance)
+        if met:
+            return {REF_KEY: number}
+
+        output = function(instance)
+        if self.options.positional:
+            return {ID_KEY: number, VALUE_KEY: output}
+
+        return {ID_KEY: number, **output}
+
+    def _serialize(self, instance: Any) -> Any:
+        return self.__serialize(self.serializer._serialize, instance)
+
+    def _serialize_trusted(self, instance: Any) -> Any:
+        return self.__serialize(self.serializer._serialize_trusted, instance)
+
+    def __claim(self, graph: CallGraph, number: Any, instance: Any):
+        if type(number) is not int or number in graph.instances:
+            raise SerializerError(BREADCRUMBS + ': invalid or repeated id {!r}.'.format(number), self.breadcrumbs)
+
+        graph.instances[number] = instance
+
+    def __create(self, graph: CallGraph, number: Any, read_values: Callable[[], Dict[str, Any]]) -> Any:
+        instance = object.__new__(self.dataclass)
+        self.__claim(graph, number, instance)
+        # A union trying another member with the same data forgets the instance, see restore_graph.
+        values = read_values()
+
+        for field in self.fields:
+            if field.name in values:
+                value = values[field.name]
+            elif field.default_factory is not MISSING:
+                value = field.default_factory()
+            elif field.default is not MISSING:
+                value = field.default
+            else:
+                continue
+            # Frozen dataclasses forbid __setattr__.
+            object.__setattr__(instance, field.name, value)
+
+        return instance
+
+    def __referenced(self, graph: CallGraph, number: Any) -> Any:
+        if type(number) is not int or number not in graph.instances:
+            raise SerializerError(BREADCRUMBS + ': unknown reference {!r}.'.format(number), self.breadcrumbs)
+
+        return graph.instances[number]
+
+    def _deserialize(self, instance: Any) -> Any:
+        graph = active_graph()
+        if graph is None:
+            return run_in_graph(self._deserialize, instance)
+
+        if type(instance) is dict:
+            if REF_KEY in instance:
+                return self.__referenced(graph, instance[REF_KEY])
+            if ID_KEY in instance:
+                data = instance.get(VALUE_KEY, instance) if self.options.positional else instance
+                return self.__create(graph, instance[ID_KEY], lambda: self.serializer._deserialize_fields(data))
+
+        # Written without an id, not shared.
+        return self.serializer._deserialize(instance)
+
+    def _deserialize_lazy(self, instance: Any) -> Any:
+        # References need the instances they refer to, which are created during the call.
+        return self._deserialize(instance)
+
+    def _diff(self, old: Any, new: Any, path: Tuple[Any, ...], patch: List[Any]):
+        graph = active_graph()
+        if graph is None:
+            return run_in_graph(self._diff, old, new, path, patch)
+
+        if isinstance(old, self.dataclass) and isinstance(new, self.dataclass):
+            if (id(old), id(new)) in graph.pairs:
+                # Met again through a cycle.
+                return
+            graph.pairs.add((id(old), id(new)))
+        elif old is not new:
+            # Replaced whole, through this node so the value gets its id.
+            patch.append([SET, list(path), self._serialize(new)])
+            return
+
+        self.serializer._diff(old, new, path, patch)
+
+    def _same(self, old: Any, new: Any) -> bool:
+        if old is new or not isinstance(old, self.dataclass) or not isinstance(new, self.dataclass):
+            return is_same(old, new)
+
+        # Instances equal through a cycle would compare forever, they are diffed in a separate graph instead.
+        trial: List[Any] = list()
+        run_comparing(self._diff, old, new, (), trial)
+        return not trial
+
+    def _patch(self, instance: Any, operation: List[Any], index: int) -> Any:
+        if index == len(operation[1]):
+            return Serializer._patch(self, instance, operation, index)
+
+        return self.serializer._patch(instance, operation, index)
+
+    def _validate(self, instance: Any):
+        graph = active_graph()
+        if graph is None:
+            return run_in_graph(self._validate, instance)
+
+        if type(instance) is dict:
+            if REF_KEY in instance:
+                self.__referenced(graph, instance[REF_KEY])
+                return
+            if ID_KEY in instance:
+                self.__claim(graph, instance[ID_KEY], None)
+                instance = instance.get(VALUE_KEY, instance) if self.options.positional else instance
+
+        self.serializer._validate(instance)
+
+    def _validate_instance(self, instance: Any):
+        graph = active_graph()
+        if graph is None:
+            return run_in_graph(self._validate_instance, instance)
+
+        if isinstance(instance, self.dataclass) and self.__register(graph, instance)[0]:
+            return
+
+        self.serializer._validate_instance(instance)
+
+    def _serialize_many(self, instances: List[Any]) -> List[Any]:
+        return list(map(self._serialize, instances))
+
+    def _deserialize_many(self, instances: List[Any]) -> List[Any]:
+        return list(map(self._deserialize, instances))
+
+    def _encode_json(self, instance: Any, parts: List[str]):
+        graph = active_graph()
+        if graph is None:
+            return run_in_graph(self._encode_json, instance, parts)
+        if not isinstance(instance, self.dataclass):
+            return self.serializer._encode_json(instance, parts)
+
+        met, number = self.__register(graph, instance)
+        if met:
+            parts.append(self.ref_json % number)
+            return
+
+        start = len(parts)
+        self.serializer._encode_json(instance, parts)
+        parts[start] = self.__identify_json(number, parts[start])
+        if self.options.positional:
+            parts.append('}')
+
+    def __identify_json(self, number: int, first_part: str) -> str:
+        if self.options.positional:
+            return self.id_json % number + first_part
+        if first_part == '{}':
+            return self.id_json % number + '}'
+
+        # Followed by the first field.
+        return self.id_json % number + ', ' + first_part[1:]
+
+    def _iter_json(self, instance: Any) -> Iterator[str]:
+        graph = active_graph()
+        if graph is None:
+            return iter_in_graph(self.__iter_json(instance))
+
+        return self.__iter_json(instance)
+
+    def __iter_json(self, instance: Any) -> Iterator[str]:
+        # The graph is active while chunks are produced, ids are assigned in output order.
+        graph = active_graph()
+        if not isinstance(instance, self.dataclass):
+            yield from self.serializer._iter_json(instance)
+            return
+
+        met, number = self.__register(graph, instance)
+        if met:
+            yield self.ref_json % number
+            return
+
+        chunks = iter(self.serializer._iter_json(instance))
+        yield self.__identify_json(number, next(chunks))
+        yield from chunks
+        if self.options.positional:
+            yield '}'
+
+    def _binary_schema(self) -> str:
+        return 'graph({})'.format(self.serializer._binary_schema())
+
+    def _encode_binary(self, instance: Any, buffer: bytearray):
+        graph = active_graph()
+        if graph is None:
+            return run_in_graph(self._encode_binary, instance, buffer)
+        if not isinstance(instance, self.dataclass):
+            return self.serializer._encode_binary(instance, buffer)
+
+        met, number = self.__register(graph, instance)
+        if met:
+            write_varint(buffer, number + 1)
+            return
+
+        write_varint(buffer, 0)
+        self.serializer._encode_binary(instance, buffer)
+
+    def _decode_binary(self, reader: BinaryReader) -> Any:
+        graph = active_graph()
+        if graph is None:
+            return run_in_graph(self._decode_binary, reader)
+
+        tag = reader.read_varint()
+        if tag:
+            return self.__referenced(graph, tag - 1)
+
+        return self.__create(graph, len(graph.instances), lambda: _decode_binary_fields(self.serializer, reader))
@@ -0,0 +1,82 @@
+from typing import Any
+
+
+class Discriminated:
+    """
+    Discriminated[Union[Cat, Dog], 'kind'] is a union of dataclasses or named tuples whose serialized form
+    carries the member class name under the 'kind' key, so members are picked by that key instead of trying
+    each of them.
+    """
+
+    def __init__(self, union: Any, key: str):
+        self.union = union
+        self.key = key
+
+    def __class_getitem__(cls, parameters: Any) -> 'Discriminated':
+        union, key = parameters
+        return cls(union, key)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Discriminated) and self.union == other.union and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash((Discriminated, self.union, self.key))
+
+    def __repr__(self) -> str:
+        return 'Discriminated[{}, {!r}]'.format(self.union, self.key)
+
+    def __call__(self, *args, **kwargs):
+        # typing requires arguments of List[...], Optional[...] etc. to be callable on python < 3.11.
+        raise TypeError('Cannot instantiate {!r}'.format(self))
+
+
+class Array:
+    """
+    Array[float], Array[int] or Array[Tuple[float, float]] (a fixed-size tuple of one of them) is a list of numbers
+    or of tuples of numbers, deserialized into a numpy.ndarray of shape (n,) or (n, tuple size). Without NumPy it
+    is the same as List[...].
+    """
+
+    def __init__(self, item: Any):
+        self.item = item
+
+    def __class_getitem__(cls, item: Any) -> 'Array':
+        return cls(item)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Array) and self.item == other.item
+
+    def __hash__(self) -> int:
+        return hash((Array, self.item))
+
+    def __repr__(self) -> str:
+        return 'Array[{}]'.format(self.item)
+
+    def __call__(self, *args, **kwargs):
+        raise TypeError('Cannot instantiate {!r}'.format(self))
+
+
+class Interned:
+    """
+    Interned[str], Interned[Tuple[...]] or Interned[SomeNamedTuple]: deserialized values equal to an earlier one of
+    the same deserialize call are replaced by it, so repeated values are stored once. Strings are interned with
+    sys.intern instead when the serializer is created with intern='sys'.
+    """
+
+    def __init__(self, item: Any):
+        self.item = item
+
+    def __class_getitem__(cls, item: Any) -> 'Interned':
+        return cls(item)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Interned) and self.item == other.item
+
+    def __hash__(self) -> int:
+        return hash((Interned, self.item))
+
+    def __repr__(self) -> str:
+        return 'Interned[{}]'.format(self.item)
+
+    def __call__(self, *args, **kwargs):
+        raise TypeError('Cannot instantiate {!r}'.format(self))
@@ -1,7 +1,87 @@
-from typing import Any
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any, Optional, Tuple
+
+INFINITY = float('inf')
 
 
 def is_typing(typing_instance: Any, typing_generic: Any) -> bool:
     origins_match = getattr(typing_instance, '__origin__', 1) is getattr(typing_generic, '__origin__', 2)
     instance_origin_match = getattr(typing_instance, '__origin__', 1) is typing_generic
     return origins_match or instance_origin_match
+
+
+def json_key(key: Any) -> str:
+    """
+    Converts a serialized dict key to a JSON object key the way json.dumps does.
+    """
+    if isinstance(key, str):
+        return encode_basestring_ascii(key)
+    if key is True:
+        return '"true"'
+    if key is False:
+        return '"false"'
+    if key is None:
+        return '"null"'
+    if isinstance(key, int):
+        return '"{}"'.format(int.__repr__(key))
+    if isinstance(key, float):
+        return '"{}"'.format(json.dumps(key))
+
+    raise TypeError('keys must be str, int, float, bool or None, not {}'.format(key.__class__.__name__))
+
+
+def parse_json_key(key: str, types: Optional[Tuple[type, ...]]) -> Any:
+    """
+    Reverts json_key for keys of dicts whose key serializer does not accept str (e.g. Dict[int, ...]).
+    """
+    if types is None or issubclass(str, types):
+        return key
+
+    if issubclass(bool, types) and key in ('true', 'false'):
+        return key == 'true'
+    if issubclass(type(None), types) and key == 'null':
+        return None
+    if issubclass(int, types):
+        try:
+            return int(key)
+        except ValueError:
+            pass
+    if issubclass(float, types):
+        try:
+            return float(key)
+        except ValueError:
+            pass
+
+    return key
+
+
+def json_float(value: float) -> str:
+    if value != value:
+        return 'NaN'
+    if value == INFINITY:
+        return 'Infinity'
+    if value == -INFINITY:
+        return '-Infinity'
+    return float.__repr__(value)
+
+
+# JSON encoders of values of exactly these types.
+JSON_ENCODERS = {
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    float: json_float,
+    bool: {True: 'true', False: 'false'}.__getitem__,
+    type(None): {None: 'null'}.__getitem__,
+}
+
+
+def json_value(value: Any) -> str:
+    """
+    json.dumps(value), with a shortcut for primitives.
+    """
+    encoder = JSON_ENCODERS.get(type(value))
+    if encoder is None:
+        return json.dumps(value)
+
+    return encoder(value)
@@ -0,0 +1,13 @@
+import pytest
+
+from serializer.serializer_manager import _serializers_manager
+
+
+@pytest.fixture
+def restore_registry():
+    """
+    Serializer classes defined by a test are unregistered after it, the serializer cache is restored.
+    """
+    state = _serializers_manager.save_registry()
+    yield
+    _serializers_manager.restore_registry(state)
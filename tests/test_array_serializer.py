@@ -0,0 +1,95 @@
+import pytest
+from typing import List, Dict, Tuple
+from dataclasses import dataclass
+
+import serializer.serializers
+from serializer import create_serializer, clear_serializer_cache, Array
+from serializer.exceptions import SerializerError
+
+
+@dataclass
+class UserStorage:
+    user_ids: Array[int]
+    user_ratings: Array[float]
+    user_location_coordinates: Array[Tuple[float, float]]
+
+
+storage_serialized = {
+    'user_ids': [1, 2, -3],
+    'user_ratings': [0.5, 4.75, -1e300],
+    'user_location_coordinates': [[55.75, 37.61], [-33.86, 151.2]],
+}
+
+
+@pytest.fixture
+def without_numpy(monkeypatch):
+    monkeypatch.setattr(serializer.serializers, 'numpy', None)
+    clear_serializer_cache()
+    yield
+    clear_serializer_cache()
+
+
+def test_array_fallback(without_numpy):
+    storage_serializer = create_serializer(UserStorage)
+
+    storage = storage_serializer.deserialize(storage_serialized)
+    assert storage == UserStorage([1, 2, -3], [0.5, 4.75, -1e300], [(55.75, 37.61), (-33.86, 151.2)])
+    assert storage_serializer.serialize(storage) == storage_serialized
+
+    data = storage_serializer.serialize_binary(storage)
+    assert storage_serializer.deserialize_binary(data) == storage
+    # Three counts, eight bytes per value.
+    assert len(data) == len(storage_serializer.binary_header) + 3 + 8 * 10
+
+    with pytest.raises(SerializerError) as e:
+        storage_serializer.deserialize(dict(storage_serialized, user_location_coordinates=[[1.0, 2.0], [3.0]]))
+    assert e.value.path == ('user_location_coordinates', 1)
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(Array[int]).serialize_binary([2 ** 70])
+    assert 'do not fit' in str(e.value)
+
+
+def test_array_typing_errors():
+    for typing in [Array[str], Array[Tuple[int, float]], Array[List[float]]]:
+        with pytest.raises(SerializerError) as e:
+            create_serializer(typing)
+        assert 'expected Array of int, float' in str(e.value)
+
+
+def test_array_numpy():
+    numpy = pytest.importorskip('numpy')
+    clear_serializer_cache()
+    storage_serializer = create_serializer(UserStorage)
+
+    storage = storage_serializer.deserialize(storage_serialized)
+    assert storage.user_ids.dtype == numpy.dtype('<i8')
+    assert storage.user_location_coordinates.shape == (2, 2)
+    assert storage_serializer.serialize(storage) == storage_serialized
+    assert create_serializer(Array[Tuple[float, float]]).deserialize([]).shape == (0, 2)
+
+    data = storage_serializer.serialize_binary(storage)
+    decoded = storage_serializer.deserialize_binary(data)
+    assert numpy.array_equal(decoded.user_location_coordinates, storage.user_location_coordinates)
+    # Decoded arrays are views of the binary data.
+    assert not decoded.user_ratings.flags.owndata
+
+    for values, path in [
+        ([1.5, 'a'], ('user_ratings', 1)),
+        ([1.5, 2], ('user_ratings', 1)),
+        ([1.5, None], ('user_ratings', 1)),
+    ]:
+        with pytest.raises(SerializerError) as e:
+            storage_serializer.deserialize(dict(storage_serialized, user_ratings=values))
+        assert e.value.path == path
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(Array[int]).deserialize([2 ** 70])
+    assert 'do not fit' in str(e.value)
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(Array[Tuple[float, float]]).serialize(numpy.zeros((2, 3)))
+    assert 'expected array of <f8' in str(e.value)
+
+    assert create_serializer(Dict[str, Array[float]]).serialize_json({'a': numpy.arange(3.0)}) == \
+        '{"a": [0.0, 1.0, 2.0]}'
@@ -0,0 +1,140 @@
+import pytest
+from typing import List, Dict, Tuple, Union, Optional, NamedTuple, Any
+from enum import Enum, IntEnum
+from dataclasses import dataclass
+
+from serializer import create_serializer, SerializableClass, Discriminated
+from serializer.compiler import CompiledSerializer
+
+
+class UserRank(IntEnum):
+    user = 0
+    admin = 1
+
+
+class StrEnum(Enum):
+    a = 'a'
+    b = 'b'
+
+
+@dataclass
+class User:
+    id: Optional[int]
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    banned: bool = False
+    avatar_url: Optional[str] = None
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, float, str]
+
+
+class TwoFactorAuth(SerializableClass):
+    def __init__(self, secret_code: str):
+        self.secret_code = secret_code
+
+    def __eq__(self, other):
+        return isinstance(other, TwoFactorAuth) and self.secret_code == other.secret_code
+
+    def serialize(self) -> str:
+        return self.secret_code
+
+    @staticmethod
+    def deserialize(instance: str) -> 'TwoFactorAuth':
+        return TwoFactorAuth(instance)
+
+
+@dataclass
+class UserStorage:
+    users: Dict[int, User]
+    user_location_coordinates: Dict[int, Tuple[float, float]]
+    user_additional_attributes: Dict[int, List[UserAttribute]]
+    two_factor_auth: Dict[int, TwoFactorAuth]
+    extra: Any = None
+
+
+user = User(1, 'feleks', UserRank.admin, [2, 3])
+user_serialized = {
+    'id': 1, 'login': 'feleks', 'rank': 'admin', 'friend_ids': [2, 3], 'banned': False, 'avatar_url': None
+}
+user_storage = UserStorage(
+    users={1: user, 2: User(None, 'root', UserRank.user, [], True, './pepe.png')},
+    user_location_coordinates={1: (1.29485739, 23.232293)},
+    user_additional_attributes={1: [UserAttribute('last_name', 'George'), UserAttribute('height', 1.92)]},
+    two_factor_auth={1: TwoFactorAuth('3DWR32GS')}
+)
+
+# (typing, values to serialize, values to deserialize); both valid and invalid values.
+CASES = [
+    (int, [1, True, 'q', 1.1, None], [1, 'q']),
+    (float, [1.1, 1], [1.1, 1]),
+    (str, ['hello', 1], ['hello', 1]),
+    (bool, [True, 1], [False, 0]),
+    (None, [None, True], [None, 35]),
+    (dict, [{'a': {'a': 3}}, []], [{'a': 1}, []]),
+    (list, [[1, 'w'], {}], [[1, 'w'], {1, 2}]),
+    (tuple, [(1, 'w'), [1]], [(1, 'w'), {}]),
+    (Any, [object, None], [[1], None]),
+    (UserRank, [UserRank.admin, 'admin', 1], ['admin', 'moderator', 1]),
+    (StrEnum, [StrEnum.a, 'a'], ['b', 'c']),
+    (List[int], [[1, 2, 3], [1, '3'], (1, 2)], [[1, 2, 3], [1, 2, '3'], {}]),
+    (List[Dict[str, float]], [[{'a': 1.0}], [{'a': 1}]], [[{'a': 1.0}, {}], [{1: 1.0}]]),
+    (Dict[int, str], [{1: 'a'}, {'1': 'a'}, []], [{1: 'a'}, {1: 1}]),
+    (Dict[Tuple[int, int], Tuple[str]], [{(1, 2): ('a',)}, {(1, 2): ('a', 'b')}], [{(1, 2): ['a']}, {(1,): ('a',)}]),
+    (Tuple[int, str, bool, float], [(1, 'a', True, 1.0), [1, 'a', True, 1.0], (1, 'a')], [[1, 'a', False, 2.0], [1]]),
+    (Tuple[()], [()], [[]]),
+    (Union[str, int, float], ['1', 1, 1.2, [1], {}], ['1', 1, 1.2, None]),
+    (Optional[str], ['1', None, 1], ['1', None, 1]),
+    (Optional[Any], [None, 1], [None, 1]),
+    (Union[User, List[Dict[int, int]]], [user, [{1: 1}], [{1: '1'}]], [user_serialized, [{1: 1}], 1]),
+    (User, [user, user_serialized, User('1', 'a', UserRank.user, [])], [
+        user_serialized,
+        dict(user_serialized, login=None),
+        dict(user_serialized, rank='moderator'),
+        {key: value for key, value in user_serialized.items() if key != 'login'},
+        {key: value for key, value in user_serialized.items() if key != 'banned'},
+        [],
+    ]),
+    (Discriminated[Union[User, UserAttribute], 'kind'], [user, UserAttribute('a', 1), 1], [
+        dict(user_serialized, kind='User'),
+        {'name': 'a', 'value': 1, 'kind': 'UserAttribute'},
+        {'name': 'a', 'value': 1},
+    ]),
+    (List[UserAttribute], [[UserAttribute('a', 1)], [('a', 1)]], [[{'name': 'a', 'value': 1.5}], [{'name': 'a'}]]),
+    (TwoFactorAuth, [TwoFactorAuth('a'), 'a'], ['a', TwoFactorAuth('a')]),
+    (UserStorage, [user_storage], [create_serializer(UserStorage).serialize(user_storage)]),
+    (List[Tuple[User, Dict[str, str]]], [[(user, {'a': 'b'})]], [[[user_serialized, {'a': 'b'}]], [[user_serialized]]]),
+]
+
+
+def _outcome(function, value):
+    try:
+        return 'result', function(value)
+    except Exception as e:
+        return 'error', type(e), str(e)
+
+
+@pytest.mark.parametrize('typing, serialize_values, deserialize_values', CASES)
+def test_compiled_serializer_equivalence(typing, serialize_values, deserialize_values):
+    serializer = create_serializer(typing)
+    compiled_serializer = create_serializer(typing, compile=True)
+
+    assert isinstance(compiled_serializer, CompiledSerializer)
+    assert create_serializer(typing, compile=True) is compiled_serializer
+
+    for value in serialize_values:
+        assert _outcome(compiled_serializer.serialize, value) == _outcome(serializer.serialize, value)
+
+    for value in deserialize_values:
+        assert _outcome(compiled_serializer.deserialize, value) == _outcome(serializer.deserialize, value)
+
+
+def test_compiled_serializer_source():
+    compiled_serializer = create_serializer(List[User], compile=True)
+
+    assert 'def ' in compiled_serializer.source
+    assert '.friend_ids' in compiled_serializer.source
+    assert compiled_serializer.deserialize_json(compiled_serializer.serialize_json([user])) == [user]
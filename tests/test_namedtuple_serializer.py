@@ -22,3 +22,26 @@ def test_namedtuple_serializer_plain():
 
     assert named_tuple_serializer.serialize(user) == user_serialized
     assert named_tuple_serializer.deserialize(user_serialized) == user
+
+
+class Category(NamedTuple):
+    name: str
+    # Forward references, a recursive one included.
+    parent: Optional['Category'] = None
+    owner: Optional['User'] = None
+
+
+def test_namedtuple_serializer_forward_references():
+    category_serializer = create_serializer(Category)
+
+    category = Category('phones', Category('electronics', owner=User('root', '123')))
+    category_serialized = {
+        'name': 'phones',
+        'parent': {'name': 'electronics', 'parent': None, 'owner': {'login': 'root', 'password': '123'}},
+        'owner': None
+    }
+
+    assert category_serializer.serialize(category) == category_serialized
+    assert category_serializer.deserialize(category_serialized) == category
+    with pytest.raises(SerializerError):
+        category_serializer.deserialize({'name': 'phones', 'parent': {'name': 1}})
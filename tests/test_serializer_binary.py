@@ -0,0 +1,154 @@
+import pytest
+from typing import List, Dict, Tuple, Union, Optional, NamedTuple, Any
+from enum import Enum, IntEnum
+from dataclasses import dataclass
+
+from serializer import create_serializer, Discriminated
+from serializer.exceptions import SerializerError
+
+
+class UserRank(IntEnum):
+    user = 0
+    admin = 1
+
+
+class Color(Enum):
+    red = 'r'
+    green = 'g'
+    crimson = 'r'
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, float, str]
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    location: Tuple[float, float]
+    attributes: Dict[str, UserAttribute]
+    extra: Any
+    avatar_url: Optional[str] = None
+
+
+@dataclass
+class RenamedUser:
+    id: int
+    name: str
+    rank: UserRank
+    friend_ids: List[int]
+    location: Tuple[float, float]
+    attributes: Dict[str, UserAttribute]
+    extra: Any
+    avatar_url: Optional[str] = None
+
+
+@dataclass
+class Circle:
+    radius: float
+
+
+@dataclass
+class Square:
+    side: float
+
+
+users = [
+    User(i - 25, 'userф{}'.format(i), UserRank(i % 2), list(range(i)), (i / 2, -float('inf')),
+         {'height': UserAttribute('height', 1.5 + i), 'nick': UserAttribute('nick', str(i))}, {'a': [i]},
+         None if i % 3 else 'avatar.png')
+    for i in range(50)
+]
+
+
+def test_serialize_binary():
+    users_serializer = create_serializer(List[User])
+
+    data = users_serializer.serialize_binary(users)
+    assert isinstance(data, bytes)
+    assert users_serializer.deserialize_binary(data) == users
+    assert users_serializer.deserialize_binary(bytearray(data)) == users
+    assert len(data) < len(users_serializer.serialize_json(users)) / 2
+
+    for typing, instance in [
+        (int, 0),
+        (int, -2 ** 70),
+        (float, float('nan')),
+        (str, '\ud800☃'),
+        (bool, False),
+        (None, None),
+        (list, [1, 'a', None]),
+        (Any, {'a': [1.5, None]}),
+        (Dict[int, List[Color]], {1: [Color.red, Color.green], -1: [], 2 ** 40: [Color.crimson]}),
+        (Tuple[()], ()),
+        (Tuple[int, Optional[str]], (1, None)),
+        (List[Union[int, str, List[int]]], [1, 'a', [], [2]]),
+        (List[Union[int, bool]], [1, True, 0, False]),
+        (List[Union[float, int, bool]], [1.0, 1, True]),
+        (List[Discriminated[Union[Circle, Square], 'kind']], [Circle(1.5), Square(2.0)]),
+    ]:
+        serializer = create_serializer(typing)
+        deserialized = serializer.deserialize_binary(serializer.serialize_binary(instance))
+        assert serializer.serialize_json(deserialized) == serializer.serialize_json(instance)
+
+    compiled_serializer = create_serializer(List[User], compile=True)
+    assert compiled_serializer.serialize_binary(users) == data
+    assert compiled_serializer.deserialize_binary(data) == users
+
+
+def test_serialize_binary_size():
+    assert create_serializer(List[UserRank]).serialize_binary([UserRank.admin] * 10)[11:] == b'\x0a' + b'\x01' * 10
+    assert create_serializer(Optional[int]).serialize_binary(None)[11:] == b'\x01'
+    assert create_serializer(Optional[int]).serialize_binary(-1)[11:] == b'\x00\x01'
+
+
+def test_binary_schema_mismatch():
+    data = create_serializer(List[User]).serialize_binary(users)
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(List[RenamedUser]).deserialize_binary(data)
+    assert 'different schema' in str(e.value)
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(List[User]).deserialize_binary(b'[]')
+    assert 'unknown format' in str(e.value)
+
+    assert create_serializer(List[Color]).binary_header != create_serializer(List[UserRank]).binary_header
+    assert create_serializer(Tuple[int, str]).binary_header != create_serializer(Tuple[str, int]).binary_header
+
+
+def test_binary_invalid_data():
+    serializer = create_serializer(List[User])
+    data = serializer.serialize_binary(users)
+
+    with pytest.raises(SerializerError) as e:
+        serializer.deserialize_binary(data[:-3])
+    assert 'Unexpected end' in str(e.value)
+
+    with pytest.raises(SerializerError) as e:
+        serializer.deserialize_binary(data + b'\x00')
+    assert '1 extra bytes' in str(e.value)
+
+    enum_serializer = create_serializer(UserRank)
+    with pytest.raises(SerializerError):
+        enum_serializer.deserialize_binary(enum_serializer.binary_header + b'\x02')
+
+
+def test_serialize_binary_errors():
+    with pytest.raises(SerializerError) as e:
+        create_serializer(List[User]).serialize_binary(users[:2] + [User(1, 'a', 'admin', [], (1.0, 2.0), {}, None)])
+    assert e.value.path == (2, 'rank')
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(Dict[str, List[int]]).serialize_binary({'a': [1, 2, '3']})
+    assert e.value.path == ('a', 2)
+    assert e.value.breadcrumbs == 'Dict[value]->List[]->int'
+
+    # Bools would be read back as 1 and 0.
+    with pytest.raises(SerializerError) as e:
+        create_serializer(List[int]).serialize_binary([1, True])
+    assert e.value.path == (1,)
@@ -0,0 +1,131 @@
+import pytest
+from typing import List, Dict, Optional, Union
+from dataclasses import dataclass
+
+from serializer import create_serializer, Serializer, serializer_cache_info, clear_serializer_cache, Discriminated
+from serializer.exceptions import SerializerError
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+def test_serializer_cache_reuses_serializers():
+    clear_serializer_cache()
+
+    user_serializer = create_serializer(User)
+    info = serializer_cache_info()
+    assert info.misses > 0
+    assert info.currsize == info.misses
+
+    assert create_serializer(User) is user_serializer
+    assert serializer_cache_info().hits == info.hits + 1
+    assert serializer_cache_info().misses == info.misses
+
+    # Serializers are shared within one build and across builds.
+    assert user_serializer.formatter_instances['friend_ids'].serializer is user_serializer.formatter_instances['id']
+    users_serializer = create_serializer(Dict[int, User])
+    assert users_serializer.value_formatter is user_serializer
+    assert users_serializer.key_formatter is user_serializer.formatter_instances['id']
+
+    user = User(1, 'feleks', [2, 3])
+    assert users_serializer.serialize({1: user}) == {1: user_serializer.serialize(user)}
+
+
+@dataclass
+class A:
+    x: int
+
+
+@dataclass
+class B:
+    x: int
+
+
+@dataclass
+class HoldsAB:
+    f: Union[A, B]
+
+
+@dataclass
+class HoldsBA:
+    f: Union[B, A]
+
+
+def test_serializer_cache_keeps_union_order():
+    clear_serializer_cache()
+
+    # Union[A, B] == Union[B, A], members are tried in their own order.
+    assert create_serializer(Union[A, B]).deserialize({'x': 1}) == A(1)
+    assert create_serializer(Union[B, A]).deserialize({'x': 1}) == B(1)
+    assert create_serializer(List[Union[B, A]]).deserialize([{'x': 1}]) == [B(1)]
+    assert create_serializer(HoldsAB).deserialize({'f': {'x': 1}}) == HoldsAB(A(1))
+    assert create_serializer(HoldsBA).deserialize({'f': {'x': 1}}) == HoldsBA(B(1))
+    assert create_serializer(Optional[Union[B, A]]).deserialize({'x': 1}) == B(1)
+
+    ab = create_serializer(Discriminated[Union[A, B], 'kind'])
+    ba = create_serializer(Discriminated[Union[B, A], 'kind'])
+    assert ab is not ba
+    assert ab.binary_tags == ('A', 'B') and ba.binary_tags == ('B', 'A')
+
+
+def test_serializer_cache_keeps_breadcrumbs():
+    clear_serializer_cache()
+
+    create_serializer(int)
+    user_serializer = create_serializer(User)
+    users_serializer = create_serializer(Dict[int, User])
+
+    with pytest.raises(SerializerError) as e:
+        user_serializer.deserialize({'id': '1', 'login': 'feleks', 'friend_ids': []})
+    assert 'dataclass.User[\'id\']->int' in str(e.value)
+
+    with pytest.raises(SerializerError) as e:
+        users_serializer.deserialize({1: {'id': 1, 'login': 'feleks', 'friend_ids': [1, '2']}})
+    assert 'Dict[value]->dataclass.User[\'friend_ids\']->List[]->int' in str(e.value)
+
+
+def test_serializer_cache_unhashable_typing(restore_registry):
+    class UnhashableTyping:
+        __hash__ = None
+
+    class UnhashableTypingSerializer(Serializer):
+        @staticmethod
+        def test_typing(typing) -> bool:
+            return isinstance(typing, UnhashableTyping)
+
+        def __init__(self, typing):
+            self._init_breadcrumbs('Unhashable')
+
+        def _serialize(self, instance):
+            return instance
+
+        def _deserialize(self, instance):
+            return instance
+
+    typing = UnhashableTyping()
+    assert create_serializer(typing) is not create_serializer(typing)
+
+
+def test_serializer_cache_invalidated_on_registration(restore_registry):
+    clear_serializer_cache()
+
+    create_serializer(User)
+    assert serializer_cache_info().currsize > 0
+
+    class NeverUsedSerializer(Serializer):
+        @staticmethod
+        def test_typing(typing) -> bool:
+            return False
+
+        def _serialize(self, instance):
+            return instance
+
+        def _deserialize(self, instance):
+            return instance
+
+    assert serializer_cache_info().currsize == 0
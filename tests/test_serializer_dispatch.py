@@ -0,0 +1,88 @@
+from typing import List
+
+from serializer import create_serializer, Serializer
+from serializer.serializers import ListSerializer
+
+
+class Point:
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+
+class Vector(Point):
+    pass
+
+
+instantiated = list()
+
+
+class PointSerializer(Serializer):
+    dispatch_types = (Point,)
+
+    @staticmethod
+    def test_typing(typing) -> bool:
+        return typing is Point
+
+    def __init__(self, typing):
+        self._init_breadcrumbs('Point')
+        instantiated.append(PointSerializer)
+
+    def _serialize(self, instance: Point):
+        return [instance.x, instance.y]
+
+    def _deserialize(self, instance) -> Point:
+        return Point(instance[0], instance[1])
+
+
+class AnyPointSerializer(Serializer):
+    @staticmethod
+    def test_typing(typing) -> bool:
+        return isinstance(typing, type) and issubclass(typing, Point)
+
+    def __init__(self, typing):
+        self._init_breadcrumbs('AnyPoint')
+        instantiated.append(AnyPointSerializer)
+        self.type = typing
+
+    def _serialize(self, instance: Point):
+        return {'x': instance.x, 'y': instance.y}
+
+    def _deserialize(self, instance) -> Point:
+        return self.type(instance['x'], instance['y'])
+
+
+class IntOverrideSerializer(Serializer):
+    dispatch_types = (int,)
+
+    @staticmethod
+    def test_typing(typing) -> bool:
+        return typing is int
+
+    def _serialize(self, instance):
+        return str(instance)
+
+    def _deserialize(self, instance):
+        return int(instance)
+
+
+def test_dispatch_first_registered_wins():
+    instantiated.clear()
+
+    point_serializer = create_serializer(Point)
+    assert isinstance(point_serializer, PointSerializer)
+    assert instantiated == [PointSerializer]
+    assert point_serializer.serialize(Point(1, 2)) == [1, 2]
+
+    instantiated.clear()
+
+    vector_serializer = create_serializer(Vector)
+    assert isinstance(vector_serializer, AnyPointSerializer)
+    assert instantiated == [AnyPointSerializer]
+    assert vector_serializer.serialize(Vector(1, 2)) == {'x': 1, 'y': 2}
+
+
+def test_dispatch_builtin_serializers_are_not_overridden():
+    assert create_serializer(int).serialize(1) == 1
+    assert create_serializer(List[int]).serialize([1, 2]) == [1, 2]
+    assert isinstance(create_serializer(List[Point]), ListSerializer)
@@ -0,0 +1,83 @@
+import json
+import pytest
+from typing import List, Dict, Union
+from enum import Enum, IntEnum
+from dataclasses import dataclass
+
+from serializer import create_serializer
+from serializer.exceptions import SerializerError
+
+
+class UserRank(IntEnum):
+    user = 0
+    moderator = 1
+    admin = 2
+    administrator = 2
+
+
+class Color(Enum):
+    red = 'r'
+    green = 'g'
+
+
+class Shape(Enum):
+    point = (0, 0)
+
+
+@dataclass
+class User:
+    id: int
+    rank: UserRank
+    colors: List[Color]
+
+
+users = [User(1, UserRank.admin, [Color.red]), User(2, UserRank.user, [Color.green, Color.red])]
+
+
+@pytest.mark.parametrize('compile', [False, True])
+def test_enum_encodings(compile):
+    for encoding, serialized in [
+        ('name', [{'id': 1, 'rank': 'admin', 'colors': ['red']}, {'id': 2, 'rank': 'user', 'colors': ['green', 'red']}]),
+        ('value', [{'id': 1, 'rank': 2, 'colors': ['r']}, {'id': 2, 'rank': 0, 'colors': ['g', 'r']}]),
+        ('ordinal', [{'id': 1, 'rank': 2, 'colors': [0]}, {'id': 2, 'rank': 0, 'colors': [1, 0]}]),
+    ]:
+        serializer = create_serializer(List[User], compile=compile, enum_encoding=encoding)
+
+        assert serializer.serialize(users) == serialized
+        assert serializer.serialize(users, trusted=True) == serialized
+        assert serializer.serialize_json(users) == json.dumps(serialized)
+        assert serializer.deserialize(serialized) == users
+        assert serializer.deserialize_json(json.dumps(serialized)) == users
+        assert serializer.deserialize_many([serialized]) == [users]
+        serializer.validate(serialized)
+
+    assert create_serializer(UserRank).deserialize('administrator') is UserRank.admin
+    colors_serializer = create_serializer(Dict[Color, int], enum_encoding='ordinal')
+    assert colors_serializer.serialize_json({Color.green: 5}) == '{"1": 5}'
+    assert dict(colors_serializer.iter_deserialize_json(['{"1": 5}'])) == {Color.green: 5}
+    assert create_serializer(Union[UserRank, str], enum_encoding='value').deserialize('admin') == 'admin'
+
+
+def test_enum_encoding_errors():
+    serializer = create_serializer(UserRank, enum_encoding='value')
+
+    with pytest.raises(SerializerError) as e:
+        serializer.deserialize(5)
+    assert str(e.value) == 'Invalid enum value 5, allowed values: [0, 1, 2].'
+
+    for invalid in [True, 2.0, 'admin', [2]]:
+        with pytest.raises(SerializerError) as e:
+            serializer.deserialize(invalid)
+        assert 'expected type' in str(e.value)
+
+        with pytest.raises(SerializerError):
+            serializer.deserialize_many([2, invalid])
+
+    with pytest.raises(SerializerError):
+        create_serializer(Color, enum_encoding='ordinal').validate(2)
+
+    with pytest.raises(SerializerError):
+        create_serializer(Shape, enum_encoding='value')
+
+    with pytest.raises(SerializerError):
+        create_serializer(Color, enum_encoding='index')
@@ -0,0 +1,98 @@
+import pickle
+import pytest
+from typing import List, Dict, Tuple, Optional
+from datetime import date
+from dataclasses import dataclass
+
+from serializer import create_serializer
+from serializer.exceptions import SerializerError
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+@dataclass
+class UserStorage:
+    users: Dict[int, User]
+    user_location_coordinates: Dict[int, Tuple[float, float]]
+
+
+def test_error_path():
+    user_storage_serializer = create_serializer(UserStorage)
+
+    with pytest.raises(SerializerError) as e:
+        user_storage_serializer.deserialize({
+            'users': {
+                1: {'id': 1, 'login': 'feleks', 'friend_ids': [], 'avatar_url': None},
+                2: {'id': 2, 'login': 'root', 'friend_ids': [1, 3, '4'], 'avatar_url': None},
+            },
+            'user_location_coordinates': {}
+        })
+    assert e.value.path == ('users', 2, 'friend_ids', 2)
+    assert e.value.breadcrumbs == 'dataclass.UserStorage[\'users\']->Dict[value]->' \
+                                  'dataclass.User[\'friend_ids\']->List[]->int'
+    assert str(e.value) == 'Validation error. ' \
+                           'dataclass.UserStorage[\'users\']->Dict[value]->dataclass.User[\'friend_ids\']->List[]->int: ' \
+                           'expected type: <class \'int\'>; got <class \'str\'>. '
+
+    with pytest.raises(SerializerError) as e:
+        user_storage_serializer.serialize(UserStorage({'1': User(1, 'feleks', [])}, {}))
+    assert e.value.path == ('users', '1')
+    assert e.value.breadcrumbs == 'dataclass.UserStorage[\'users\']->Dict[key]->int'
+
+    with pytest.raises(SerializerError) as e:
+        user_storage_serializer.serialize(UserStorage({}, {1: (1.0, 2)}))
+    assert e.value.path == ('user_location_coordinates', 1, 1)
+    assert e.value.breadcrumbs == 'dataclass.UserStorage[\'user_location_coordinates\']->Dict[value]->Tuple[1]->float'
+
+    with pytest.raises(SerializerError) as e:
+        user_storage_serializer.deserialize({'users': {1: {'id': 1}}, 'user_location_coordinates': {}})
+    assert e.value.path == ('users', 1)
+    assert str(e.value) == 'missing required key \'login\''
+
+
+def test_error_path_shared_serializers():
+    user_serializer = create_serializer(User)
+    users_serializer = create_serializer(List[User])
+
+    with pytest.raises(SerializerError) as e:
+        user_serializer.deserialize({'id': 1, 'login': None, 'friend_ids': []})
+    assert e.value.path == ('login',)
+    assert e.value.breadcrumbs == 'dataclass.User[\'login\']->str'
+
+    with pytest.raises(SerializerError) as e:
+        users_serializer.deserialize([
+            {'id': 1, 'login': 'feleks', 'friend_ids': [], 'avatar_url': None},
+            {'id': 1, 'login': None, 'friend_ids': [], 'avatar_url': None}
+        ])
+    assert e.value.path == (1, 'login')
+    assert e.value.breadcrumbs == 'List[]->dataclass.User[\'login\']->str'
+
+
+@dataclass
+class Event:
+    name: str
+    dates: List[date]
+
+
+def test_error_path_construction():
+    with pytest.raises(SerializerError) as e:
+        create_serializer(Dict[str, Event])
+    assert e.value.path == ('dates',)
+    assert str(e.value).startswith('Dict[value]->dataclass.Event[\'dates\']->List[]: '
+                                   'serializer class for typing \'<class \'datetime.date\'>\' is not defined.')
+
+
+def test_error_pickle():
+    with pytest.raises(SerializerError) as e:
+        create_serializer(List[User]).deserialize([{'id': '1', 'login': 'feleks', 'friend_ids': []}])
+
+    error = pickle.loads(pickle.dumps(e.value))
+    assert type(error) is SerializerError
+    assert error.path == e.value.path == (0, 'id')
+    assert str(error) == str(e.value)
@@ -0,0 +1,167 @@
+import copy
+import json
+import pickle
+import pytest
+from typing import List, Dict, Tuple, Optional, Union
+from dataclasses import dataclass, field
+
+from serializer import create_serializer, Discriminated
+from serializer.exceptions import SerializerError
+
+
+@dataclass(frozen=True)
+class Company:
+    name: str
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    company: Company
+    friend: Optional['User'] = None
+    tags: List[str] = field(default_factory=list)
+
+
+@dataclass
+class UserStorage:
+    users: Dict[int, User]
+    admins: List[User]
+
+
+def create_storage() -> UserStorage:
+    company = Company('Acme')
+    alice = User(1, 'alice', company)
+    bob = User(2, 'bob', company, alice)
+    # A cycle.
+    alice.friend = bob
+    return UserStorage({1: alice, 2: bob}, [bob])
+
+
+def check_shared(storage: UserStorage):
+    alice, bob = storage.users[1], storage.users[2]
+    assert alice.friend is bob
+    assert bob.friend is alice
+    assert storage.admins[0] is bob
+    assert alice.company is bob.company
+
+
+@pytest.mark.parametrize('positional', [False, True])
+def test_graph(positional):
+    serializer = create_serializer(UserStorage, graph=True, positional=positional)
+    storage = create_storage()
+
+    serialized = serializer.serialize(storage)
+    if not positional:
+        assert serialized == {'$id': 0, 'users': {
+            1: {'$id': 1, 'id': 1, 'login': 'alice', 'company': {'$id': 2, 'name': 'Acme'}, 'friend': {
+                '$id': 3, 'id': 2, 'login': 'bob', 'company': {'$ref': 2}, 'friend': {'$ref': 1}, 'tags': []
+            }, 'tags': []},
+            2: {'$ref': 3},
+        }, 'admins': [{'$ref': 3}]}
+
+    assert serializer.serialize(storage, trusted=True) == serialized
+    assert serializer.serialize_json(storage) == json.dumps(serialized)
+    assert ''.join(serializer.iter_serialize_json(storage, chunk_size=1)) == json.dumps(serialized)
+    serializer.validate(serialized)
+
+    check_shared(serializer.deserialize(serialized))
+    check_shared(serializer.deserialize_lazy(serialized))
+    check_shared(serializer.deserialize_binary(serializer.serialize_binary(storage)))
+    # Ids are assigned per call.
+    assert serializer.serialize_many([storage, storage]) == [serialized, serialized]
+    check_shared(serializer.deserialize_many([serialized, serialized])[1])
+
+
+def test_graph_stream():
+    serializer = create_serializer(List[User], graph=True)
+    storage = create_storage()
+
+    users = list(serializer.iter_deserialize_json([serializer.serialize_json([storage.users[1], storage.users[2]])]))
+    assert users[0].friend is users[1] and users[1].friend is users[0]
+
+
+def test_graph_plain_data():
+    # Data without ids is accepted, instances are not shared.
+    serializer = create_serializer(List[User], graph=True)
+    data = [{'id': 1, 'login': 'alice', 'company': {'name': 'Acme'}}] * 2
+    users = serializer.deserialize(data)
+    assert users[0] == users[1] == User(1, 'alice', Company('Acme'))
+    assert users[0] is not users[1]
+
+    # Recursive typings work without graph mode, for trees.
+    tree_serializer = create_serializer(User)
+    bob = User(2, 'bob', Company('Acme'), User(1, 'alice', Company('Acme')))
+    assert tree_serializer.deserialize(tree_serializer.serialize(bob)) == bob
+    assert pickle.loads(pickle.dumps(serializer)).deserialize(data) == users
+
+
+def test_graph_diff_patch():
+    serializer = create_serializer(UserStorage, graph=True)
+    old = create_storage()
+    new = copy.deepcopy(old)
+    carol = User(3, 'carol', new.users[1].company, new.users[1])
+    new.users[3] = carol
+    new.admins.append(carol)
+    new.users[2].login = 'robert'
+
+    # Equal cyclic graphs.
+    assert serializer.diff(old, copy.deepcopy(old)) == []
+
+    patch = serializer.diff(old, new)
+    # Instances are diffed once, at their first path.
+    assert ['set', ['users', 1, 'friend', 'login'], 'robert'] in patch
+
+    replica = copy.deepcopy(old)
+    patched = serializer.apply_patch(replica, json.loads(json.dumps(patch)))
+    assert patched.users[2].login == 'robert'
+    assert patched.users[1].friend is patched.users[2]
+    # Shared within the patch: carol is written once.
+    assert patched.users[3] is patched.admins[1]
+    assert patched.users[3].friend.login == 'alice'
+
+
+def test_graph_errors():
+    with pytest.raises(SerializerError):
+        create_serializer(User, graph=True, memo='call')
+    # References carry no discriminator.
+    with pytest.raises(SerializerError):
+        create_serializer(Discriminated[Union[User, Company], 'kind'], graph=True)
+
+    serializer = create_serializer(List[User], graph=True)
+    alice = {'$id': 0, 'id': 1, 'login': 'alice', 'company': {'name': 'Acme'}}
+    for data in [
+        [{'$ref': 0}],
+        [alice, {'$ref': 5}],
+        [alice, {'$ref': '0'}],
+        [alice, alice],
+        [{'$id': 'a', 'id': 1, 'login': 'alice', 'company': {'name': 'Acme'}}],
+    ]:
+        with pytest.raises(SerializerError):
+            serializer.deserialize(data)
+        with pytest.raises(SerializerError):
+            serializer.validate(data)
+
+    with pytest.raises(SerializerError) as e:
+        serializer.deserialize([alice, {'$id': 1, 'id': 2, 'login': 5, 'company': {'$ref': 0}}])
+    assert e.value.path == (1, 'login')
+
+    with pytest.raises(SerializerError) as e:
+        serializer.serialize([User(1, 'alice', Company(5))])
+    assert e.value.path == (0, 'company', 'name')
+
+
+def test_graph_union_trials():
+    # The first member writes alice, then fails on the second item: the next one writes her again with the same id.
+    serializer = create_serializer(Union[Tuple[User, int], Tuple[User, str]], graph=True)
+    alice = User(1, 'alice', Company('Acme'))
+    instance = (alice, 'x')
+
+    serialized = serializer.serialize(instance)
+    assert serialized == [{'$id': 0, 'id': 1, 'login': 'alice', 'company': {'$id': 1, 'name': 'Acme'},
+                           'friend': None, 'tags': []}, 'x']
+    assert serializer.serialize_json(instance) == json.dumps(serialized)
+    serializer.validate_instance(instance)
+    serializer.validate(serialized)
+    assert serializer.deserialize(serialized) == instance
+    assert serializer.deserialize_binary(serializer.serialize_binary(instance)) == instance
@@ -0,0 +1,132 @@
+import json
+import sys
+import pytest
+from typing import List, Dict, Tuple, Union, NamedTuple, Any
+from dataclasses import dataclass
+
+from serializer import create_serializer, Interned, Discriminated
+from serializer.exceptions import SerializerError
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, str]
+
+
+class Badge(NamedTuple):
+    title: str
+
+
+@dataclass
+class User:
+    login: str
+    city: Interned[str]
+    location: Tuple[float, float]
+    attributes: List[UserAttribute]
+
+
+@dataclass
+class Group:
+    tags: Interned[Tuple[str, List[int]]]
+
+
+users_json = json.dumps([
+    {'login': 'alice', 'city': 'Paris', 'location': [1.5, 2.5],
+     'attributes': [{'name': 'age', 'value': 30}, {'name': 'team', 'value': 'red'}]}
+    for _ in range(3)
+])
+
+
+def test_intern_call():
+    serializer = create_serializer(List[User], intern='call')
+
+    users = serializer.deserialize_json(users_json)
+    assert users == create_serializer(List[User]).deserialize_json(users_json)
+    assert users[0].login is users[2].login
+    assert users[0].location is users[2].location
+    assert users[0].attributes[1] is users[2].attributes[1]
+    assert users[0].attributes[1].value is users[2].attributes[1].value
+
+    # Pools do not outlive calls.
+    assert serializer.deserialize_json(users_json)[0].login is not users[0].login
+
+    for deserialized in [
+        serializer.deserialize_binary(serializer.serialize_binary(users)),
+        list(serializer.iter_deserialize_json(users_json)),
+        serializer.deserialize_many([json.loads(users_json)])[0],
+        create_serializer(List[User], compile=True, intern='call').deserialize_json(users_json),
+    ]:
+        assert deserialized == users
+        assert deserialized[0].login is deserialized[2].login
+        assert deserialized[0].attributes[0] is deserialized[2].attributes[0]
+
+
+def test_intern_sys():
+    users = create_serializer(List[User], intern='sys').deserialize_json(users_json)
+
+    assert users[0].login is sys.intern('alice')
+    assert users[1].attributes[1].value is sys.intern('red')
+    assert users[0].location is users[2].location
+
+
+def test_interned_fields():
+    users = create_serializer(List[User]).deserialize_json(users_json)
+
+    assert users[0].city is users[2].city
+    assert users[0].login is not users[2].login
+    assert users[0].location is not users[2].location
+    assert create_serializer(User).serialize(users[0])['city'] == 'Paris'
+
+    # Unhashable values are kept as they are.
+    groups = create_serializer(List[Group]).deserialize([{'tags': ['a', [1]]}, {'tags': ['a', [1]]}])
+    assert groups == [Group(('a', [1])), Group(('a', [1]))]
+
+
+def test_intern_errors():
+    with pytest.raises(SerializerError):
+        create_serializer(User, intern='global')
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(List[User], intern='call').deserialize([
+            {'login': 1, 'city': 'Paris', 'location': [1.5, 2.5], 'attributes': []}
+        ])
+    assert e.value.path == (0, 'login')
+
+    members = create_serializer(List[Discriminated[Union[UserAttribute, Badge], 'kind']], intern='call')
+    badges = members.deserialize([{'kind': 'Badge', 'title': 'a'}] * 2)
+    assert badges == [Badge('a')] * 2
+    # Discriminated members are interned too.
+    assert badges[0] is badges[1]
+    badges = members.deserialize_binary(members.serialize_binary([Badge('a'), Badge('a')]))
+    assert badges[0] is badges[1]
+    assert create_serializer(Dict[str, Interned[int]]).deserialize({'a': 1}) == {'a': 1}
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+class Size(NamedTuple):
+    width: int
+    height: int
+
+
+@dataclass
+class Shape:
+    point: Point
+    size: Size
+    pair: Tuple[int, int]
+
+
+def test_intern_exact_types():
+    serializer = create_serializer(Shape, intern='call')
+    shape = serializer.deserialize({'point': {'x': 1, 'y': 2}, 'size': {'width': 1, 'height': 2}, 'pair': [1, 2]})
+    assert type(shape.point) is Point and type(shape.size) is Size and type(shape.pair) is tuple
+
+    pairs = create_serializer(List[Tuple[Any, Any]], intern='call').deserialize([[0.0, 1.0], [0, True], [0, 1]])
+    assert [[type(item) for item in pair] for pair in pairs] == [[float, float], [int, bool], [int, int]]
+
+    singles = create_serializer(List[Tuple[Any]], intern='call').deserialize([[1], [True], [1.0], [1]])
+    assert [type(single[0]) for single in singles] == [int, bool, float, int]
+    assert singles[0] is singles[3]
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from enum import Enum
+from dataclasses import dataclass
+
+from serializer import create_serializer
+from serializer.exceptions import SerializerError
+
+
+class UserRank(Enum):
+    user = 0
+    admin = 1
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+users = [User(i, 'userф{}'.format(i), UserRank(i % 2), list(range(i % 5))) for i in range(500)]
+lines = ''.join(json.dumps(create_serializer(User).serialize(user)) + '\n' for user in users).encode('ascii')
+
+
+class Writer:
+    def __init__(self):
+        self.chunks = list()
+        self.drains = 0
+
+    def write(self, data: bytes):
+        self.chunks.append(data)
+
+    async def drain(self):
+        self.drains += 1
+
+
+async def collect(async_iterator):
+    return [item async for item in async_iterator]
+
+
+async def iter_chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+        await asyncio.sleep(0)
+
+
+def test_adeserialize_lines():
+    serializer = create_serializer(User)
+
+    async def from_stream_reader():
+        reader = asyncio.StreamReader()
+        reader.feed_data(lines)
+        reader.feed_eof()
+        return await collect(serializer.adeserialize_lines(reader, chunk_size=1000))
+
+    assert asyncio.run(from_stream_reader()) == users
+
+    for size in [1, 7, 100000]:
+        assert asyncio.run(collect(serializer.adeserialize_lines(iter_chunks(lines, size)))) == users
+
+    # Blank lines are skipped, the last line may have no line break.
+    data = b'\n' + lines.replace(b'\n', b'\r\n\n').rstrip()
+    assert asyncio.run(collect(serializer.adeserialize_lines(iter_chunks(data, 333)))) == users
+
+    with ThreadPoolExecutor(2) as executor:
+        assert asyncio.run(collect(serializer.adeserialize_lines(iter_chunks(lines, 5000), executor))) == users
+
+
+def test_adeserialize_lines_errors():
+    serializer = create_serializer(User)
+    data = lines + b'{"id": "1"}\n'
+
+    with pytest.raises(SerializerError):
+        asyncio.run(collect(serializer.adeserialize_lines(iter_chunks(data, 1000))))
+
+    with pytest.raises(json.JSONDecodeError):
+        asyncio.run(collect(serializer.adeserialize_lines(iter_chunks(b'{"id": 1\n', 1000))))
+
+
+def test_aserialize_lines():
+    serializer = create_serializer(User)
+
+    async def aiter_users():
+        for user in users:
+            yield user
+
+    writer = Writer()
+    asyncio.run(serializer.aserialize_lines(writer, aiter_users(), batch_size=100))
+    assert b''.join(writer.chunks) == lines
+    assert writer.drains == 5
+
+    writer = Writer()
+    with ThreadPoolExecutor(2) as executor:
+        asyncio.run(serializer.aserialize_lines(writer, users, executor))
+    assert asyncio.run(collect(serializer.adeserialize_lines(iter_chunks(b''.join(writer.chunks), 4096)))) == users
@@ -0,0 +1,128 @@
+import io
+import json
+import pytest
+from typing import List, Dict, Tuple, Union, Optional, NamedTuple, Any
+from enum import Enum, IntEnum
+from dataclasses import dataclass
+
+from serializer import create_serializer
+from serializer.exceptions import SerializerError
+
+
+class UserRank(IntEnum):
+    user = 0
+    admin = 1
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    password: str
+    rank: UserRank
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, float, str]
+
+
+@dataclass
+class UserStorage:
+    users: Dict[int, User]
+    user_location_coordinates: Dict[int, Tuple[float, float]]
+    user_additional_attributes: Dict[int, List[UserAttribute]]
+
+
+user_storage = UserStorage(
+    users={
+        i: User(i, 'userф{}'.format(i), '"228"', UserRank(i % 2), list(range(i % 5)), None if i % 2 else 'a.png')
+        for i in range(100)
+    },
+    user_location_coordinates={i: (i / 3, float('inf')) for i in range(100)},
+    user_additional_attributes={i: [UserAttribute('height', 1.9), UserAttribute('name', 'x')] for i in range(10)}
+)
+
+
+def test_iter_serialize_json():
+    user_storage_serializer = create_serializer(UserStorage)
+    expected = user_storage_serializer.serialize_json(user_storage)
+
+    chunks = list(user_storage_serializer.iter_serialize_json(user_storage, chunk_size=1024))
+    assert len(chunks) > 1
+    assert ''.join(chunks) == expected
+
+    for typing, instance in [
+        (Dict[float, int], {1.5: 1, float('nan'): 2}),
+        (Dict[bool, List[Any]], {True: [None, {'a': 1}], False: []}),
+        (Dict[Optional[int], str], {None: 'a', 1: 'b'}),
+        (Tuple[()], ()),
+        (List[Dict[str, str]], [{}, {'\n': '☃'}]),
+    ]:
+        serializer = create_serializer(typing)
+        assert ''.join(serializer.iter_serialize_json(instance)) == serializer.serialize_json(instance)
+
+
+def test_serialize_json_to():
+    user_storage_serializer = create_serializer(UserStorage)
+    expected = user_storage_serializer.serialize_json(user_storage)
+
+    text_fp = io.StringIO()
+    user_storage_serializer.serialize_json_to(text_fp, user_storage, chunk_size=100)
+    assert text_fp.getvalue() == expected
+
+    binary_fp = io.BytesIO()
+    user_storage_serializer.serialize_json_to(binary_fp, user_storage)
+    assert binary_fp.getvalue() == expected.encode('ascii')
+
+
+def test_serialize_json_to_errors():
+    users_serializer = create_serializer(Dict[int, User])
+
+    with pytest.raises(SerializerError) as e:
+        users_serializer.serialize_json_to(io.StringIO(), {1: user_storage.users[1], 2: User(2, 'a', 'b', 'c', [])})
+    assert e.value.path == (2, 'rank')
+    assert e.value.breadcrumbs == 'Dict[value]->dataclass.User[\'rank\']->enum.UserRank'
+
+
+class Color(Enum):
+    red = 'r'
+    snowman = '☃'
+
+
+def test_serialize_json_matches_json_dumps():
+    for typing, instance in [
+        (UserStorage, user_storage),
+        (List[float], [1.5, float('nan'), float('inf'), -float('inf'), 1e300]),
+        (List[int], [1, True, UserRank.admin]),
+        (List[str], ['', '"', '\n', 'ф☃']),
+        (List[Color], [Color.red, Color.snowman]),
+        (Dict[float, int], {1.5: 1, float('nan'): 2}),
+        (Dict[Optional[int], str], {None: 'a', 1: 'b'}),
+        (Dict[bool, Optional[Color]], {True: Color.red, False: None}),
+        (Dict[Color, List[Optional[bool]]], {Color.snowman: [True, None]}),
+        (Dict[str, Any], {}),
+        (List[Union[int, List[int], str]], [1, [2, 3], 'a', []]),
+        (Tuple[int, Optional[str]], (1, None)),
+        (Tuple[()], ()),
+        (Any, {'a': [1, None]}),
+    ]:
+        serializer = create_serializer(typing)
+        assert serializer.serialize_json(instance) == json.dumps(serializer.serialize(instance))
+        assert create_serializer(typing, compile=True).serialize_json(instance) == serializer.serialize_json(instance)
+
+
+def test_serialize_json_errors():
+    with pytest.raises(SerializerError) as e:
+        create_serializer(List[int]).serialize_json([1, 2, '3'])
+    assert e.value.path == (2,)
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(List[Union[int, List[int]]]).serialize_json([1, [2, 'a']])
+    assert e.value.path == (1,)
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(UserStorage).serialize_json(UserStorage({1: User(1, 'a', 'b', 'c', [])}, {}, {}))
+    assert e.value.path == ('users', 1, 'rank')
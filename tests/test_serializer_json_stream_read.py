@@ -0,0 +1,70 @@
+import io
+import json
+import pytest
+from typing import List, Dict, Optional
+from dataclasses import dataclass
+
+from serializer import create_serializer
+from serializer.exceptions import SerializerError
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+users = [User(i, 'login "{}" ☃'.format(i), list(range(i % 7)), None if i % 2 else 'a.png') for i in range(200)]
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_iter_deserialize_json_list():
+    users_serializer = create_serializer(List[User])
+    users_json = users_serializer.serialize_json(users)
+
+    assert list(users_serializer.iter_deserialize_json(io.StringIO(users_json), chunk_size=16)) == users
+    assert list(users_serializer.iter_deserialize_json(io.BytesIO(users_json.encode()), chunk_size=7)) == users
+
+    # Multibyte characters split between chunks.
+    users_bytes = json.dumps(users_serializer.serialize(users), ensure_ascii=False, indent=2).encode()
+    assert list(users_serializer.iter_deserialize_json(_chunks(users_bytes, 5))) == users
+
+    assert list(create_serializer(List[int]).iter_deserialize_json(['[1', '2, 3', '4 , 5', ']'])) == [12, 34, 5]
+    assert list(create_serializer(List[int]).iter_deserialize_json([' [ ] '])) == []
+
+
+def test_iter_deserialize_json_dict():
+    users_serializer = create_serializer(Dict[int, User])
+    users_dict = {user.id: user for user in users}
+    users_json = users_serializer.serialize_json(users_dict)
+
+    items = users_serializer.iter_deserialize_json(io.StringIO(users_json), chunk_size=100)
+    assert not isinstance(items, (list, dict))
+    assert dict(items) == users_dict
+
+    assert list(create_serializer(Dict[str, float]).iter_deserialize_json(['{"a": 1.', '5, "b"', ':2.0}'])) == \
+        [('a', 1.5), ('b', 2.0)]
+
+
+def test_iter_deserialize_json_errors():
+    users_serializer = create_serializer(List[User])
+    users_serialized = users_serializer.serialize(users[:5])
+    users_serialized[3]['friend_ids'] = [1, 'x']
+
+    items = users_serializer.iter_deserialize_json(io.StringIO(json.dumps(users_serialized)))
+    assert next(items) == users[0]
+    with pytest.raises(SerializerError) as e:
+        list(items)
+    assert e.value.path == (3, 'friend_ids', 1)
+
+    for invalid_json in ['[1, 2', '[1 2]', '{"a": 1}', '[1, 2] 3', '']:
+        with pytest.raises(json.JSONDecodeError):
+            list(create_serializer(List[int]).iter_deserialize_json([invalid_json]))
+
+    with pytest.raises(SerializerError):
+        create_serializer(User).iter_deserialize_json(io.StringIO('{}'))
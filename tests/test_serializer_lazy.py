@@ -0,0 +1,87 @@
+import copy
+import pickle
+import pytest
+from typing import List, Dict, Optional
+from dataclasses import dataclass, field, asdict, FrozenInstanceError
+
+from serializer import create_serializer
+from serializer.exceptions import SerializerError
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    friend_ids: List[int] = field(default_factory=list)
+    avatar_url: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class UserStorage:
+    users: Dict[int, User]
+    admins: List[User]
+
+
+storage = UserStorage({1: User(1, 'alice', [2]), 2: User(2, 'bob')}, [User(1, 'alice', [2])])
+storage_serialized = create_serializer(UserStorage).serialize(storage)
+
+
+@pytest.mark.parametrize('compile', [False, True])
+def test_deserialize_lazy(compile):
+    serializer = create_serializer(UserStorage, compile=compile)
+
+    lazy_storage = serializer.deserialize_lazy(storage_serialized)
+    assert isinstance(lazy_storage, UserStorage)
+    assert lazy_storage.users[2].login == 'bob'
+    assert lazy_storage.users[2].friend_ids == []
+    assert lazy_storage.users[1] is lazy_storage.users[1]
+    assert isinstance(lazy_storage.admins[0], User)
+
+    assert lazy_storage == storage
+    assert storage == lazy_storage
+    assert type(lazy_storage.materialize()) is UserStorage
+    assert lazy_storage.materialize() == storage
+    assert asdict(lazy_storage) == asdict(storage)
+    assert type(pickle.loads(pickle.dumps(lazy_storage))) is UserStorage
+    assert copy.deepcopy(lazy_storage) == storage
+
+    positional_serializer = create_serializer(UserStorage, positional=True)
+    lazy_storage = positional_serializer.deserialize_lazy(positional_serializer.serialize(storage))
+    assert lazy_storage.users[1].friend_ids == [2]
+    assert lazy_storage == storage
+
+
+def test_deserialize_lazy_assign():
+    user = create_serializer(User).deserialize_lazy({'id': 1, 'login': 'alice'})
+    user.login = 'carol'
+    assert user.login == 'carol'
+    assert user.materialize() == User(1, 'carol')
+
+    lazy_storage = create_serializer(UserStorage).deserialize_lazy(storage_serialized)
+    with pytest.raises(FrozenInstanceError):
+        lazy_storage.admins = []
+
+
+def test_deserialize_lazy_errors():
+    serializer = create_serializer(UserStorage)
+
+    with pytest.raises(SerializerError):
+        serializer.deserialize_lazy({'users': {}})
+
+    lazy_storage = serializer.deserialize_lazy({'users': {1: {'id': '1', 'login': 'alice'}}, 'admins': []})
+    assert lazy_storage.admins == []
+    # Only the shape is checked before fields are read.
+    user = lazy_storage.users[1]
+    with pytest.raises(SerializerError) as e:
+        user.id
+    assert e.value.path == ('id',)
+
+    with pytest.raises(SerializerError) as e:
+        lazy_storage.materialize()
+    assert e.value.path == ('users', 1, 'id')
+
+    with pytest.raises(SerializerError) as e:
+        serializer.deserialize_lazy({'users': [], 'admins': []}).users
+    assert e.value.path == ('users',)
+
+    assert create_serializer(List[int]).deserialize_lazy([1, 2]) == [1, 2]
@@ -0,0 +1,106 @@
+import pytest
+from typing import List, Dict, Tuple, Union, Optional, NamedTuple, Any
+from enum import IntEnum
+from dataclasses import dataclass
+
+from serializer import create_serializer
+from serializer.exceptions import SerializerError
+
+
+class UserRank(IntEnum):
+    user = 0
+    admin = 1
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, float, str]
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    location: Tuple[float, float]
+    attributes: Dict[str, UserAttribute]
+    extra: Any
+    avatar_url: Optional[str] = None
+
+
+users = [
+    User(i, 'user{}'.format(i), UserRank(i % 2), list(range(i)), (i / 2, i / 3),
+         {'height': UserAttribute('height', 1.5 + i)}, [i], None if i % 3 else 'avatar.png')
+    for i in range(50)
+]
+
+
+def test_serialize_many():
+    user_serializer = create_serializer(User)
+
+    users_serialized = user_serializer.serialize_many(users)
+    assert users_serialized == [user_serializer.serialize(user) for user in users]
+    assert user_serializer.deserialize_many(users_serialized) == users
+    assert user_serializer.deserialize_many(iter(users_serialized)) == users
+
+    assert user_serializer.serialize_many([]) == []
+    assert user_serializer.deserialize_many([]) == []
+
+
+def test_serialize_many_containers():
+    for typing, instances in [
+        (int, [1, 2, 3]),
+        (List[List[int]], [[[1], []], [], [[2, 3]]]),
+        (Dict[int, List[str]], [{1: ['a']}, {}, {2: [], 3: ['b', 'c']}]),
+        (Tuple[int, str], [(1, 'a'), (2, 'b')]),
+        (Tuple[()], [(), ()]),
+        (Union[int, str], [1, 'a']),
+        (List[UserRank], [[UserRank.user, UserRank.admin], []]),
+    ]:
+        serializer = create_serializer(typing)
+        serialized = serializer.serialize_many(instances)
+
+        assert serialized == [serializer.serialize(instance) for instance in instances]
+        assert serializer.deserialize_many(serialized) == [serializer.deserialize(item) for item in serialized]
+
+
+def test_serialize_many_errors():
+    user_serializer = create_serializer(User)
+    users_serialized = user_serializer.serialize_many(users)
+
+    with pytest.raises(SerializerError) as e:
+        user_serializer.serialize_many(users[:3] + [users_serialized[3]])
+    # Paths start at the index of the invalid item in the batch.
+    assert e.value.path == (3,)
+    assert e.value.breadcrumbs == 'dataclass.User[]->dataclass.User'
+
+    users_serialized[7]['friend_ids'] = [1, '2']
+    users_serialized[9]['rank'] = 'moderator'
+    with pytest.raises(SerializerError) as e:
+        user_serializer.deserialize_many(users_serialized)
+    assert e.value.path == (7, 'friend_ids', 1)
+
+    # Indexes of iter_*_many count from the start of the iterable, not of the batch.
+    with pytest.raises(SerializerError) as e:
+        list(user_serializer.iter_deserialize_many(users_serialized, batch_size=4))
+    assert e.value.path == (7, 'friend_ids', 1)
+    with pytest.raises(SerializerError) as e:
+        list(user_serializer.iter_serialize_many(users[:5] + [users_serialized[0]], batch_size=4))
+    assert e.value.path == (5,)
+
+    del users_serialized[7]
+    with pytest.raises(SerializerError) as e:
+        user_serializer.deserialize_many(users_serialized)
+    assert 'Invalid enum member \'moderator\'' in str(e.value)
+
+
+def test_iter_serialize_many():
+    user_serializer = create_serializer(User)
+
+    users_serialized = user_serializer.iter_serialize_many(iter(users), batch_size=7)
+    assert not isinstance(users_serialized, list)
+
+    users_serialized = list(users_serialized)
+    assert users_serialized == user_serializer.serialize_many(users)
+    assert list(user_serializer.iter_deserialize_many(users_serialized, batch_size=7)) == users
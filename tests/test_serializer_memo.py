@@ -0,0 +1,119 @@
+import gc
+import json
+import pytest
+from typing import List, NamedTuple, Union
+from dataclasses import dataclass
+
+from serializer import create_serializer, Discriminated
+from serializer.exceptions import SerializerError
+from serializer.memo import weak_outputs
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, str]
+
+
+@dataclass(frozen=True)
+class Address:
+    city: str
+    street: str
+
+
+@dataclass
+class User:
+    login: str
+    address: Address
+    attributes: List[UserAttribute]
+
+
+age = UserAttribute('age', 30)
+address = Address('Paris', 'Rue de Rivoli')
+users = [User('user{}'.format(i), address, [age, UserAttribute('id', i), age]) for i in range(3)]
+
+
+@pytest.mark.parametrize('compile', [False, True])
+def test_memo_call(compile):
+    serializer = create_serializer(List[User], compile=compile, memo='call')
+    plain_serializer = create_serializer(List[User])
+
+    serialized = serializer.serialize(users)
+    assert serialized == plain_serializer.serialize(users)
+    assert serialized[0]['address'] is serialized[2]['address']
+    assert serialized[0]['attributes'][0] is serialized[1]['attributes'][2]
+    # Memos do not outlive calls.
+    assert serializer.serialize(users)[0]['address'] is not serialized[0]['address']
+
+    assert serializer.serialize(users, trusted=True) == serialized
+    assert serializer.serialize_many([users, users]) == [serialized, serialized]
+    assert serializer.serialize_json(users) == json.dumps(serialized)
+    assert ''.join(serializer.iter_serialize_json(users, chunk_size=10)) == json.dumps(serialized)
+    assert serializer.serialize_binary(users) == plain_serializer.serialize_binary(users)
+
+
+def test_memo_weak():
+    serializer = create_serializer(List[User], memo='weak')
+
+    serialized = serializer.serialize(users)
+    # Serialized values are mutable, they are only shared within a call.
+    assert serializer.serialize(users)[0]['address'] is not serialized[0]['address']
+    assert serializer.serialize_json(users) == serializer.serialize_json(users) == json.dumps(serialized)
+    assert serializer.serialize_binary(users) == serializer.serialize_binary(users)
+
+    address_serializer = create_serializer(Address, memo='weak')
+    outputs = weak_outputs(address_serializer.serializer)
+    size = len(outputs)
+    other_address = Address('Rome', 'Via del Corso')
+    assert address_serializer.serialize_json(other_address) == '{"city": "Rome", "street": "Via del Corso"}'
+    assert len(outputs) == size + 1
+    del other_address
+    gc.collect()
+    assert len(outputs) == size
+
+
+@dataclass(frozen=True)
+class Tags:
+    names: List[str]
+
+
+def test_memo_weak_mutable_fields():
+    serializer = create_serializer(Tags, memo='weak')
+    tags = Tags(['a'])
+    assert serializer.serialize_json(tags) == '{"names": ["a"]}'
+
+    # Frozen dataclasses holding lists are only memoized per call.
+    tags.names.append('b')
+    assert serializer.serialize(tags) == {'names': ['a', 'b']}
+    assert serializer.serialize_json(tags) == '{"names": ["a", "b"]}'
+    assert weak_outputs(serializer.serializer) == {}
+
+
+def test_memo_errors():
+    with pytest.raises(SerializerError):
+        create_serializer(User, memo='global')
+
+    serializer = create_serializer(List[User], memo='call')
+    with pytest.raises(SerializerError) as e:
+        serializer.serialize([users[0], User('bob', Address('Paris', 1), [])])
+    assert e.value.path == (1, 'address', 'street')
+
+    members_serializer = create_serializer(List[Discriminated[Union[Address, UserAttribute], 'kind']], memo='call')
+    assert members_serializer.serialize([address]) == [{'kind': 'Address', 'city': 'Paris', 'street': 'Rue de Rivoli'}]
+
+
+@dataclass
+class Members:
+    address: Address
+    members: List[Discriminated[Union[Address, UserAttribute], 'kind']]
+
+
+def test_memo_discriminated():
+    serializer = create_serializer(Members, memo='call')
+    members = Members(address, [address, age, address])
+
+    serialized = serializer.serialize(members)
+    # Discriminated members are memoized, the discriminator is not added to outputs shared with other fields.
+    assert serialized == create_serializer(Members).serialize(members)
+    assert serialized['address'] == {'city': 'Paris', 'street': 'Rue de Rivoli'}
+    assert serialized['members'][0] is not serialized['address']
+    assert serializer.deserialize_binary(serializer.serialize_binary(members)) == members
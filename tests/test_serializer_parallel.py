@@ -0,0 +1,90 @@
+import pickle
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Union, Optional
+from enum import Enum
+from dataclasses import dataclass
+
+from serializer import create_serializer, Discriminated
+from serializer.exceptions import SerializerError
+from serializer.serializers import ListSerializer
+
+
+class UserRank(Enum):
+    user = 0
+    admin = 1
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+@dataclass
+class Circle:
+    radius: float
+
+
+@dataclass
+class Square:
+    side: float
+
+
+users = [User(i, 'user{}'.format(i), UserRank(i % 2), list(range(i % 7))) for i in range(1000)]
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+def test_serializer_pickle():
+    for serializer in [
+        create_serializer(List[User]),
+        create_serializer(List[User], compile=True),
+        create_serializer(Dict[int, User], positional=True, trusted=True),
+        create_serializer(List[Discriminated[Union[Circle, Square], 'kind']]),
+    ]:
+        assert pickle.loads(pickle.dumps(serializer)) is serializer
+
+    with pytest.raises(TypeError):
+        pickle.dumps(ListSerializer(List[int]))
+
+
+def test_parallel(executor):
+    serializer = create_serializer(List[User])
+    serialized = serializer.serialize(users)
+
+    assert serializer.serialize_parallel(users, executor=executor, chunk_size=64) == serialized
+    assert serializer.deserialize_parallel(serialized, executor=executor, chunk_size=64) == users
+    assert serializer.deserialize_parallel(serialized, workers=2) == users
+    assert serializer.deserialize_parallel([], executor=executor) == []
+
+    users_by_id = {user.id: user for user in users}
+    dict_serializer = create_serializer(Dict[int, User], compile=True)
+    serialized = dict_serializer.serialize(users_by_id)
+    assert dict_serializer.deserialize_parallel(serialized, executor=executor, chunk_size=100) == users_by_id
+    assert list(dict_serializer.serialize_parallel(users_by_id, executor=executor, chunk_size=100)) == \
+        list(serialized)
+
+
+def test_parallel_errors(executor):
+    serializer = create_serializer(List[User])
+    serialized = serializer.serialize(users)
+    serialized[700]['friend_ids'] = [1, '2']
+
+    with pytest.raises(SerializerError) as e:
+        serializer.deserialize_parallel(serialized, executor=executor, chunk_size=64)
+    assert e.value.path == (700, 'friend_ids', 1)
+
+    with pytest.raises(SerializerError) as e:
+        serializer.deserialize_parallel({'a': 1}, executor=executor)
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(User).deserialize_parallel(serialized[0], executor=executor)
+    assert 'only List and Dict' in str(e.value)
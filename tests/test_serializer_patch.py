@@ -0,0 +1,127 @@
+import copy
+import json
+import pytest
+from typing import List, Dict, Tuple, Optional, NamedTuple, Any
+from enum import Enum
+from dataclasses import dataclass, field
+
+from serializer import create_serializer
+from serializer.exceptions import SerializerError
+
+
+class UserRank(Enum):
+    user = 0
+    admin = 1
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: int
+
+
+@dataclass(frozen=True)
+class Settings:
+    theme: str
+    notifications: bool = True
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    location: Tuple[float, float]
+    attributes: List[UserAttribute] = field(default_factory=list)
+    avatar_url: Optional[str] = None
+
+
+@dataclass
+class UserStorage:
+    users: Dict[int, User]
+    admins: Dict[UserRank, List[int]]
+    settings: Settings
+
+
+def create_storage() -> UserStorage:
+    return UserStorage(
+        users={i: User(i, 'user{}'.format(i), UserRank.user, list(range(i)), (i / 2, 0.0), [UserAttribute('age', i)])
+               for i in range(100)},
+        admins={UserRank.admin: [1, 2]},
+        settings=Settings('dark'),
+    )
+
+
+storage_serializer = create_serializer(UserStorage)
+
+
+def test_diff_patch():
+    old = create_storage()
+    new = create_storage()
+    new.users[1].login = 'alice'
+    new.users[2].friend_ids.insert(1, 7)
+    new.users[3].friend_ids.pop()
+    new.users[4].location = (2.0, 1.5)
+    new.users[5].attributes[0] = UserAttribute('age', 50)
+    new.users[6].avatar_url = 'a.png'
+    del new.users[7]
+    new.users[100] = User(100, 'bob', UserRank.admin, [], (0.0, 0.0))
+    new.admins[UserRank.admin].append(100)
+    new.settings = Settings('light')
+
+    patch = storage_serializer.diff(old, new)
+    assert ['set', ['users', 1, 'login'], 'alice'] in patch
+    assert ['splice', ['users', 2, 'friend_ids'], 1, 0, [7]] in patch
+    assert ['remove', ['users', 7]] in patch
+    assert ['set', ['users', 4, 'location', 1], 1.5] in patch
+    assert ['set', ['users', 5, 'attributes', 0, 'value'], 50] in patch
+    assert ['splice', ['admins', 'admin'], 2, 0, [100]] in patch
+    assert ['set', ['settings', 'theme'], 'light'] in patch
+    assert len(json.dumps(patch)) < len(storage_serializer.serialize_json(new)) / 20
+
+    patched = storage_serializer.apply_patch(old, json.loads(json.dumps(patch)))
+    assert patched is old
+    assert patched == new
+    assert storage_serializer.diff(old, new) == []
+    assert create_serializer(UserStorage, compile=True).diff(create_storage(), new) == patch
+
+
+def test_diff_replaced_values():
+    old = create_storage()
+
+    assert storage_serializer.diff(old, copy.deepcopy(old)) == []
+    assert create_serializer(int).diff(1, 2) == [['set', [], 2]]
+    assert create_serializer(int).apply_patch(1, [['set', [], 2]]) == 2
+    assert create_serializer(Any).diff(1.0, 1) == [['set', [], 1]]
+    assert create_serializer(Optional[User]).diff(None, old.users[1]) == [
+        ['set', [], create_serializer(User).serialize(old.users[1])]
+    ]
+    # Optional dataclasses are diffed field by field.
+    settings_serializer = create_serializer(Optional[Settings])
+    assert settings_serializer.diff(Settings('dark'), Settings('light')) == [['set', ['theme'], 'light']]
+    assert settings_serializer.apply_patch(Settings('dark'), [['set', ['theme'], 'light']]) == Settings('light')
+    assert create_serializer(List[int]).diff([1, 2, 3], [1, 4, 5, 3]) == [['splice', [], 1, 1, [4, 5]]]
+    assert create_serializer(List[int]).diff([1, 2, 3], [1, 4, 3]) == [['set', [1], 4]]
+
+
+def test_patch_errors():
+    storage = create_storage()
+
+    with pytest.raises(SerializerError):
+        storage_serializer.diff(storage, UserStorage({1: User(1, 2, UserRank.user, [], (0.0, 0.0))}, {}, Settings('')))
+
+    for patch in [
+        [['set', ['users', 1, 'unknown'], 1]],
+        [['set', ['users', 999, 'login'], 'a']],
+        [['remove', ['users', 999]]],
+        [['splice', ['users', 1, 'friend_ids'], 5, 1, []]],
+        [['splice', ['users', 1, 'login'], 0, 1, []]],
+        [['move', ['users']]],
+        {'users': {}},
+    ]:
+        with pytest.raises(SerializerError):
+            storage_serializer.apply_patch(storage, patch)
+
+    with pytest.raises(SerializerError) as e:
+        storage_serializer.apply_patch(storage, [['set', ['users', 1, 'login'], 5]])
+    assert e.value.path == ('users', 1, 'login')
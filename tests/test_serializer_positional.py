@@ -0,0 +1,111 @@
+import json
+import pytest
+from typing import List, Dict, Union, Optional, NamedTuple
+from enum import IntEnum
+from dataclasses import dataclass, field
+
+from serializer import create_serializer, Discriminated
+from serializer.exceptions import SerializerError
+
+
+class UserRank(IntEnum):
+    user = 0
+    admin = 1
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, str]
+    public: bool = True
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    friend_ids: List[int]
+    attributes: List[UserAttribute] = field(default_factory=list)
+    rank: UserRank = UserRank.user
+    avatar_url: Optional[str] = None
+
+
+@dataclass
+class Circle:
+    radius: float
+
+
+@dataclass
+class Square:
+    side: float
+    color: str = 'black'
+
+
+users = [
+    User(1, 'alice', [2], [UserAttribute('age', 30), UserAttribute('city', 'Paris', False)], UserRank.admin, 'a.png'),
+    User(2, 'bob', [], [], UserRank.admin),
+    User(3, 'carol', [1, 2]),
+]
+
+users_positional = [
+    [1, 'alice', [2], [['age', 30], ['city', 'Paris', False]], 'admin', 'a.png'],
+    [2, 'bob', [], [], 'admin'],
+    [3, 'carol', [1, 2], []],
+]
+
+
+def test_positional_serialize():
+    users_serializer = create_serializer(List[User], positional=True)
+
+    assert users_serializer.serialize(users) == users_positional
+    assert users_serializer.deserialize(users_positional) == users
+    assert users_serializer.serialize_many([users]) == [users_positional]
+    assert users_serializer.deserialize_many([users_positional, users_positional[:1]]) == [users, users[:1]]
+
+    users_json = users_serializer.serialize_json(users)
+    assert users_json == json.dumps(users_positional)
+    assert ''.join(users_serializer.iter_serialize_json(users)) == users_json
+    assert users_serializer.deserialize_json(users_json) == users
+    assert len(users_json) < len(create_serializer(List[User]).serialize_json(users)) / 2
+
+    compiled_serializer = create_serializer(List[User], compile=True, positional=True)
+    assert compiled_serializer.serialize(users) == users_positional
+    assert compiled_serializer.deserialize(users_positional) == users
+
+
+def test_positional_accepts_dicts():
+    user_serializer = create_serializer(User, positional=True)
+
+    assert user_serializer.deserialize({'id': 3, 'login': 'carol', 'friend_ids': [1, 2]}) == users[2]
+    assert create_serializer(User).deserialize({'id': 3, 'login': 'carol', 'friend_ids': [1, 2]}) == users[2]
+
+    with pytest.raises(SerializerError):
+        create_serializer(User).deserialize(users_positional[2])
+
+
+def test_positional_errors():
+    user_serializer = create_serializer(User, positional=True)
+
+    with pytest.raises(SerializerError) as e:
+        user_serializer.deserialize([1, 'alice'])
+    assert str(e.value) == 'dataclass.User: expected from 3 to 6 positional fields, got 2.'
+
+    with pytest.raises(SerializerError) as e:
+        user_serializer.deserialize([1, 'alice', [], [], 'admin', None, 'extra'])
+    assert 'got 7' in str(e.value)
+
+    with pytest.raises(SerializerError) as e:
+        create_serializer(List[User], positional=True).deserialize([users_positional[0], [1, 'bob', ['2']]])
+    assert e.value.path == (1, 'friend_ids', 0)
+
+    with pytest.raises(TypeError):
+        create_serializer(User, positionl=True)
+
+
+def test_positional_discriminated_union():
+    shapes_serializer = create_serializer(List[Discriminated[Union[Circle, Square], 'kind']], positional=True)
+
+    shapes = [Circle(1.5), Square(2.0), Square(1.0, 'red')]
+    shapes_positional = [['Circle', 1.5], ['Square', 2.0], ['Square', 1.0, 'red']]
+    assert shapes_serializer.serialize(shapes) == shapes_positional
+    assert shapes_serializer.deserialize(shapes_positional) == shapes
+    assert shapes_serializer.serialize_json(shapes) == json.dumps(shapes_positional)
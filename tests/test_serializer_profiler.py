@@ -0,0 +1,99 @@
+import pickle
+from typing import List, Dict, Union, Optional
+from enum import Enum
+from dataclasses import dataclass
+
+from serializer import create_serializer, Discriminated, SerializerProfiler
+from serializer.serializer_manager import ProfiledSerializer
+
+
+class UserRank(Enum):
+    user = 0
+    admin = 1
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+@dataclass
+class Circle:
+    radius: float
+
+
+@dataclass
+class Square:
+    side: float
+
+
+@dataclass
+class UserStorage:
+    users: Dict[int, User]
+    shapes: List[Discriminated[Union[Circle, Square], 'kind']]
+
+
+storage = UserStorage(
+    {i: User(i, 'user{}'.format(i), UserRank(i % 2), list(range(i % 4))) for i in range(100)},
+    [Circle(1.5), Square(2.0)],
+)
+
+
+def test_profiler_stats():
+    serializer = create_serializer(UserStorage, profile=True)
+
+    with SerializerProfiler() as profiler:
+        serialized = serializer.serialize(storage)
+    assert serialized == create_serializer(UserStorage).serialize(storage)
+
+    stats = profiler.stats
+    assert stats['dataclass.UserStorage'].calls == 1
+    assert stats['dataclass.UserStorage[\'users\']->Dict'].items == 100
+    assert stats['dataclass.UserStorage[\'users\']->Dict[value]->dataclass.User'].calls == 100
+    friend_ids = stats['dataclass.UserStorage[\'users\']->Dict[value]->dataclass.User[\'friend_ids\']->List']
+    assert friend_ids.calls == 100
+    assert friend_ids.items == sum(i % 4 for i in range(100))
+    assert 'dataclass.UserStorage[\'shapes\']->List[]->Discriminated' in stats
+
+    root = stats['dataclass.UserStorage']
+    assert root.self_time <= root.total_time
+    assert all(node.total_time <= root.total_time for node in stats.values())
+
+    report = profiler.report().splitlines()
+    assert report[0].split() == ['path', 'calls', 'total,', 'ms', 'self,', 'ms', 'items', 'bytes']
+    assert len(report) == len(stats) + 1
+    assert len(profiler.report(limit=3).splitlines()) == 4
+
+
+def test_profiler_bytes():
+    serializer = create_serializer(UserStorage, profile=True)
+
+    with SerializerProfiler() as profiler:
+        json_string = serializer.serialize_json(storage)
+        data = serializer.serialize_binary(storage)
+    assert profiler.stats['dataclass.UserStorage'].bytes == len(json_string) + len(data) - len(serializer.binary_header)
+
+    with SerializerProfiler() as profiler:
+        assert serializer.deserialize_binary(data) == storage
+        assert serializer.deserialize_binary(data) == storage
+    assert profiler.stats['dataclass.UserStorage'].calls == 2
+    assert profiler.stats['dataclass.UserStorage'].bytes == 2 * (len(data) - len(serializer.binary_header))
+
+
+def test_profiler_disabled():
+    serializer = create_serializer(UserStorage)
+    assert not isinstance(serializer, ProfiledSerializer)
+    assert not isinstance(serializer.formatter_instances['users'], ProfiledSerializer)
+
+    # Profiled serializers work without an active profiler, and compiled ones are profiled too.
+    profiled_serializer = create_serializer(UserStorage, compile=True, profile=True)
+    assert profiled_serializer.deserialize(profiled_serializer.serialize(storage)) == storage
+    with SerializerProfiler() as profiler:
+        profiled_serializer.serialize(storage)
+    assert profiler.stats['dataclass.UserStorage'].calls == 1
+
+    assert isinstance(pickle.loads(pickle.dumps(profiled_serializer)), ProfiledSerializer)
@@ -0,0 +1,123 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from typing import List, Dict, Tuple, Union, Optional, NamedTuple
+from enum import Enum
+from dataclasses import dataclass
+
+from serializer import create_serializer, Serializer, clear_serializer_cache
+from serializer.exceptions import SerializerError
+
+
+class UserRank(Enum):
+    user = 0
+    admin = 1
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, float, str]
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    location: Tuple[float, float]
+    attributes: List[UserAttribute]
+    avatar_url: Optional[str] = None
+
+
+users = [
+    User(i, 'user{}'.format(i), UserRank(i % 2), list(range(i % 5)), (i / 2, 1.5),
+         [UserAttribute('age', i), UserAttribute('city', 'Paris')])
+    for i in range(3000)
+]
+
+VALUES = {
+    List[User]: users[:50],
+    Dict[str, User]: {user.login: user for user in users[:50]},
+    Optional[User]: users[0],
+    Tuple[User, int]: (users[1], 2),
+    List[List[User]]: [users[:3], []],
+}
+TYPINGS = list(VALUES)
+
+THREADS = 16
+
+
+def test_serializers_are_immutable():
+    serializer = create_serializer(List[User])
+
+    with pytest.raises(AttributeError):
+        serializer.serializer = None
+    with pytest.raises(AttributeError):
+        create_serializer(User, compile=True).source = ''
+
+    # Lazily computed constants are still available.
+    assert serializer.binary_header == create_serializer(List[User]).binary_header
+
+
+def test_threaded_many():
+    serializer = create_serializer(User)
+    serialized = serializer.serialize_many(users)
+
+    with ThreadPoolExecutor(4) as executor:
+        assert serializer.serialize_many(users, executor=executor, chunk_size=100) == serialized
+        assert serializer.deserialize_many(serialized, executor=executor, chunk_size=100) == users
+
+        invalid = serialized[:2000] + [dict(serialized[0], rank='root')]
+        with pytest.raises(SerializerError) as e:
+            serializer.deserialize_many(invalid, executor=executor, chunk_size=100)
+        assert e.value.path == (2000, 'rank')
+
+
+def test_concurrent_construction_stress(restore_registry):
+    clear_serializer_cache()
+    barrier = Barrier(THREADS)
+
+    def work(i: int):
+        barrier.wait()
+
+        if i % 4 == 0:
+            # Registration runs concurrently with construction and must not affect other typings.
+            class Marker:
+                pass
+
+            class MarkerSerializer(Serializer):
+                dispatch_types = (Marker,)
+
+                @staticmethod
+                def test_typing(typing) -> bool:
+                    return typing is Marker
+
+                def __init__(self, typing):
+                    self._init_breadcrumbs('Marker')
+
+                def _serialize(self, instance):
+                    return 'marker'
+
+                def _deserialize(self, instance):
+                    return Marker()
+
+            assert create_serializer(List[Marker]).serialize([Marker()]) == ['marker']
+
+        results = dict()
+        for j in range(len(TYPINGS)):
+            typing = TYPINGS[(i + j) % len(TYPINGS)]
+            serializer = create_serializer(typing, compile=bool(i % 2))
+            results[typing] = serializer.serialize_json(VALUES[typing])
+            assert serializer.deserialize_json(results[typing]) == VALUES[typing]
+
+        user_serializer = create_serializer(User, positional=bool(i % 3))
+        serialized = user_serializer.serialize_many(users[:500])
+        assert user_serializer.deserialize_many(serialized) == users[:500]
+        return results
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(work, range(THREADS)))
+
+    assert all(result == results[0] for result in results)
+    assert results[0][List[User]] == create_serializer(List[User]).serialize_json(users[:50])
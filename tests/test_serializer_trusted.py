@@ -0,0 +1,107 @@
+import json
+import pytest
+from typing import List, Dict, Tuple, Union, Optional, NamedTuple, Any
+from enum import IntEnum
+from dataclasses import dataclass
+
+from serializer import create_serializer, Discriminated
+from serializer.exceptions import SerializerError
+
+
+class UserRank(IntEnum):
+    user = 0
+    admin = 1
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    avatar_url: Optional[str] = None
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, float, str]
+
+
+@dataclass
+class UserStorage:
+    users: Dict[int, User]
+    user_location_coordinates: Dict[int, Tuple[float, float]]
+    user_additional_attributes: Dict[int, List[UserAttribute]]
+    extra: Any = None
+
+
+@dataclass
+class Circle:
+    radius: float
+
+
+@dataclass
+class Square:
+    side: float
+    color: str = 'black'
+
+
+storage = UserStorage(
+    users={i: User(i, 'user{}'.format(i), UserRank(i % 2), list(range(i)), None if i % 2 else 'a.png')
+           for i in range(20)},
+    user_location_coordinates={i: (i / 2, -1.5) for i in range(20)},
+    user_additional_attributes={i: [UserAttribute('age', i), UserAttribute('city', 'Paris')] for i in range(10)},
+    extra={'a': [1, None]},
+)
+
+
+def test_trusted_serialize():
+    serializer = create_serializer(UserStorage)
+    serialized = serializer.serialize(storage)
+
+    for trusted_serializer in [
+        create_serializer(UserStorage, trusted=True),
+        create_serializer(UserStorage, compile=True, trusted=True),
+    ]:
+        assert trusted_serializer.serialize(storage) == serialized
+        assert trusted_serializer.serialize_many([storage, storage]) == [serialized, serialized]
+        assert trusted_serializer.serialize_json(storage) == json.dumps(serialized)
+        assert trusted_serializer.deserialize(serialized) == storage
+
+    assert serializer.serialize(storage, trusted=True) == serialized
+    assert serializer.serialize_json(storage, trusted=True) == serializer.serialize_json(storage)
+
+
+def test_trusted_identity():
+    friend_ids = list(range(10))
+    assert create_serializer(List[int], trusted=True).serialize(friend_ids) is friend_ids
+    assert create_serializer(List[int]).serialize(friend_ids, trusted=True) is friend_ids
+
+    attributes = {'a': [1, 'b', None], 'c': []}
+    assert create_serializer(Dict[str, List[Optional[Union[int, str]]]]).serialize(attributes, trusted=True) \
+        is attributes
+
+    user = storage.users[3]
+    serialized = create_serializer(User).serialize(user, trusted=True)
+    assert serialized['friend_ids'] is user.friend_ids
+    assert serialized['rank'] == 'admin'
+
+
+def test_trusted_positional_and_discriminated():
+    serializer = create_serializer(List[Discriminated[Union[Circle, Square], 'kind']], positional=True)
+    shapes = [Circle(1.5), Square(2.0), Square(1.0, 'red')]
+    assert serializer.serialize(shapes, trusted=True) == serializer.serialize(shapes)
+
+    serializer = create_serializer(List[Discriminated[Union[Circle, Square], 'kind']])
+    assert serializer.serialize(shapes, trusted=True) == serializer.serialize(shapes)
+
+
+def test_trusted_deserialize_is_validated():
+    serializer = create_serializer(List[User], trusted=True)
+
+    with pytest.raises(SerializerError) as e:
+        serializer.deserialize([{'id': 1, 'login': 'a', 'rank': 'user', 'friend_ids': ['2']}])
+    assert e.value.path == (0, 'friend_ids', 0)
+
+    # Invalid instances are not detected on serialize.
+    assert serializer.serialize([User(1, 'a', UserRank.user, ['2'])])[0]['friend_ids'] == ['2']
@@ -0,0 +1,160 @@
+import tracemalloc
+import pytest
+from typing import List, Dict, Tuple, Union, Optional, NamedTuple, Any
+from enum import IntEnum
+from dataclasses import dataclass
+
+from serializer import create_serializer, Discriminated, Array
+from serializer.exceptions import SerializerError
+
+
+class UserRank(IntEnum):
+    user = 0
+    admin = 1
+
+
+class UserAttribute(NamedTuple):
+    name: str
+    value: Union[int, float, str]
+    public: bool = True
+
+
+@dataclass
+class User:
+    id: int
+    login: str
+    rank: UserRank
+    friend_ids: List[int]
+    location: Tuple[float, float]
+    attributes: Dict[str, UserAttribute]
+    extra: Any = None
+    avatar_url: Optional[str] = None
+
+
+@dataclass
+class Circle:
+    radius: float
+
+
+@dataclass
+class Square:
+    side: float
+    color: str = 'black'
+
+
+users = [
+    User(i, 'user{}'.format(i), UserRank(i % 2), list(range(i % 5)), (i / 2, 1.5),
+         {'age': UserAttribute('age', i), 'city': UserAttribute('city', 'Paris', False)}, {'a': [i]})
+    for i in range(100)
+]
+
+
+def errors(function, instance):
+    try:
+        function(instance)
+    except SerializerError as e:
+        return str(e), e.path, e.breadcrumbs
+
+
+@pytest.mark.parametrize('positional', [False, True])
+def test_validate_matches_deserialize(positional):
+    serializer = create_serializer(List[User], positional=positional)
+    serialized = serializer.serialize(users)
+
+    assert serializer.validate(serialized) is None
+    assert serializer.validate_instance(users) is None
+
+    keys = ['id', 'login', 'rank', 'friend_ids', 'location', 'attributes']
+
+    def replace(key, value):
+        if positional:
+            return [serialized[0][:keys.index(key)] + [value] + serialized[0][keys.index(key) + 1:]]
+        return [dict(serialized[0], **{key: value})]
+
+    invalid_payloads = [
+        None,
+        [None],
+        [{'id': 1}],
+        replace('id', '1'),
+        replace('rank', 'root'),
+        replace('friend_ids', [1, 2, '3']),
+        replace('location', [1.0]),
+        replace('attributes', {'age': {'name': 'age', 'value': None}}),
+        replace('attributes', {'age': ['age']}),
+        [serialized[0], [1, 'a']],
+    ]
+    for payload in invalid_payloads:
+        expected = errors(serializer.deserialize, payload)
+        assert expected is not None
+        assert errors(serializer.validate, payload) == expected
+
+    invalid_instances = [
+        [None],
+        [User(1, 'a', 'admin', [], (1.0, 2.0), {})],
+        [User(1, 'a', UserRank.user, [1, None], (1.0, 2.0), {})],
+        [User(1, 'a', UserRank.user, [], (1.0, 2.0), {'x': UserAttribute('x', [])})],
+    ]
+    for instance in invalid_instances:
+        expected = errors(serializer.serialize, instance)
+        assert expected is not None
+        assert errors(serializer.validate_instance, instance) == expected
+
+
+@pytest.mark.parametrize('positional', [False, True])
+def test_validate_discriminated_union(positional):
+    serializer = create_serializer(List[Discriminated[Union[Circle, Square], 'kind']], positional=positional)
+    serialized = serializer.serialize([Circle(1.5), Square(2.0, 'red')])
+    serializer.validate(serialized)
+
+    for payload in [[{'kind': 'Triangle'}], [{'kind': 'Circle', 'radius': 'big'}], [['Square']], [[]]]:
+        expected = errors(serializer.deserialize, payload)
+        assert expected is not None
+        assert errors(serializer.validate, payload) == expected
+
+    assert errors(serializer.validate_instance, [Circle('big')]) == errors(serializer.serialize, [Circle('big')])
+
+
+def test_validate_allocates_nothing():
+    for serializer in [create_serializer(List[User]), create_serializer(List[User], compile=True)]:
+        serialized = serializer.serialize(users)
+        serializer.validate(serialized)
+        serializer.validate_instance(users)
+
+        tracemalloc.start()
+        try:
+            serializer.validate(serialized)
+            serializer.validate_instance(users)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # A few frames and iterators, not proportional to the payload.
+        assert peak < 4096
+
+
+@pytest.mark.parametrize('typing', [Array[int], Array[float], Array[Tuple[float, float]]])
+def test_validate_array(typing):
+    numpy = pytest.importorskip('numpy')
+    serializer = create_serializer(typing)
+    item = typing.item
+    serialized = [[1.5, 2.5]] * 1000 if item is not int and item is not float else [item(i) for i in range(1000)]
+    serializer.validate(serialized)
+    serializer.validate([])
+    serializer.validate_instance(serializer.deserialize(serialized))
+
+    tracemalloc.start()
+    try:
+        serializer.validate(serialized)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # No array is built.
+    assert peak < 4096
+
+    for payload in [None, [None], ['1'], [1, 2.5], [True], [2 ** 63], [-2 ** 63 - 1], [[1.5]], [[1.5, 2.5, 3.5]],
+                    [(1.5, 2.5), [1.5]], [[1.5, '2']], [[1.5, 2.5], 1.5]]:
+        expected = errors(serializer.deserialize, payload)
+        assert errors(serializer.validate, payload) == expected
+
+    for instance in [numpy.zeros((2, 3)), numpy.zeros(2, 'U1'), [None]]:
+        assert errors(serializer.validate_instance, instance) == errors(serializer.serialize, instance)
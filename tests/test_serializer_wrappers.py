@@ -0,0 +1,91 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from dataclasses import dataclass
+
+from serializer import create_serializer, Serializer
+from serializer.serializer_manager import (
+    DEFAULT_OPTIONS, _WrapperSerializer, TrustedSerializer, ProfiledSerializer, PooledSerializer, MemoScopeSerializer,
+    GraphScopeSerializer, RecursiveSerializer
+)
+from serializer.serializers import InternedSerializer, MemoizedSerializer, GraphSerializer
+from serializer.compiler import CompiledSerializer
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    child: Optional['Node'] = None
+
+
+nodes = [Node('node', Node('leaf{}'.format(i % 3))) for i in range(10)]
+
+HOOKS = [
+    '_serialize', '_deserialize', '_serialize_trusted', '_validate', '_validate_instance', '_deserialize_lazy', '_diff',
+    '_same', '_patch', '_serialize_many', '_deserialize_many', '_encode_json', '_iter_json', '_iter_deserialize_json',
+    '_split_parallel', '_join_parallel', '_binary_schema', '_encode_binary', '_decode_binary',
+]
+
+
+def wrappers(serializer):
+    """
+    Types of the wrappers met from serializer to its first node that is not one.
+    """
+    found = list()
+    while isinstance(serializer, _WrapperSerializer):
+        found.append(type(serializer))
+        serializer = serializer.serializer
+    return found
+
+
+def item_wrappers(serializer):
+    while isinstance(serializer, _WrapperSerializer):
+        serializer = serializer.serializer
+    return wrappers(serializer.serializer)
+
+
+@pytest.mark.parametrize('options, root_wrapper, item_wrapper', [
+    ({'trusted': True}, TrustedSerializer, None),
+    ({'profile': True}, ProfiledSerializer, ProfiledSerializer),
+    ({'intern': 'call'}, PooledSerializer, None),
+    ({'memo': 'call'}, MemoScopeSerializer, MemoizedSerializer),
+    ({'graph': True}, GraphScopeSerializer, GraphSerializer),
+    ({'compile': True}, CompiledSerializer, None),
+])
+def test_wrappers_stream_and_parallel(options, root_wrapper, item_wrapper):
+    serializer = create_serializer(List[Node], **options)
+    assert root_wrapper in wrappers(serializer)
+    assert item_wrapper is None or item_wrapper in item_wrappers(serializer)
+
+    serialized = serializer.serialize(nodes)
+    json_string = serializer.serialize_json(nodes)
+    streamed = list(serializer.iter_deserialize_json([json_string[i:i + 7] for i in range(0, len(json_string), 7)]))
+    assert streamed == nodes
+    assert ''.join(serializer.iter_serialize_json(nodes, chunk_size=16)) == json_string
+
+    with ThreadPoolExecutor(2) as executor:
+        assert serializer.serialize_parallel(nodes, chunk_size=3, executor=executor) == serialized
+        assert serializer.deserialize_parallel(serialized, chunk_size=3, executor=executor) == nodes
+
+    if options.get('intern'):
+        # Streamed items share the pool of the stream.
+        assert streamed[0].child is not streamed[3].child and streamed[0].child.name is streamed[3].child.name
+
+
+def test_recursive_wrapper_stream_and_parallel():
+    recursive = RecursiveSerializer(DEFAULT_OPTIONS)
+    recursive.resolve(create_serializer(List[str]))
+
+    assert list(recursive.iter_deserialize_json(['["a", ', '"b"]'])) == ['a', 'b']
+    with ThreadPoolExecutor(2) as executor:
+        assert recursive.deserialize_parallel(['a', 'b', 'c'], chunk_size=1, executor=executor) == ['a', 'b', 'c']
+
+
+@pytest.mark.parametrize('wrapper', [
+    TrustedSerializer, ProfiledSerializer, PooledSerializer, MemoScopeSerializer, GraphScopeSerializer,
+    RecursiveSerializer, InternedSerializer, MemoizedSerializer, GraphSerializer, CompiledSerializer,
+])
+def test_wrappers_forward_every_hook(wrapper):
+    # Hooks a wrapper does not override are forwarded, none falls back to the defaults of Serializer.
+    for hook in HOOKS:
+        assert getattr(wrapper, hook) is not getattr(Serializer, hook), hook
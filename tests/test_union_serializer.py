@@ -2,7 +2,7 @@ import pytest
 from typing import List, Tuple, Optional, Union, Dict, NamedTuple
 from dataclasses import dataclass
 
-from serializer import create_serializer
+from serializer import create_serializer, Discriminated
 from serializer.exceptions import SerializerError
 
 
@@ -56,3 +56,59 @@ def test_union_serializer_complex():
     assert union_s.serialize([{1: 1}]) == [{1: 1}]
     assert union_s.deserialize([{1: 1}]) == [{1: 1}]
     assert union_s.serialize(union_s.deserialize([{1: 1}])) == [{1: 1}]
+
+
+def test_union_serializer_candidates():
+    union_s = create_serializer(Union[int, float, str, User])
+
+    assert union_s.serialize_candidates[str] == (union_s.serializer_instances[2],)
+    assert union_s.deserialize_candidates[str] == (union_s.serializer_instances[2],)
+    assert union_s.deserialize_candidates[dict] == (union_s.serializer_instances[3],)
+    assert union_s.deserialize_candidates[list] == ()
+
+    # bool is a subclass of int.
+    assert union_s.serialize(True) is True
+    assert union_s.deserialize(True) is True
+
+    with pytest.raises(SerializerError):
+        union_s.deserialize([])
+
+
+@dataclass
+class Admin:
+    login: str
+    level: int
+
+
+class Guest(NamedTuple):
+    nickname: str
+
+
+def test_discriminated_union_serializer():
+    union_s = create_serializer(List[Discriminated[Union[User, Admin, Guest], 'kind']])
+
+    users = [User('root', '123'), Admin('root', 1), Guest('anonymous')]
+    users_serialized = [
+        {'login': 'root', 'password': '123', 'kind': 'User'},
+        {'login': 'root', 'level': 1, 'kind': 'Admin'},
+        {'nickname': 'anonymous', 'kind': 'Guest'},
+    ]
+
+    assert union_s.serialize(users) == users_serialized
+    assert union_s.deserialize(users_serialized) == users
+
+    with pytest.raises(SerializerError):
+        union_s.serialize([{'login': 'root', 'password': '123'}])
+
+    with pytest.raises(SerializerError) as e:
+        union_s.deserialize([{'login': 'root', 'level': 1, 'kind': 'Moderator'}])
+    assert 'Invalid discriminator \'Moderator\' in key \'kind\'' in str(e.value)
+
+    with pytest.raises(SerializerError):
+        union_s.deserialize([{'login': 'root', 'level': 1}])
+
+    with pytest.raises(SerializerError):
+        create_serializer(Discriminated[Union[User, int], 'kind'])
+
+    with pytest.raises(SerializerError):
+        create_serializer(Discriminated[Union[User, Admin], 'login'])